@@ -4,7 +4,10 @@ from functools import wraps
 import discord
 from discord import HTTPException
 from dotenv import load_dotenv
-from python_aternos import Client
+from python_aternos import AsyncClient, WssManager
+
+from console_bridge import ConsoleBridge
+from status_watcher import StatusWatcher
 
 
 class AternosBot(discord.Bot):
@@ -18,6 +21,10 @@ class AternosBot(discord.Bot):
         return os.getenv(key) or os.environ.get(key)
 
     def __init__(self, sessions_dir=os.getcwd(), *args, **kwargs):
+        if 'intents' not in kwargs:
+            # The console bridge reads messages from the bridged channel
+            kwargs['intents'] = discord.Intents.default()
+            kwargs['intents'].message_content = True
         super().__init__(*args, **kwargs)
         load_dotenv()
 
@@ -31,7 +38,17 @@ class AternosBot(discord.Bot):
         if self.aternos_username is None or self.aternos_password is None:
             raise Exception('ATERNOS_USERNAME or ATERNOS_PASSWORD is not set')
 
-        self.aternos = self.authenticate()
+        # Logging in to Aternos needs the event loop,
+        # so it is done in `start`
+        self.aternos: AsyncClient | None = None
+        # One websocket per server, shared by all commands
+        self.wss_manager = WssManager()
+        self.status_watcher = StatusWatcher(self.wss_manager)
+        self.console_bridge = ConsoleBridge(self.wss_manager)
+
+    async def start(self, token: str, *, reconnect: bool = True) -> None:
+        self.aternos = await self.authenticate()
+        await super().start(token, reconnect=reconnect)
 
     def at_command(self, name, **kwargs):
         """
@@ -76,11 +93,11 @@ class AternosBot(discord.Bot):
             seconds_to_wait = int(e.response.headers["Retry-After"])
             print(f"Wait {seconds_to_wait // 60} minutes and {seconds_to_wait % 60} seconds and try again.")
 
-    def invalidate_session(self):
+    async def invalidate_session(self):
         os.remove(self.aternos.session_file(self.aternos_username, self.sessions_dir))
-        self.aternos = self.authenticate()
+        self.aternos = await self.authenticate()
 
-    def authenticate(self):
-        return Client.from_credentials(self.aternos_username,
-                                       self.aternos_password,
-                                       sessions_dir=self.sessions_dir)
+    async def authenticate(self) -> AsyncClient:
+        return await AsyncClient.from_credentials(self.aternos_username,
+                                                  self.aternos_password,
+                                                  sessions_dir=self.sessions_dir)
@@ -0,0 +1,263 @@
+import bisect
+import hashlib
+import io
+import json
+import os
+import time
+import zlib
+from typing import BinaryIO, Dict, Iterator, List
+
+# Chunks are cut at zip local file headers, so an unchanged entry
+# produces the same chunks in every snapshot
+MARKER = b'PK\x03\x04'
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+READ_SIZE = 8 * 1024 * 1024
+COMPRESS_LEVEL = 6
+
+
+def split_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Splits a stream into content-defined chunks.
+    A chunk ends before the first zip entry header found after MIN_CHUNK bytes,
+    or after MAX_CHUNK bytes if there is none.
+    Only about READ_SIZE + MAX_CHUNK bytes are kept in memory.
+    """
+    buf = bytearray()
+    eof = False
+    while not eof:
+        data = stream.read(READ_SIZE)
+        eof = not data
+        buf += data
+        while True:
+            cut = buf.find(MARKER, MIN_CHUNK, MAX_CHUNK)
+            if cut < 0:
+                if len(buf) < MAX_CHUNK:
+                    break
+                cut = MAX_CHUNK
+            yield bytes(buf[:cut])
+            del buf[:cut]
+    if buf:
+        yield bytes(buf)
+
+
+class SnapshotReader(io.RawIOBase):
+    """
+    Read-only, seekable view of a snapshot.
+    Only the chunk under the read position is kept in memory,
+    so a zip reader can jump to the entries it needs.
+    """
+
+    def __init__(self, store: 'BackupStore', snapshot: Dict):
+        super().__init__()
+        self.store = store
+        self.digests = [digest for digest, _ in snapshot['chunks']]
+        self.offsets = [0]
+        for _, size in snapshot['chunks']:
+            self.offsets.append(self.offsets[-1] + size)
+        self.size = self.offsets[-1]
+        self.pos = 0
+        self.current = -1
+        self.chunk = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.pos = offset
+        return self.pos
+
+    def readinto(self, buffer) -> int:
+        if self.pos >= self.size:
+            return 0
+        index = bisect.bisect_right(self.offsets, self.pos) - 1
+        if index != self.current:
+            self.chunk = self.store.get_chunk(self.digests[index])
+            self.current = index
+        start = self.pos - self.offsets[index]
+        data = self.chunk[start:start + len(buffer)]
+        buffer[:len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+
+class BackupStore:
+    """
+    This class is a local repository of world backups.
+    Snapshots are split into chunks that are stored once by their SHA-256,
+    compressed with zlib, so unchanged parts of a world take no extra space.
+    Every snapshot is an index of its chunks.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.chunks_dir = os.path.join(root, 'chunks')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    def chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def snapshot_path(self, name: str) -> str:
+        if os.path.basename(name) != name or name.startswith('.'):
+            raise ValueError(f"Invalid snapshot name: {name}")
+        return os.path.join(self.snapshots_dir, f'{name}.json')
+
+    def put_chunk(self, chunk: bytes) -> tuple[str, int]:
+        """
+        Stores a chunk if it is not stored yet.
+        Returns its digest and the number of bytes written to disk (0 for a known chunk).
+        """
+        digest = hashlib.sha256(chunk).hexdigest()
+        path = self.chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        packed = zlib.compress(chunk, COMPRESS_LEVEL)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(packed)
+        os.replace(tmp, path)
+        return digest, len(packed)
+
+    def get_chunk(self, digest: str) -> bytes:
+        with open(self.chunk_path(digest), 'rb') as f:
+            chunk = zlib.decompress(f.read())
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupted")
+        return chunk
+
+    def add(self, name: str, source: str | BinaryIO, **meta) -> Dict:
+        """
+        Stores a file (a path or a binary file object) as a snapshot and returns its index.
+        `size` is the logical size, `stored` is the compressed size of chunks
+        that were not in the repository before.
+        """
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return self.add(name, f, **meta)
+
+        path = self.snapshot_path(name)
+        if os.path.exists(path):
+            raise FileExistsError(f"Snapshot {name} already exists")
+
+        whole = hashlib.sha256()
+        chunks: List[List] = []
+        size = stored = 0
+        for chunk in split_chunks(source):
+            whole.update(chunk)
+            digest, written = self.put_chunk(chunk)
+            chunks.append([digest, len(chunk)])
+            size += len(chunk)
+            stored += written
+
+        snapshot = {
+            'name': name,
+            'created': time.time(),
+            'size': size,
+            'stored': stored,
+            'sha256': whole.hexdigest(),
+            'chunks': chunks,
+            **meta,
+        }
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, path)
+        return snapshot
+
+    def load(self, name: str) -> Dict:
+        with open(self.snapshot_path(name)) as f:
+            return json.load(f)
+
+    def open(self, name: str) -> io.BufferedReader:
+        """
+        Opens a snapshot for reading without restoring it.
+        Chunks are checked when they are read, the whole file is not.
+        """
+        return io.BufferedReader(SnapshotReader(self, self.load(name)))
+
+    def snapshots(self) -> List[Dict]:
+        """
+        Returns all snapshots without chunk lists, the oldest first.
+        """
+        result = []
+        for filename in os.listdir(self.snapshots_dir):
+            if not filename.endswith('.json'):
+                continue
+            snapshot = self.load(filename[:-len('.json')])
+            snapshot['chunks_count'] = len(snapshot.pop('chunks'))
+            result.append(snapshot)
+        return sorted(result, key=lambda s: s['created'])
+
+    def restore(self, name: str, dest: str | BinaryIO) -> int:
+        """
+        Writes a snapshot back into a file chunk by chunk and checks its SHA-256.
+        Returns the number of bytes written.
+        """
+        snapshot = self.load(name)
+        if isinstance(dest, str):
+            tmp = f'{dest}.part'
+            try:
+                with open(tmp, 'wb') as f:
+                    written = self.restore(name, f)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            os.replace(tmp, dest)
+            return written
+
+        whole = hashlib.sha256()
+        written = 0
+        for digest, _ in snapshot['chunks']:
+            chunk = self.get_chunk(digest)
+            whole.update(chunk)
+            dest.write(chunk)
+            written += len(chunk)
+        if whole.hexdigest() != snapshot['sha256']:
+            raise ValueError(f"Snapshot {name} does not match its checksum")
+        return written
+
+    def delete(self, name: str) -> int:
+        """
+        Deletes a snapshot and the chunks no other snapshot uses.
+        Returns the number of bytes freed.
+        """
+        os.remove(self.snapshot_path(name))
+        return self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        used = set()
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith('.json'):
+                used.update(d for d, _ in self.load(filename[:-len('.json')])['chunks'])
+        freed = 0
+        for digest, path in self.stored_chunks():
+            if digest not in used:
+                freed += os.path.getsize(path)
+                os.remove(path)
+        return freed
+
+    def stored_chunks(self) -> Iterator[tuple[str, str]]:
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if not digest.endswith('.tmp'):
+                    yield digest, os.path.join(prefix_dir, digest)
+
+    def physical_size(self) -> int:
+        return sum(os.path.getsize(path) for _, path in self.stored_chunks())
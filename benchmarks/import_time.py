@@ -0,0 +1,73 @@
+"""
+Measures how long `import python_aternos` takes with `python -X importtime`
+in fresh interpreters, and how much of it is spent importing the submodules
+when the first public name is used. Names whose dependencies are missing
+are skipped.
+
+    python benchmarks/import_time.py [rounds]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the statement run after the import, by the scenario name
+SCENARIOS = {
+    "import python_aternos": "",
+    "python_aternos.Client": "python_aternos.Client",
+}
+
+
+def importtime(code: str) -> Optional[Dict[str, int]]:
+    """Runs the code in a new interpreter, returns cumulative
+    import times of the top-level modules in microseconds"""
+
+    path = os.environ.get('PYTHONPATH')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (ROOT, path))))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env, capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        return None
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(rounds: int) -> None:
+    print(f"{rounds} rounds, median cumulative time")
+    for name, stmt in SCENARIOS.items():
+        package, deferred = [], []
+        for _ in range(rounds):
+            times = importtime(f"import python_aternos\n{stmt}")
+            if times is None:
+                break
+            package.append(times.get('python_aternos', 0))
+            # submodules imported on the attribute access
+            # are listed on the top level too
+            deferred.append(sum(
+                t for mod, t in times.items()
+                if mod.startswith('python_aternos.')
+            ))
+        if not package:
+            print(f"{name:>24}: unavailable (missing dependencies)")
+            continue
+        print(f"{name:>24}: package {statistics.median(package) / 1000:7.1f} ms, "
+              f"submodules {statistics.median(deferred) / 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
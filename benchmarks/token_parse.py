@@ -0,0 +1,55 @@
+"""
+Compares the AJAX_TOKEN interpreters on the captured token snippets
+(tests/samples): startup time, including imports and process start,
+and the time per snippet. Unavailable interpreters are skipped.
+
+    python benchmarks/token_parse.py [rounds]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_aternos import atjsparse  # noqa: E402
+from tests import files  # noqa: E402
+
+SNIPPETS = files.read_sample('token_input.txt')
+EXPECTED = files.read_sample('token_output.txt')
+
+
+def bench(name: str, create, rounds: int) -> None:
+    start = time.perf_counter()
+    try:
+        js = create()
+        # the first request starts Node, so it is a part of the startup
+        js.exec_get(SNIPPETS[0], 'AJAX_TOKEN')
+    except Exception as e:
+        print(f"{name:>12}: unavailable ({type(e).__name__}: {e})")
+        return
+    startup = time.perf_counter() - start
+
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for func, exp in zip(SNIPPETS, EXPECTED):
+            if js.exec_get(func, 'AJAX_TOKEN') != exp:
+                errors += 1
+    per_call = (time.perf_counter() - start) / (rounds * len(SNIPPETS))
+
+    if isinstance(js, atjsparse.NodeInterpreter):
+        js.kill()
+    print(f"{name:>12}: startup {startup * 1000:9.1f} ms, "
+          f"{per_call * 1e6:10.1f} us per token, {errors} wrong")
+
+
+def main(rounds: int) -> None:
+    print(f"{len(SNIPPETS)} snippets x {rounds} rounds")
+    bench("fast", lambda: atjsparse.FastInterpreter(), rounds)
+    bench("js2py", atjsparse.Js2PyInterpreter, max(1, rounds // 100))
+    bench("node", atjsparse.NodeInterpreter, rounds)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
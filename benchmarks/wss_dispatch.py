@@ -0,0 +1,107 @@
+"""
+Micro-benchmark of AternosWss.receiver: feeds recorded websocket frames
+through the receiver loop and reports messages per second.
+
+    python benchmarks/wss_dispatch.py [frames]
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_aternos import atwss  # noqa: E402
+from python_aternos.atwss import AternosWss, Overflow, Streams  # noqa: E402
+
+# Frames recorded from a running server, in the proportions seen in practice:
+# mostly console lines, heap and tick every few seconds, a rare status
+STATUS = {
+    'status': 2, 'label': 'Online', 'players': 1, 'slots': 20,
+    'software': 'Paper', 'version': '1.20.1', 'countdown': None,
+}
+RECORDED = [
+    '{"type":"line","stream":"console","data":"[12:01:07 INFO]: Steve joined the game\\r\\n"}',
+    '{"type":"line","stream":"console","data":"[12:01:08 INFO]: Steve[/127.0.0.1:50312] logged in '
+    'with entity id 231 at ([world]12.5, 64.0, -3.5)\\r\\n"}',
+    '{"type":"line","stream":"console","data":"[12:01:09 WARN]: Can\'t keep up! Is the server '
+    'overloaded? Running 2043ms or 40 ticks behind\\r\\n"}',
+    '{"type":"line","stream":"console","data":"[12:01:10 INFO]: <Steve> hello\\r\\n"}',
+    '{"type":"heap","stream":"heap","data":{"usage":1876543210}}',
+    '{"type":"tick","stream":"tick","data":{"averageTickTime":42.7}}',
+    '{"type":"line","stream":"console","data":"[12:01:11 INFO]: Saving chunks for level '
+    '\'ServerLevel[world]\'/minecraft:overworld\\r\\n"}',
+    '{"type":"status","message":' + json.dumps(json.dumps(STATUS)) + '}',
+]
+
+
+class FakeAtserv:
+    servid = 'benchmark'
+
+    class atconn:
+        atsession = ''
+
+
+class ReplaySocket:
+    """Returns the recorded frames, then stops the receiver."""
+
+    def __init__(self, count: int):
+        self.frames = itertools.islice(itertools.cycle(RECORDED), count)
+
+    async def recv(self) -> str:
+        for frame in self.frames:
+            return frame
+        raise asyncio.CancelledError
+
+
+async def run(count: int, setup) -> float:
+    wss = AternosWss(FakeAtserv())  # type: ignore[arg-type]
+    wss.socket = ReplaySocket(count)
+    setup(wss)
+    start = time.perf_counter()
+    await wss.receiver()
+    elapsed = time.perf_counter() - start
+    for handlers in wss.recv.values():
+        for handler in handlers:
+            handler.stop()
+    return count / elapsed
+
+
+def no_listeners(_: AternosWss) -> None:
+    pass
+
+
+def console_sink(wss: AternosWss) -> None:
+    wss.add_sink(Streams.console, lambda _: None)
+
+
+def all_sinks(wss: AternosWss) -> None:
+    for stream in (Streams.console, Streams.ram, Streams.tps, Streams.status):
+        wss.add_sink(stream, lambda _: None)
+
+
+def all_listeners(wss: AternosWss) -> None:
+    async def listener(_):
+        pass
+
+    for stream in (Streams.console, Streams.ram, Streams.tps, Streams.status):
+        wss.add_receiver(stream, listener, overflow=Overflow.drop_oldest)
+
+
+async def main(count: int) -> None:
+    backend = 'orjson' if atwss.loads is not json.loads else 'json'
+    print(f"{count} frames, JSON backend: {backend}")
+    for name, setup in (
+            ("no listeners", no_listeners),
+            ("console sink", console_sink),
+            ("sinks on all streams", all_sinks),
+            ("queued listeners on all streams", all_listeners)):
+        rate = await run(count, setup)
+        print(f"{name:>32}: {rate:>12,.0f} msg/s")
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
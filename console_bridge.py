@@ -0,0 +1,153 @@
+import asyncio
+import collections
+import time
+from typing import Deque, Dict, List
+
+import discord
+from python_aternos import AsyncAternosServer, Streams, WssManager
+
+# Discord message length limit
+MESSAGE_LIMIT = 2000
+# Pending console lines are posted at most this often (seconds)
+FLUSH_INTERVAL = 2.0
+# Discord allows 5 messages per 5 seconds in a channel
+RATE_MESSAGES = 5
+RATE_PERIOD = 5.0
+# Messages waiting to be posted, older ones are dropped
+MAX_BACKLOG = 50
+
+
+class Bridge:
+    """
+    Mirrors the console of one server into one Discord channel.
+    Console lines are collected by a websocket sink and posted
+    as code blocks on a timer, so a burst of lines becomes a few messages.
+    """
+
+    def __init__(self, server: AsyncAternosServer, channel: discord.abc.Messageable):
+        self.server = server
+        self.channel = channel
+        self.lines: List[str] = []
+        self.outbox: Deque[str] = collections.deque()
+        self.sent_at: Deque[float] = collections.deque(maxlen=RATE_MESSAGES)
+        self.sender: asyncio.Task | None = None
+        self.posted = 0
+        self.dropped = 0
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+
+    def pack(self) -> None:
+        """
+        Moves pending lines into code blocks no longer than MESSAGE_LIMIT.
+        """
+        if not self.lines:
+            return
+        lines, self.lines = self.lines, []
+        limit = MESSAGE_LIMIT - len("```\n```")
+        block: List[str] = []
+        size = 0
+        for line in lines:
+            line = line.replace("```", "'''")[:limit]
+            if block and size + len(line) + 1 > limit:
+                self.queue('\n'.join(block))
+                block, size = [], 0
+            block.append(line)
+            size += len(line) + 1
+        if block:
+            self.queue('\n'.join(block))
+
+    def queue(self, text: str) -> None:
+        self.outbox.append(f"```\n{text}```")
+        while len(self.outbox) > MAX_BACKLOG:
+            self.outbox.popleft()
+            self.dropped += 1
+
+    async def rate_limit(self) -> None:
+        """
+        Waits until another message can be posted without hitting the channel rate limit.
+        """
+        if len(self.sent_at) == RATE_MESSAGES:
+            delay = self.sent_at[0] + RATE_PERIOD - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.pack()
+            while self.outbox:
+                await self.rate_limit()
+                text = self.outbox.popleft()
+                try:
+                    await self.channel.send(text)
+                except discord.HTTPException as e:
+                    print(f"Console bridge failed to post to {self.channel}: {e}")
+                self.sent_at.append(time.monotonic())
+                self.posted += 1
+
+    @property
+    def backlog(self) -> Dict[str, int]:
+        return {
+            "lines": len(self.lines),
+            "messages": len(self.outbox),
+            "posted": self.posted,
+            "dropped": self.dropped,
+        }
+
+
+class ConsoleBridge:
+    """
+    This class manages console bridges between servers and Discord channels.
+    A server console can be mirrored to one channel at a time,
+    and messages sent to that channel are run as console commands.
+    """
+
+    def __init__(self, wss_manager: WssManager):
+        self.wss_manager = wss_manager
+        self.bridges: Dict[str, Bridge] = {}
+        self.channels: Dict[int, Bridge] = {}
+
+    async def start(self, server: AsyncAternosServer, channel: discord.abc.GuildChannel) -> Bridge:
+        # A server is bridged to one channel and a channel to one server
+        old = self.bridges.get(server.servid) or self.channels.get(channel.id)
+        while old is not None:
+            await self.stop(old.server)
+            old = self.bridges.get(server.servid) or self.channels.get(channel.id)
+        bridge = Bridge(server, channel)
+        await self.wss_manager.add_sink(server, Streams.console, bridge.append)
+        bridge.sender = asyncio.create_task(bridge.run())
+        self.bridges[server.servid] = bridge
+        self.channels[channel.id] = bridge
+        return bridge
+
+    async def stop(self, server: AsyncAternosServer) -> Bridge | None:
+        bridge = self.bridges.pop(server.servid, None)
+        if bridge is None:
+            return None
+        self.channels.pop(bridge.channel.id, None)
+        if bridge.sender is not None:
+            bridge.sender.cancel()
+        await self.wss_manager.remove_sink(server, Streams.console, bridge.append)
+        return bridge
+
+    def get(self, server: AsyncAternosServer) -> Bridge | None:
+        return self.bridges.get(server.servid)
+
+    async def on_message(self, message: discord.Message) -> bool:
+        """
+        Runs a message from a bridged channel as a console command.
+        Returns True if the message was handled.
+        """
+        bridge = self.channels.get(message.channel.id)
+        if bridge is None or message.author.bot or not message.content:
+            return False
+        # Console commands can do anything on the server
+        if not message.author.guild_permissions.manage_guild:
+            await message.reply("You need the Manage Server permission to run console commands.")
+            return True
+        wss = self.wss_manager.get(bridge.server.servid)
+        if wss is None:
+            return False
+        await wss.command(message.content.removeprefix('/'))
+        return True
@@ -1,12 +1,26 @@
 import asyncio
+import os
+import re
+import time
 
 import discord
 import requests
 from discord import Interaction
-from python_aternos import AternosServer, Status, ServerStartError
+from python_aternos import AsyncAternosServer, Status, ServerError, ServerStartError, FileError
 
 from aternos_bot import AternosBot
+from backup_store import BackupStore
 from save_data import *
+import world_report
+
+# How long /start waits for each status change (seconds)
+START_TIMEOUT = 15 * 60
+# Max length of an embed description
+EMBED_LIMIT = 4096
+# Where /backup saves world archives
+BACKUPS_DIR = os.getenv('BACKUPS_DIR') or 'backups'
+# How often /backup updates its progress message (seconds)
+PROGRESS_INTERVAL = 5
 
 
 def nice_list(lines, prefix="") -> str:
@@ -15,26 +29,39 @@ def nice_list(lines, prefix="") -> str:
     return '\n'.join(ls)
 
 
+def nice_size(size: float) -> str:
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1000 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size:.0f} B"
+        size /= 1000
+
+
 def default_embed(**kwargs):
     return discord.Embed(colour=discord.Colour.green(), **kwargs)
 
 
 def main():
     at_bot: AternosBot = AternosBot()
+    backup_store = BackupStore(os.path.join(BACKUPS_DIR, "store"))
 
-    def selected_server(saved: GuildSaves) -> AternosServer:
-        return at_bot.aternos.list_servers()[saved.selected_server]
+    async def selected_server(saved: GuildSaves) -> AsyncAternosServer:
+        servers = await at_bot.aternos.list_servers()
+        server = at_bot.aternos.find_server(saved.selected_server_id or "")
+        if server is None:
+            # Guilds saved before server IDs were stored only have the index
+            server = servers[saved.selected_server]
+        return server
 
-    def safe_fetch(server: AternosServer, ctx: ApplicationContext) -> AternosServer:
+    async def safe_fetch(server: AsyncAternosServer, ctx: ApplicationContext) -> AsyncAternosServer:
         try:
-            server.fetch()
+            await server.fetch()
             return server
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 418:
                 # We need to delete the session file and authenticate again
-                at_bot.invalidate_session()
+                await at_bot.invalidate_session()
                 print("Session invalidated, retrying...")
-                return selected_server(GuildSaves(ctx))
+                return await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
             else:
                 print(f"\u001b[0;31m")
                 print(f"HTTPError while fetching server:")
@@ -52,16 +79,17 @@ def main():
 
     @at_bot.at_command("servers", description="List all servers")
     async def handle_servers(_: discord.ApplicationContext):
-        servers = at_bot.aternos.list_servers(cache=False)
+        servers = await at_bot.aternos.list_servers(cache=False)
+        timings = await at_bot.aternos.fetch_all()
+        print(f"Fetched {len(servers)} servers in {timings['total']:.2f}s")
         server_list = nice_list([server.address for server in servers])
         server_list = f"```{server_list}```"
         return default_embed(title="Servers", description=server_list)
 
     @at_bot.at_command("info", description="Prints info about the selected server")
     async def handle_info(ctx: discord.ApplicationContext):
-        server = selected_server(GuildSaves(ctx))
+        server = await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
         server_address = server.address
-        server = safe_fetch(server, ctx)
         try:
             # Colors: 1 = red, 2 = green, 3 = yellow, 4 = blue
             c = {"offline": 1,
@@ -85,33 +113,255 @@ def main():
         server_info = f"```ansi\n{server_info}```"
         return default_embed(title="Server Info", description=server_info)
 
+    @at_bot.at_command("console", description="Shows the latest console lines of the selected server")
+    async def handle_console(ctx: discord.ApplicationContext,
+                             action: discord.Option(str, description="What to do",
+                                                    choices=["tail", "grep"], default="tail"),
+                             pattern: discord.Option(str, description="Text or regex to search for",
+                                                     required=False) = None,
+                             regex: discord.Option(bool, description="Treat the pattern as a regex "
+                                                                     "(needs Manage Server)",
+                                                   default=False) = False,
+                             lines: discord.Option(int, description="Number of lines",
+                                                   min_value=1, max_value=100, default=20) = 20):
+        server = await selected_server(GuildSaves(ctx))
+        # The buffer is filled from the first use on
+        console_log = await at_bot.wss_manager.console(server)
+        if action == "grep":
+            if not pattern:
+                return "Specify a `pattern` to search for."
+            # A slow regex (like `(a+)+$`) could stall the bot for every guild
+            if regex and not ctx.author.guild_permissions.manage_guild:
+                return "You need the Manage Server permission to search with a regex."
+            try:
+                # The search runs in a thread, so even a slow regex doesn't block the event loop
+                found = await asyncio.to_thread(console_log.grep, pattern, regex=regex, limit=lines)
+            except re.error as e:
+                return f"Invalid regex: {e}"
+        else:
+            found = console_log.tail(lines)
+        if not found:
+            return default_embed(title="Console",
+                                 description="No lines yet. Console lines are kept "
+                                             "from the first `/console` use while the server is online.")
+        text = '\n'.join(found).replace("```", "'''")
+        # Embed descriptions are limited to 4096 characters
+        text = text[-(EMBED_LIMIT - 8):]
+        return default_embed(title=f"Console ({action})", description=f"```\n{text}```")
+
+    @at_bot.at_command("stats", description="Shows RAM usage and TPS of the selected server")
+    async def handle_stats(ctx: discord.ApplicationContext):
+        server = await selected_server(GuildSaves(ctx))
+        # The series are filled from the first use on
+        stats = await at_bot.wss_manager.server_stats(server)
+        rows = []
+        for title, seconds in (("Last hour", 60 * 60), ("Last day", 24 * 60 * 60)):
+            summary = stats.summary(seconds)
+            ram, tps = summary["ram"], summary["tps"]
+            rows.append(title)
+            rows.append(f"  RAM: {ram['min'] / 2 ** 20:.0f} / {ram['avg'] / 2 ** 20:.0f} / "
+                        f"{ram['max'] / 2 ** 20:.0f} MB" if ram else "  RAM: no data")
+            rows.append(f"  TPS: {tps['min']:.1f} / {tps['avg']:.1f} / {tps['max']:.1f}"
+                        if tps else "  TPS: no data")
+        if stats.ram.last is None and stats.tps.last is None:
+            rows.append("\nStats are collected from the first `/stats` use while the server is online.")
+        stats_text = "(min / avg / max)\n" + '\n'.join(rows)
+        return default_embed(title="Server Stats", description=f"```\n{stats_text}```")
+
+    @at_bot.at_command("config", description="Shows the settings of the selected server")
+    async def handle_config(ctx: discord.ApplicationContext,
+                            action: discord.Option(str, description="What to do",
+                                                   choices=["show"], default="show")):
+        server = await selected_server(GuildSaves(ctx))
+        # Timezone, Java and server.properties come from one options page request,
+        # reused for a minute unless a setting is changed
+        options = await server.config().options()
+        props = '\n'.join(f"{key}={value}" for key, value in sorted(options.props.items()))
+        summary = f"Timezone: {options.timezone}\nJava: {options.java}\n"
+        props = props[:EMBED_LIMIT - len(summary) - 32]
+        return default_embed(title="Server Settings",
+                             description=f"{summary}```properties\n{props}```")
+
+    @at_bot.at_command("bridge", description="Mirrors the console of the selected server into this channel")
+    async def handle_bridge(ctx: discord.ApplicationContext,
+                            action: discord.Option(str, description="What to do",
+                                                   choices=["start", "stop", "status"], default="status")):
+        # Servers from the list have no info yet, the replies need the address
+        server = await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
+        if action == "start":
+            if not ctx.author.guild_permissions.manage_guild:
+                return "You need the Manage Server permission to bridge the console."
+            await at_bot.console_bridge.start(server, ctx.channel)
+            return default_embed(title="Console Bridge",
+                                 description=f"Console of `{server.address}` is mirrored here.\n"
+                                             f"Messages sent to this channel are run as commands.")
+        if action == "stop":
+            bridge = await at_bot.console_bridge.stop(server)
+            if bridge is None:
+                return "The console of the selected server is not bridged."
+            return default_embed(title="Console Bridge",
+                                 description=f"Stopped mirroring `{server.address}` "
+                                             f"to <#{bridge.channel.id}>.")
+        bridge = at_bot.console_bridge.get(server)
+        if bridge is None:
+            return "The console of the selected server is not bridged."
+        backlog = bridge.backlog
+        return default_embed(title="Console Bridge",
+                             description=f"Channel: <#{bridge.channel.id}>\n"
+                                         f"Pending lines: {backlog['lines']}\n"
+                                         f"Queued messages: {backlog['messages']}\n"
+                                         f"Posted: {backlog['posted']}, dropped: {backlog['dropped']}")
+
+    async def download_world(server: AsyncAternosServer, world: str, dest: str, r_interaction: Interaction):
+        # Called from the download thread, so it only stores the numbers
+        progress = {}
+
+        def on_progress(done, total, rate):
+            progress.update(done=done, total=total, rate=rate)
+
+        # The world is written to disk in chunks, not kept in memory,
+        # interrupted downloads are resumed
+        download = asyncio.create_task(server.files().save_world(dest, world, on_progress))
+        while not download.done():
+            await asyncio.wait({download}, timeout=PROGRESS_INTERVAL)
+            if progress and not download.done():
+                total = f" of {nice_size(progress['total'])}" if progress['total'] else ""
+                await r_interaction.edit_original_response(
+                    content=f"Downloading `{world}`: {nice_size(progress['done'])}{total} "
+                            f"({nice_size(progress['rate'])}/s)")
+        download.result()
+
+    def report_snapshot(name: str) -> dict:
+        # Runs in a thread: opening the snapshot loads its index from disk,
+        # the zip is read from the stored chunks, only the parts it needs
+        with backup_store.open(name) as f:
+            return world_report.analyze(f)
+
+    @at_bot.at_command("backup", description="Backs up a world of the selected server or lists the backups")
+    async def handle_backup(ctx: discord.ApplicationContext,
+                            action: discord.Option(str, description="What to do",
+                                                   choices=["create", "list"], default="create"),
+                            world: discord.Option(str, description="World name", default="world")):
+        if action == "list":
+            snapshots = await asyncio.to_thread(backup_store.snapshots)
+            if not snapshots:
+                return "There are no backups yet."
+            rows = [f"{s['name']}: {nice_size(s['size'])}, new data {nice_size(s['stored'])}"
+                    for s in snapshots]
+            physical = await asyncio.to_thread(backup_store.physical_size)
+            summary = f"{len(snapshots)} backups of {nice_size(sum(s['size'] for s in snapshots))} " \
+                      f"take {nice_size(physical)} on disk"
+            # Embed descriptions are limited to 4096 characters, the newest backups are kept
+            backups_list = '\n'.join(rows)[-(EMBED_LIMIT - len(summary) - 16):]
+            return default_embed(title="Backups", description=f"```\n{backups_list}```\n{summary}")
+
+        server = await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
+        os.makedirs(BACKUPS_DIR, exist_ok=True)
+        prefix = f"{server.subdomain}-{world.replace('/', '_')}"
+        name = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+        # The path doesn't change between attempts, so a failed download is resumed by the next one
+        dest = os.path.join(BACKUPS_DIR, f"{prefix}.zip")
+        r_interaction: Interaction = await ctx.respond(f"Downloading `{world}`...")
+        try:
+            await download_world(server, world, dest, r_interaction)
+        except (FileError, requests.RequestException) as e:
+            await r_interaction.edit_original_response(content=f"Backup failed: {e}")
+            return
+
+        await r_interaction.edit_original_response(content=f"Storing `{world}`...")
+        # Only the chunks that changed since the previous backups take space
+        try:
+            snapshot = await asyncio.to_thread(backup_store.add, name, dest,
+                                               server=server.address, world=world)
+        except OSError as e:
+            await r_interaction.edit_original_response(content=f"Storing the backup failed: {e}")
+            return
+        finally:
+            os.remove(dest)
+        await r_interaction.edit_original_response(
+            content=f"World `{world}` of `{server.address}` backed up as `{name}` "
+                    f"({nice_size(snapshot['size'])}, new data {nice_size(snapshot['stored'])}).")
+
+    @at_bot.at_command("world", description="Reports region files and level.dat of a world of the selected server")
+    async def handle_world(ctx: discord.ApplicationContext,
+                           action: discord.Option(str, description="What to do",
+                                                  choices=["report"], default="report"),
+                           world: discord.Option(str, description="World name", default="world"),
+                           fresh: discord.Option(bool, description="Download the world instead of "
+                                                                   "reading the latest backup",
+                                                 default=False)):
+        server = await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
+        snapshots = [s for s in await asyncio.to_thread(backup_store.snapshots)
+                     if s.get('server') == server.address and s.get('world') == world]
+        if snapshots and not fresh:
+            source = f"backup `{snapshots[-1]['name']}`"
+            r_interaction: Interaction = await ctx.respond(f"Reading {source}...")
+            report = await asyncio.to_thread(report_snapshot, snapshots[-1]['name'])
+        else:
+            os.makedirs(BACKUPS_DIR, exist_ok=True)
+            dest = os.path.join(BACKUPS_DIR, f"{server.subdomain}-{world.replace('/', '_')}-report.zip")
+            source = "a fresh download"
+            r_interaction: Interaction = await ctx.respond(f"Downloading `{world}`...")
+            try:
+                await download_world(server, world, dest, r_interaction)
+                report = await asyncio.to_thread(world_report.analyze, dest)
+            except (FileError, requests.RequestException) as e:
+                await r_interaction.edit_original_response(content=f"Report failed: {e}")
+                return
+            finally:
+                if os.path.exists(dest):
+                    os.remove(dest)
+
+        level = report['level']
+        rows = [f"{key}: {value}" for key, value in level.items()]
+        rows.append(f"Archive: {report['entries']} files, {nice_size(report['size'])} "
+                    f"({nice_size(report['compressed'])} compressed)")
+        rows.append("")
+        for name, dim in sorted(report['dimensions'].items(), key=lambda d: -d[1]['region']):
+            row = f"{name}: {dim['regions']} regions, {nice_size(dim['region'])}, " \
+                  f"entities {nice_size(dim['entities'])}, poi {nice_size(dim['poi'])}"
+            if dim['regions']:
+                # A region file covers 512x512 blocks
+                width = (dim['max_x'] - dim['min_x'] + 1) * 512
+                depth = (dim['max_z'] - dim['min_z'] + 1) * 512
+                row += f", area {width}x{depth} blocks"
+            rows.append(row)
+        rows.append("")
+        rows.append("Largest region files:")
+        rows.extend(f"{nice_size(size): >9} {path}" for path, size in report['largest'])
+        description = '\n'.join(rows)[:EMBED_LIMIT - 16]
+        await r_interaction.edit_original_response(
+            content=f"World `{world}` of `{server.address}` from {source}:",
+            embed=default_embed(title=level.get('name', world), description=f"```\n{description}```"))
+
     @at_bot.at_command("start", description="Starts the selected server")
     async def handle_start(ctx: discord.ApplicationContext):
-        server = selected_server(GuildSaves(ctx))
-        server = safe_fetch(server, ctx)
+        server = await safe_fetch(await selected_server(GuildSaves(ctx)), ctx)
         if server.status_num == Status.on:
             return f"Server is already online at `{server.address}`"
         try:
-            server.start()
+            await server.start()
         except ServerStartError as _e:
             return f"Server failed to start: {_e}"
         r_interaction: Interaction = await ctx.respond("Starting server...")
-        while (server.status_num != Status.loading and
-               server.status_num != Status.starting and
-               server.status_num != Status.on):
-            server = safe_fetch(server, ctx)
-            await asyncio.sleep(0.5)
-        print(f"Server status: {server.status}, {server.status_num}")
-        await r_interaction.edit_original_response(content=f"Server (`{server.address}`) is loading...")
-        while (server.status_num != Status.starting and
-               server.status_num != Status.on):
-            server = safe_fetch(server, ctx)
-            await asyncio.sleep(0.5)
-        print(f"Server status: {server.status}, {server.status_num}")
-        await r_interaction.edit_original_response(content=f"Server (`{server.address}`) is starting...")
-        while server.status_num != Status.on:
-            server = safe_fetch(server, ctx)
-            await asyncio.sleep(0.5)
+        try:
+            await at_bot.status_watcher.wait_for(server, {Status.loading, Status.starting, Status.on},
+                                                 timeout=START_TIMEOUT)
+            print(f"Server status: {server.status}, {server.status_num}")
+            await r_interaction.edit_original_response(content=f"Server (`{server.address}`) is loading...")
+            await at_bot.status_watcher.wait_for(server, {Status.starting, Status.on},
+                                                 timeout=START_TIMEOUT)
+            print(f"Server status: {server.status}, {server.status_num}")
+            await r_interaction.edit_original_response(content=f"Server (`{server.address}`) is starting...")
+            await at_bot.status_watcher.wait_for(server, {Status.on}, timeout=START_TIMEOUT)
+        except asyncio.TimeoutError:
+            await r_interaction.edit_original_response(
+                content=f"Server (`{server.address}`) is still {server.status}, "
+                        f"use `/info` to check it later.")
+            return
+        except ServerError as _e:
+            await r_interaction.edit_original_response(content=f"Server failed to start: {_e}")
+            return
         print(f"Server status: {server.status}, {server.status_num}")
         await r_interaction.followup.send(
             content=f"<@{ctx.author.id}> Server is now online!\n"
@@ -122,13 +372,15 @@ def main():
     async def handle_select(ctx: discord.ApplicationContext,
                             server_id: discord.Option(int, description="Server index")):
         server_id = server_id - 1
-        if server_id < 0 or server_id >= len(at_bot.aternos.list_servers()):
+        servers = await at_bot.aternos.list_servers()
+        if server_id < 0 or server_id >= len(servers):
             await ctx.respond("Invalid server index.\n"
                               "Use `/servers` to list all servers.")
             return
         saves = GuildSaves(ctx)
         saves.selected_server = server_id
-        server = selected_server(saves)
+        saves.selected_server_id = servers[server_id].servid
+        server = await safe_fetch(await selected_server(saves), ctx)
         return default_embed(title="Server Selected",
                              description=f"Server {server_id + 1} "
                                          f"(`{server.address}`) selected.")
@@ -139,6 +391,10 @@ def main():
         guilds = nice_list([guild.name for guild in at_bot.guilds], prefix="\t")
         print(f"Guilds: \n{guilds}")
 
+    @at_bot.event
+    async def on_message(message: discord.Message):
+        await at_bot.console_bridge.on_message(message)
+
     at_bot.at_run()
 
 
@@ -2,51 +2,165 @@
 Unofficial Aternos API module written in Python.
 It uses Aternos' private API and html parsing"""
 
-from .atclient import Client
-from .atserver import AternosServer
-from .atserver import Edition
-from .atserver import Status
-from .atconnect import AternosConnect
-from .atplayers import PlayersList
-from .atplayers import Lists
-from .atconf import AternosConfig
-from .atconf import ServerOpts
-from .atconf import WorldOpts
-from .atconf import WorldRules
-from .atconf import Gamemode
-from .atconf import Difficulty
-from .atwss import AternosWss
-from .atwss import Streams
-from .atfm import FileManager
-from .atfile import AternosFile
-from .atfile import FileType
-from .aterrors import AternosError
-from .aterrors import CloudflareError
-from .aterrors import CredentialsError
-from .aterrors import TokenError
-from .aterrors import ServerError
-from .aterrors import ServerStartError
-from .aterrors import FileError
-from .aterrors import AternosPermissionError
-from .atjsparse import Js2PyInterpreter
-from .atjsparse import NodeInterpreter
+# Submodules pull in heavy dependencies
+# (cloudscraper, lxml, websockets, js2py),
+# so they are imported on the first access
+# to a name from the package
+
+import importlib
+
+from typing import Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .atclient import Client
+    from .atclient import AsyncClient
+    from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
+    from .atserver import Edition
+    from .atserver import Status
+    from .atconnect import AternosConnect
+    from .atconnect import AsyncAternosConnect
+    from .atplayers import PlayersList
+    from .atplayers import AsyncPlayersList
+    from .atplayers import Lists
+    from .atconf import AternosConfig
+    from .atconf import AsyncAternosConfig
+    from .atconf import OptionsSnapshot
+    from .atconf import ServerOpts
+    from .atconf import WorldOpts
+    from .atconf import WorldRules
+    from .atconf import Gamemode
+    from .atconf import Difficulty
+    from .atwss import AternosWss
+    from .atwss import Streams
+    from .atwss import WssManager
+    from .atwss import Overflow
+    from .atconsole import ConsoleLog
+    from .atstats import ServerStats
+    from .atstats import TimeSeries
+    from .atsync import Mirror
+    from .atsync import AsyncMirror
+    from .atfm import FileManager
+    from .atfm import AsyncFileManager
+    from .atfile import AternosFile
+    from .atfile import AsyncAternosFile
+    from .atfile import FileType
+    from .aterrors import AternosError
+    from .aterrors import CloudflareError
+    from .aterrors import CredentialsError
+    from .aterrors import TokenError
+    from .aterrors import ServerError
+    from .aterrors import ServerStartError
+    from .aterrors import FileError
+    from .aterrors import AternosPermissionError
+    from .atjsparse import Js2PyInterpreter
+    from .atjsparse import NodeInterpreter
+    from .atjsparse import FastInterpreter
 
 __all__ = [
 
     'atclient', 'atserver', 'atconnect',
     'atplayers', 'atconf', 'atwss',
-    'atfm', 'atfile',
+    'atfm', 'atfile', 'atconsole', 'atstats', 'atsync',
     'aterrors', 'atjsparse',
 
     'Client', 'AternosServer', 'AternosConnect',
-    'PlayersList', 'AternosConfig', 'AternosWss',
+    'PlayersList', 'AternosConfig', 'OptionsSnapshot',
+    'AternosWss', 'WssManager',
+    'ConsoleLog', 'ServerStats', 'TimeSeries', 'Mirror',
     'FileManager', 'AternosFile', 'AternosError',
     'CloudflareError', 'CredentialsError', 'TokenError',
     'ServerError', 'ServerStartError', 'FileError',
     'AternosPermissionError',
-    'Js2PyInterpreter', 'NodeInterpreter',
+    'Js2PyInterpreter', 'NodeInterpreter', 'FastInterpreter',
+
+    'AsyncClient', 'AsyncAternosServer', 'AsyncAternosConnect',
+    'AsyncPlayersList', 'AsyncAternosConfig',
+    'AsyncFileManager', 'AsyncAternosFile', 'AsyncMirror',
 
     'Edition', 'Status', 'Lists',
     'ServerOpts', 'WorldOpts', 'WorldRules',
-    'Gamemode', 'Difficulty', 'Streams', 'FileType',
+    'Gamemode', 'Difficulty', 'Streams', 'Overflow', 'FileType',
 ]
+
+
+# public name -> submodule
+lazy_names = {
+    'Client': 'atclient',
+    'AsyncClient': 'atclient',
+    'AternosServer': 'atserver',
+    'AsyncAternosServer': 'atserver',
+    'Edition': 'atserver',
+    'Status': 'atserver',
+    'AternosConnect': 'atconnect',
+    'AsyncAternosConnect': 'atconnect',
+    'PlayersList': 'atplayers',
+    'AsyncPlayersList': 'atplayers',
+    'Lists': 'atplayers',
+    'AternosConfig': 'atconf',
+    'AsyncAternosConfig': 'atconf',
+    'OptionsSnapshot': 'atconf',
+    'ServerOpts': 'atconf',
+    'WorldOpts': 'atconf',
+    'WorldRules': 'atconf',
+    'Gamemode': 'atconf',
+    'Difficulty': 'atconf',
+    'AternosWss': 'atwss',
+    'Streams': 'atwss',
+    'WssManager': 'atwss',
+    'Overflow': 'atwss',
+    'ConsoleLog': 'atconsole',
+    'ServerStats': 'atstats',
+    'TimeSeries': 'atstats',
+    'Mirror': 'atsync',
+    'AsyncMirror': 'atsync',
+    'FileManager': 'atfm',
+    'AsyncFileManager': 'atfm',
+    'AternosFile': 'atfile',
+    'AsyncAternosFile': 'atfile',
+    'FileType': 'atfile',
+    'AternosError': 'aterrors',
+    'CloudflareError': 'aterrors',
+    'CredentialsError': 'aterrors',
+    'TokenError': 'aterrors',
+    'ServerError': 'aterrors',
+    'ServerStartError': 'aterrors',
+    'FileError': 'aterrors',
+    'AternosPermissionError': 'aterrors',
+    'Js2PyInterpreter': 'atjsparse',
+    'NodeInterpreter': 'atjsparse',
+    'FastInterpreter': 'atjsparse',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Imports a submodule or a name from it
+    on the first access
+
+    Args:
+        name (str): Attribute name
+
+    Raises:
+        AttributeError: If there is no such name
+
+    Returns:
+        Submodule or its attribute
+    """
+
+    if name in __all__ and name not in lazy_names:
+        return importlib.import_module(f'.{name}', __name__)
+
+    modname = lazy_names.get(name)
+    if modname is None:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}'
+        )
+
+    value = getattr(importlib.import_module(f'.{modname}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> Any:
+    return sorted(set(globals()) | set(__all__))
@@ -3,24 +3,28 @@ and allows to manage your account"""
 
 import os
 import re
+import json
+import time
+import asyncio
 import hashlib
 import logging
 
 import base64
 
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
 from typing import Optional, Type
 
-import lxml.html
-
 from .atserver import AternosServer
+from .atserver import AsyncAternosServer
 from .atconnect import AternosConnect
+from .atconnect import AsyncAternosConnect
 from .aterrors import CredentialsError
 from .aterrors import TwoFactorAuthError
 
 from . import atjsparse
 from .atjsparse import Interpreter
-from .atjsparse import Js2PyInterpreter
+from .atjsparse import FastInterpreter
 
 
 class Client:
@@ -49,6 +53,12 @@ class Client:
         self.parsed = False
         self.servers: List[AternosServer] = []
 
+        # servers by ID, the objects are kept between refreshes
+        self.registry: Dict[str, AternosServer] = {}
+        # servers by subdomain and address,
+        # only for servers with loaded info
+        self.names: Dict[str, AternosServer] = {}
+
         if servers:
             self.refresh_servers(servers)
 
@@ -59,7 +69,7 @@ class Client:
             md5: str,
             code: Optional[int] = None,
             sessions_dir: str = '~',
-            js: Type[Interpreter] = Js2PyInterpreter,
+            js: Type[Interpreter] = FastInterpreter,
             **custom_args):
         """Log in to an Aternos account with
         a username and a hashed password
@@ -139,7 +149,7 @@ class Client:
             password: str,
             code: Optional[int] = None,
             sessions_dir: str = '~',
-            js: Type[Interpreter] = Js2PyInterpreter,
+            js: Type[Interpreter] = FastInterpreter,
             **custom_args):
         """Log in to Aternos with a username and a plain password
 
@@ -168,7 +178,8 @@ class Client:
             cls,
             session: str,
             servers: Optional[List[str]] = None,
-            js: Type[Interpreter] = Js2PyInterpreter,
+            js: Type[Interpreter] = FastInterpreter,
+            state: Optional[Dict[str, Any]] = None,
             **custom_args):
         """Log in to Aternos using a session cookie value
 
@@ -178,6 +189,10 @@ class Client:
             js (Type[Interpreter]): Preferred JS interpreter,
                 any class from `atjsparse`
                 inheriting `Interpreter` class
+            state (Optional[Dict[str, Any]]): Saved ajax token,
+                SEC and cookies, see `AternosConnect.dump_state`.
+                If the token is fresh enough, the login page
+                is not requested
             **custom_args (tuple, optional): Keyword arguments
                 which will be passed to CloudScraper `__init__`
         """
@@ -188,8 +203,9 @@ class Client:
         atconn.add_args(**custom_args)
         atconn.session.cookies['ATERNOS_SESSION'] = session
 
-        atconn.parse_token()
-        atconn.generate_sec()
+        if state is None or not atconn.load_state(state):
+            atconn.parse_token()
+            atconn.generate_sec()
 
         return cls(atconn, servers)
 
@@ -197,7 +213,7 @@ class Client:
     def restore_session(
             cls,
             file: str = '~/.aternos',
-            js: Type[Interpreter] = Js2PyInterpreter,
+            js: Type[Interpreter] = FastInterpreter,
             **custom_args):
         """Log in to Aternos using
         a saved ATERNOS_SESSION cookie
@@ -212,41 +228,75 @@ class Client:
         """
 
         file = os.path.expanduser(file)
+        saved = cls.read_session(file)
+
+        obj = cls.from_session(
+            session=saved['session'],
+            servers=saved['servers'] or None,
+            js=js,
+            state=saved,
+            **custom_args
+        )
+        obj.saved_session = file
+
+        return obj
+
+    @staticmethod
+    def read_session(file: str) -> Dict[str, Any]:
+        """Reads a session file
+        saved with `save_session()`.
+        Old files containing only the session cookie
+        and servers IDs (one per line) are also supported
+
+        Args:
+            file (str): Path to the session file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            CredentialsError: If the session cookie is empty
+
+        Returns:
+            Dictionary with the session cookie (`session`),
+            cached servers IDs (`servers`) and the saved
+            ajax token state (see `AternosConnect.dump_state`)
+        """
+
         logging.debug('Restoring session from %s', file)
 
         if not os.path.exists(file):
             raise FileNotFoundError()
 
         with open(file, 'rt', encoding='utf-8') as f:
-            saved = f.read() \
-                .strip() \
-                .replace('\r\n', '\n') \
-                .split('\n')
+            content = f.read().strip()
 
-        session = saved[0].strip()
+        if content.startswith('{'):
+            try:
+                saved = json.loads(content)
+            except ValueError as err:
+                raise CredentialsError(
+                    'Unable to parse the session file'
+                ) from err
+
+        else:
+            lines = content.replace('\r\n', '\n').split('\n')
+            saved = {
+                'session': lines[0],
+                'servers': lines[1:],
+            }
+
+        session = str(saved.get('session', '')).strip()
         if session == '':
             raise CredentialsError(
                 'Unable to read session cookie, '
-                'the first line is empty'
-            )
-
-        if len(saved) > 1:
-            obj = cls.from_session(
-                session=session,
-                servers=saved[1:],
-                js=js,
-                **custom_args
-            )
-        else:
-            obj = cls.from_session(
-                session,
-                js=js,
-                **custom_args
+                'the value is empty'
             )
 
-        obj.saved_session = file
-
-        return obj
+        saved['session'] = session
+        saved['servers'] = [
+            s.strip() for s in saved.get('servers', [])
+            if s.strip() != ''
+        ]
+        return saved
 
     @staticmethod
     def md5encode(passwd: str) -> str:
@@ -291,6 +341,8 @@ class Client:
             file: str = '~/.aternos',
             incl_servers: bool = True) -> None:
         """Saves an ATERNOS_SESSION cookie to a file
+        together with the ajax token, SEC and other cookies,
+        so restoring the session doesn't need to parse the token
 
         Args:
             file (str, optional): File where a session cookie must be saved
@@ -302,14 +354,18 @@ class Client:
         file = os.path.expanduser(file)
         logging.debug('Saving session to %s', file)
 
-        with open(file, 'wt', encoding='utf-8') as f:
+        saved = {
+            'session': self.atconn.atsession,
+            'servers': [],
+            'saved': time.time(),
+            **self.atconn.dump_state(),
+        }
 
-            f.write(self.atconn.atsession + '\n')
-            if not incl_servers:
-                return
+        if incl_servers:
+            saved['servers'] = [s.servid for s in self.servers]
 
-            for s in self.servers:
-                f.write(s.servid + '\n')
+        with open(file, 'wt', encoding='utf-8') as f:
+            json.dump(saved, f)
 
     def remove_session(self, file: str = '~/.aternos') -> None:
         """Removes a file which contains
@@ -345,7 +401,24 @@ class Client:
         serverspage = self.atconn.request_cloudflare(
             'https://aternos.org/servers/', 'GET'
         )
-        serverstree = lxml.html.fromstring(serverspage.content)
+        return self.parse_servers(serverspage.content)
+
+    def parse_servers(self, content: bytes) -> List[AternosServer]:
+        """Parses servers IDs from the servers page,
+        refreshes the cached list and saves it to the session file
+
+        Args:
+            content (bytes): HTML page content
+
+        Returns:
+            List of AternosServer objects
+        """
+
+        # lxml is slow to import, it is not needed
+        # when the servers list was restored from a file
+        import lxml.html  # pylint: disable=import-outside-toplevel
+
+        serverstree = lxml.html.fromstring(content)
 
         servers = serverstree.xpath(
             '//div[@class="server-body"]/@data-id'
@@ -361,28 +434,92 @@ class Client:
         return self.servers
 
     def refresh_servers(self, ids: List[str]) -> None:
-        """Replaces cached servers list creating
-        AternosServer objects by given IDs
+        """Replaces cached servers list by given IDs.
+        AternosServer objects of the servers that were
+        already in the list are kept with their cached info,
+        new objects are created only for new servers
 
         Args:
             ids (List[str]): Servers unique identifiers
         """
 
-        self.servers = []
+        servers = []
+        registry = {}
         for s in ids:
 
             servid = s.strip()
-            if servid == '':
+            if servid == '' or servid in registry:
                 continue
 
-            logging.debug('Adding server %s', servid)
-            srv = AternosServer(servid, self.atconn)
-            self.servers.append(srv)
+            srv = self.registry.get(servid)
+            if srv is None:
+                logging.debug('Adding server %s', servid)
+                srv = self.new_server(servid)
+
+            servers.append(srv)
+            registry[servid] = srv
 
+        self.servers = servers
+        self.registry = registry
+        self.index_servers()
         self.parsed = True
 
+    def index_servers(self) -> None:
+        """Rebuilds the index of servers
+        by subdomain and full address.
+        Servers without loaded info are skipped"""
+
+        names = {}
+        for srv in self.servers:
+            if not srv.has_info:
+                continue
+            names[srv.subdomain] = srv
+            names[srv.domain] = srv
+            names[srv.address] = srv
+
+        self.names = names
+
+    def find_server(self, key: str) -> Optional[AternosServer]:
+        """Finds a cached server by its ID, subdomain,
+        domain or full address without sending requests.
+        Subdomains and addresses are known only
+        for the servers with loaded info
+
+        Args:
+            key (str): Server ID, subdomain, domain or address
+
+        Returns:
+            AternosServer object or None if not found
+        """
+
+        srv = self.registry.get(key)
+        if srv is not None:
+            return srv
+
+        srv = self.names.get(key)
+        if srv is not None and key in (srv.subdomain, srv.domain, srv.address):
+            return srv
+
+        # the server was fetched or renamed after indexing
+        self.index_servers()
+        return self.names.get(key)
+
+    def new_server(self, servid: str) -> AternosServer:
+        """Creates a server object without requesting its info,
+        it will be requested on the first property access
+
+        Args:
+            servid (str): Server unique identifier
+
+        Returns:
+            AternosServer object
+        """
+
+        return AternosServer(servid, self.atconn, reqinfo=False)
+
     def get_server(self, servid: str) -> AternosServer:
-        """Creates a server object from the server ID.
+        """Returns a cached server object or creates
+        a new one from the server ID.
         Use this instead of list_servers
         if you know the ID to save some time.
 
@@ -390,8 +527,46 @@ class Client:
             AternosServer object
         """
 
+        srv = self.registry.get(servid)
+        if srv is not None:
+            return srv
+
         return AternosServer(servid, self.atconn)
 
+    def fetch_all(
+            self,
+            workers: int = 8,
+            max_age: Optional[float] = None) -> Dict[str, float]:
+        """Requests the info of all cached servers
+        concurrently using a thread pool
+
+        Args:
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (Optional[float], optional): Maximum age
+                of the cached info, see `AternosServer.fetch`
+
+        Returns:
+            Seconds spent on each server by its ID
+            and the total time under the `total` key
+        """
+
+        def timed_fetch(srv: AternosServer) -> float:
+            start = time.perf_counter()
+            srv.fetch(max_age)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            timings = dict(zip(
+                [s.servid for s in self.servers],
+                pool.map(timed_fetch, self.servers)
+            ))
+
+        self.index_servers()
+        timings['total'] = time.perf_counter() - start
+        return timings
+
     def logout(self) -> None:
         """Log out from Aternos account"""
 
@@ -518,3 +693,352 @@ class Client:
                 'code': code
             }, sendtoken=True
         )
+
+
+class AsyncClient(Client):
+
+    """Asyncio version of the Aternos API Client.
+    Use `await AsyncClient.from_credentials(...)`
+    or other async classmethods to log in"""
+
+    atconn: AsyncAternosConnect
+    servers: List[AsyncAternosServer]  # type: ignore[assignment]
+
+    @classmethod
+    async def from_hashed(  # type: ignore[override]
+            cls,
+            username: str,
+            md5: str,
+            code: Optional[int] = None,
+            sessions_dir: str = '~',
+            js: Type[Interpreter] = FastInterpreter,
+            **custom_args):
+        """Log in to an Aternos account with
+        a username and a hashed password.
+        Arguments are the same as in `Client.from_hashed`
+
+        Raises:
+            CredentialsError: If the API didn't
+                return a valid session cookie
+        """
+
+        filename = cls.session_file(
+            username, sessions_dir
+        )
+
+        try:
+            return await cls.restore_session(
+                filename, **custom_args
+            )
+        except (OSError, CredentialsError):
+            pass
+
+        atjsparse.get_interpreter(create=js)
+        atconn = AsyncAternosConnect()
+
+        if len(custom_args) > 0:
+            atconn.add_args(**custom_args)
+
+        await atconn.parse_token()
+        atconn.generate_sec()
+
+        credentials = {
+            'user': username,
+            'password': md5,
+        }
+
+        if code is not None:
+            credentials['code'] = str(code)
+
+        loginreq = await atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/login',
+            'POST', data=credentials, sendtoken=True
+        )
+
+        if b'"show2FA":true' in loginreq.content:
+            raise TwoFactorAuthError('2FA code is required')
+
+        if 'ATERNOS_SESSION' not in loginreq.cookies:
+            raise CredentialsError(
+                'Check your username and password'
+            )
+
+        obj = cls(atconn)
+        obj.saved_session = filename
+
+        try:
+            obj.save_session(filename)
+        except OSError:
+            pass
+
+        return obj
+
+    @classmethod
+    async def from_credentials(  # type: ignore[override]
+            cls,
+            username: str,
+            password: str,
+            code: Optional[int] = None,
+            sessions_dir: str = '~',
+            js: Type[Interpreter] = FastInterpreter,
+            **custom_args):
+        """Log in to Aternos with a username and a plain password.
+        Arguments are the same as in `Client.from_credentials`"""
+
+        md5 = Client.md5encode(password)
+        return await cls.from_hashed(
+            username, md5, code,
+            sessions_dir, js,
+            **custom_args
+        )
+
+    @classmethod
+    async def from_session(  # type: ignore[override]
+            cls,
+            session: str,
+            servers: Optional[List[str]] = None,
+            js: Type[Interpreter] = FastInterpreter,
+            state: Optional[Dict[str, Any]] = None,
+            **custom_args):
+        """Log in to Aternos using a session cookie value.
+        Arguments are the same as in `Client.from_session`"""
+
+        atjsparse.get_interpreter(create=js)
+        atconn = AsyncAternosConnect()
+
+        atconn.add_args(**custom_args)
+        atconn.session.cookies['ATERNOS_SESSION'] = session
+
+        if state is None or not atconn.load_state(state):
+            await atconn.parse_token()
+            atconn.generate_sec()
+
+        return cls(atconn, servers)
+
+    @classmethod
+    async def restore_session(  # type: ignore[override]
+            cls,
+            file: str = '~/.aternos',
+            js: Type[Interpreter] = FastInterpreter,
+            **custom_args):
+        """Log in to Aternos using
+        a saved ATERNOS_SESSION cookie.
+        Arguments are the same as in `Client.restore_session`"""
+
+        file = os.path.expanduser(file)
+        saved = cls.read_session(file)
+
+        obj = await cls.from_session(
+            session=saved['session'],
+            servers=saved['servers'] or None,
+            js=js,
+            state=saved,
+            **custom_args
+        )
+        obj.saved_session = file
+
+        return obj
+
+    async def list_servers(  # type: ignore[override]
+            self, cache: bool = True) -> List[AsyncAternosServer]:
+        """Parses a list of your servers from Aternos website
+
+        Args:
+            cache (bool, optional): If the function should use
+                cached servers list (recommended)
+
+        Returns:
+            List of AsyncAternosServer objects
+        """
+
+        if cache and self.parsed:
+            return self.servers
+
+        serverspage = await self.atconn.request_cloudflare(
+            'https://aternos.org/servers/', 'GET'
+        )
+        return self.parse_servers(  # type: ignore[return-value]
+            serverspage.content
+        )
+
+    def new_server(self, servid: str) -> AsyncAternosServer:
+        """Creates a server object without requesting its info
+
+        Args:
+            servid (str): Server unique identifier
+
+        Returns:
+            AsyncAternosServer object
+        """
+
+        return AsyncAternosServer(servid, self.atconn)
+
+    def get_server(self, servid: str) -> AsyncAternosServer:
+        """Returns a cached server object or creates
+        a new one from the server ID. Call `await fetch()`
+        before reading properties of a new object
+
+        Returns:
+            AsyncAternosServer object
+        """
+
+        srv = self.registry.get(servid)
+        if srv is not None:
+            return srv  # type: ignore[return-value]
+
+        return AsyncAternosServer(servid, self.atconn)
+
+    async def fetch_all(  # type: ignore[override]
+            self,
+            workers: int = 8,
+            max_age: Optional[float] = None) -> Dict[str, float]:
+        """Requests the info of all cached servers concurrently
+
+        Args:
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (Optional[float], optional): Maximum age
+                of the cached info, see `AternosServer.fetch`
+
+        Returns:
+            Seconds spent on each server by its ID
+            and the total time under the `total` key
+        """
+
+        limit = asyncio.Semaphore(max(1, workers))
+
+        async def timed_fetch(srv: AsyncAternosServer) -> float:
+            async with limit:
+                start = time.perf_counter()
+                await srv.fetch(max_age)
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(timed_fetch(s) for s in self.servers)
+        )
+        timings = dict(zip(
+            [s.servid for s in self.servers],
+            results
+        ))
+
+        self.index_servers()
+        timings['total'] = time.perf_counter() - start
+        return timings
+
+    async def logout(self) -> None:  # type: ignore[override]
+        """Log out from Aternos account"""
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/logout',
+            'GET', sendtoken=True
+        )
+
+        self.remove_session(self.saved_session)
+
+    async def change_username(  # type: ignore[override]
+            self, value: str) -> None:
+        """Changes a username in your Aternos account
+
+        Args:
+            value (str): New username
+        """
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/username',
+            'POST', data={'username': value}, sendtoken=True
+        )
+
+    async def change_email(  # type: ignore[override]
+            self, value: str) -> None:
+        """Changes an e-mail in your Aternos account
+
+        Args:
+            value (str): New e-mail
+
+        Raises:
+            ValueError: If an invalid e-mail address
+                was passed to the function
+        """
+
+        email = re.compile(
+            r'^[A-Za-z0-9\-_+.]+@[A-Za-z0-9\-_+.]+\.[A-Za-z0-9\-]+$|^$'
+        )
+        if not email.match(value):
+            raise ValueError('Invalid e-mail!')
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/email',
+            'POST', data={'email': value}, sendtoken=True
+        )
+
+    async def change_password(  # type: ignore[override]
+            self, old: str, new: str) -> None:
+        """Changes a password in your Aternos account
+
+        Args:
+            old (str): Old password
+            new (str): New password
+        """
+
+        await self.change_password_hashed(
+            Client.md5encode(old),
+            Client.md5encode(new),
+        )
+
+    async def change_password_hashed(  # type: ignore[override]
+            self, old: str, new: str) -> None:
+        """Changes a password in your Aternos account.
+        Unlike `change_password`, this function
+        takes hashed passwords as arguments
+
+        Args:
+            old (str): Old password hashed with MD5
+            new (str): New password hashed with MD5
+        """
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/password',
+            'POST', data={
+                'oldpassword': old,
+                'newpassword': new,
+            }, sendtoken=True
+        )
+
+    async def qrcode_2fa(self) -> Dict[str, str]:  # type: ignore[override]
+        """Requests a secret code and
+        a QR code for enabling 2FA"""
+
+        resp = await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/secret',
+            'GET', sendtoken=True
+        )
+        return resp.json()
+
+    async def enable_2fa(self, code: int) -> None:  # type: ignore[override]
+        """Enables Two-Factor Authentication
+
+        Args:
+            code (int): 2FA code
+        """
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/twofactor',
+            'POST', data={
+                'code': code
+            }, sendtoken=True
+        )
+
+    async def disable_2fa(self, code: int) -> None:  # type: ignore[override]
+        """Disables Two-Factor Authentication
+
+        Args:
+            code (int): 2FA code
+        """
+
+        await self.atconn.request_cloudflare(
+            'https://aternos.org/ajax/account/disbaleTwofactor',
+            'POST', data={
+                'code': code
+            }, sendtoken=True
+        )
@@ -2,18 +2,23 @@
 
 import enum
 import re
+import time
 
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, List, Tuple, Union, Optional
 from typing import TYPE_CHECKING
 
 import lxml.html
 
 if TYPE_CHECKING:
     from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
 
 DAT_PREFIX = 'Data:'
 DAT_GR_PREFIX = 'Data:GameRules:'
 
+# How long the options page is reused by getters (seconds)
+OPTIONS_TTL = 60.0
+
 
 class ServerOpts(enum.Enum):
 
@@ -115,41 +120,282 @@ tzcheck = re.compile(r'(^[A-Z]\w+\/[A-Z]\w+$)|^UTC$')
 convert = {
     'config-option-number': int,
     'config-option-select': int,
-    'config-option-toggle': bool
+    'config-option-toggle': lambda v: v.strip().lower() in ('true', '1', 'on')
 }
 
 
+def find_timezone(opttree: 'lxml.html.HtmlElement') -> str:
+    """Finds the timezone in the parsed options page
+
+    Args:
+        opttree (lxml.html.HtmlElement): Options page tree
+
+    Returns:
+        Area/Location
+    """
+
+    tzopt = opttree.xpath(
+        '//div[@class="options-other-input timezone-switch"]'
+    )[0]
+    tztext = tzopt.xpath('.//div[@class="option current"]')[0].text
+    return tztext.strip()
+
+
+def find_java(opttree: 'lxml.html.HtmlElement') -> int:
+    """Finds the Java version in the parsed options page
+
+    Args:
+        opttree (lxml.html.HtmlElement): Options page tree
+
+    Returns:
+        Java image version
+    """
+
+    imgopt = opttree.xpath(
+        '//div[@class="options-other-input image-switch"]'
+    )[0]
+    imgver = imgopt.xpath(
+        './/div[@class="option current"]/@data-value'
+    )[0]
+
+    jdkver = str(imgver or '').removeprefix('openjdk:')
+    return int(jdkver)
+
+
+def read_props(
+        opttree: 'lxml.html.HtmlElement',
+        prefixes: Optional[List[str]] = None) -> Dict[str, Tuple[Optional[str], str]]:
+    """Reads config options in the parsed page
+    without converting the values
+
+    Args:
+        opttree (lxml.html.HtmlElement): Page tree
+        prefixes (Optional[List[str]], optional):
+            Key prefixes for each options block
+
+    Returns:
+        Option type (a `convert` key or None)
+        and the value as text by the option key
+    """
+
+    result: Dict[str, Tuple[Optional[str], str]] = {}
+    configs = opttree.xpath('//div[@class="config-options"]')
+
+    for i, conf in enumerate(configs):
+        opts = conf.xpath('.//div[contains(@class,"config-option ")]')
+        prefix = ''
+        if prefixes is not None and i < len(prefixes):
+            prefix = prefixes[i]
+
+        for opt in opts:
+            key = opt.xpath(
+                './/span[@class="config-option-output-key"]'
+            )[0].text
+            value = opt.xpath(
+                './/span[@class="config-option-output-value"]'
+            )[0].text or ''
+
+            opttype = next((
+                c for c in opt.get('class', '').split()
+                if c in convert
+            ), None)
+
+            result[f'{prefix}{key}'] = (opttype, value)
+
+    return result
+
+
+def convert_props(
+        options: Dict[str, Tuple[Optional[str], str]]) -> Dict[str, Any]:
+    """Converts the options read by `read_props`
+    to their property types
+
+    Args:
+        options (Dict[str, Tuple[Optional[str], str]]):
+            Option types and values
+
+    Returns:
+        Options dictionary
+    """
+
+    result: Dict[str, Any] = {}
+    for key, (opttype, value) in options.items():
+        result[key] = value
+        if opttype is not None:
+            try:
+                result[key] = convert[opttype](value)
+            except ValueError:
+                pass
+    return result
+
+
+def find_props(
+        opttree: 'lxml.html.HtmlElement',
+        proptyping: bool = True,
+        prefixes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Finds config options in the parsed page
+
+    Args:
+        opttree (lxml.html.HtmlElement): Page tree
+        proptyping (bool, optional):
+            If the values should be converted
+            to the property type
+        prefixes (Optional[List[str]], optional):
+            Key prefixes for each options block
+
+    Returns:
+        Options dictionary
+    """
+
+    options = read_props(opttree, prefixes)
+    if proptyping:
+        return convert_props(options)
+    return {key: value for key, (_, value) in options.items()}
+
+
+class OptionsSnapshot:
+
+    """Timezone, Java version and server.properties
+    parsed from a single request of the options page"""
+
+    def __init__(self, content: bytes) -> None:
+        """Timezone, Java version and server.properties
+        parsed from a single request of the options page
+
+        Args:
+            content (bytes): HTML page content
+        """
+
+        opttree = lxml.html.fromstring(content)
+
+        self.timezone = find_timezone(opttree)
+        self.java = find_java(opttree)
+        # the page is walked once, the types are
+        # converted from the collected values
+        options = read_props(opttree)
+        self.raw_props = {key: value for key, (_, value) in options.items()}
+        self.props = convert_props(options)
+        self.fetched = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        """Time since the page was requested
+
+        Returns:
+            Age in seconds
+        """
+
+        return time.monotonic() - self.fetched
+
+    def server_props(self, proptyping: bool = True) -> Dict[str, Any]:
+        """Copy of `server.properties` options
+
+        Args:
+            proptyping (bool, optional):
+                If the values should be converted
+                to the property type
+
+        Returns:
+            `server.properties` dictionary
+        """
+
+        return dict(self.props if proptyping else self.raw_props)
+
+
 class AternosConfig:
 
     """Class for editing server settings"""
 
-    def __init__(self, atserv: 'AternosServer') -> None:
+    def __init__(
+            self,
+            atserv: 'AternosServer',
+            ttl: float = OPTIONS_TTL) -> None:
         """Class for editing server settings
 
         Args:
             atserv (python_aternos.atserver.AternosServer):
                 atserver.AternosServer object
+            ttl (float, optional): How long the options
+                page snapshot is reused in seconds
         """
 
         self.atserv = atserv
+        self.ttl = ttl
+        self.snapshot: Optional[OptionsSnapshot] = None
 
-    def get_timezone(self) -> str:
-        """Parses timezone from options page
+    def options(self, max_age: Optional[float] = None) -> OptionsSnapshot:
+        """Returns the options page snapshot,
+        requests it if the cached one is outdated
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                of the snapshot in seconds, `ttl` by default,
+                0 forces a request
 
         Returns:
-            Area/Location
+            OptionsSnapshot object
         """
 
+        cached = self.cached_options(max_age)
+        if cached is not None:
+            return cached
+
         optreq = self.atserv.atserver_request(
             'https://aternos.org/options', 'GET'
         )
-        opttree = lxml.html.fromstring(optreq)
+        self.snapshot = OptionsSnapshot(optreq.content)
+        return self.snapshot
+
+    def cached_options(
+            self, max_age: Optional[float] = None) -> Optional[OptionsSnapshot]:
+        """Returns the cached options page snapshot
+        if it is fresh enough
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                in seconds, `ttl` by default
+
+        Returns:
+            OptionsSnapshot object or None
+        """
+
+        if max_age is None:
+            max_age = self.ttl
+
+        if self.snapshot is None or not max_age:
+            return None
+
+        if self.snapshot.age > max_age:
+            return None
+
+        return self.snapshot
 
-        tzopt = opttree.xpath(
-            '//div[@class="options-other-input timezone-switch"]'
-        )[0]
-        tztext = tzopt.xpath('.//div[@class="option current"]')[0].text
-        return tztext.strip()
+    def invalidate(self) -> None:
+        """Drops the options page snapshot.
+        Called when an option is changed"""
+
+        self.snapshot = None
+
+    def get_timezone(self) -> str:
+        """Parses timezone from options page
+
+        Returns:
+            Area/Location
+        """
+
+        return self.options().timezone
+
+    def parse_timezone(self, content: bytes) -> str:
+        """Parses timezone from options page content
+
+        Args:
+            content (bytes): HTML page content
+
+        Returns:
+            Area/Location
+        """
+
+        return find_timezone(lxml.html.fromstring(content))
 
     def set_timezone(self, value: str) -> None:
         """Sets new timezone
@@ -173,6 +419,7 @@ class AternosConfig:
             'POST', data={'timezone': value},
             sendtoken=True
         )
+        self.invalidate()
 
     def get_java(self) -> int:
         """Parses Java version from options page
@@ -181,19 +428,19 @@ class AternosConfig:
             Java image version
         """
 
-        optreq = self.atserv.atserver_request(
-            'https://aternos.org/options', 'GET'
-        )
-        opttree = lxml.html.fromstring(optreq)
-        imgopt = opttree.xpath(
-            '//div[@class="options-other-input image-switch"]'
-        )[0]
-        imgver = imgopt.xpath(
-            './/div[@class="option current"]/@data-value'
-        )[0]
+        return self.options().java
+
+    def parse_java(self, content: bytes) -> int:
+        """Parses Java version from options page content
+
+        Args:
+            content (bytes): HTML page content
+
+        Returns:
+            Java image version
+        """
 
-        jdkver = str(imgver or '').removeprefix('openjdk:')
-        return int(jdkver)
+        return find_java(lxml.html.fromstring(content))
 
     def set_java(self, value: int) -> None:
         """Sets new Java version
@@ -207,6 +454,7 @@ class AternosConfig:
             'POST', data={'image': f'openjdk:{value}'},
             sendtoken=True
         )
+        self.invalidate()
 
     #
     # server.properties
@@ -238,7 +486,7 @@ class AternosConfig:
             `server.properties` dictionary
         """
 
-        return self.__get_all_props('https://aternos.org/options', proptyping)
+        return self.options().server_props(proptyping)
 
     def set_server_props(self, props: Dict[str, Any]) -> None:
         """Updates server.properties options with the given dict
@@ -335,33 +583,245 @@ class AternosConfig:
             }, sendtoken=True
         )
 
+        if file == '/server.properties':
+            self.invalidate()
+
     def __get_all_props(
             self, url: str, proptyping: bool = True,
             prefixes: Optional[List[str]] = None) -> Dict[str, Any]:
 
         optreq = self.atserv.atserver_request(url, 'GET')
-        opttree = lxml.html.fromstring(optreq.content)
-        configs = opttree.xpath('//div[@class="config-options"]')
+        return self.parse_props(optreq.content, proptyping, prefixes)
 
-        for i, conf in enumerate(configs):
-            opts = conf.xpath('/div[contains(@class,"config-option ")]')
-            result = {}
+    def parse_props(
+            self, content: bytes, proptyping: bool = True,
+            prefixes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Parses config options from the page content
 
-            for opt in opts:
-                key = opt.xpath(
-                    './/span[@class="config-option-output-key"]'
-                )[0].text
-                value = opt.xpath(
-                    './/span[@class="config-option-output-value"]'
-                )[0].text
+        Args:
+            content (bytes): HTML page content
+            proptyping (bool, optional):
+                If the values should be converted
+                to the property type
+            prefixes (Optional[List[str]], optional):
+                Key prefixes for each options block
 
-                if prefixes is not None:
-                    key = f'{prefixes[i]}{key}'
+        Returns:
+            Options dictionary
+        """
 
-                opttype = opt.xpath('/@class').split(' ')[1]
-                if proptyping and opttype in convert:
-                    value = convert[opttype](value)
+        return find_props(
+            lxml.html.fromstring(content),
+            proptyping, prefixes
+        )
+
+
+class AsyncAternosConfig(AternosConfig):
+
+    """Asyncio version of AternosConfig"""
+
+    atserv: 'AsyncAternosServer'
+
+    async def options(  # type: ignore[override]
+            self, max_age: Optional[float] = None) -> OptionsSnapshot:
+        """Returns the options page snapshot,
+        requests it if the cached one is outdated,
+        see `AternosConfig.options`
+
+        Returns:
+            OptionsSnapshot object
+        """
+
+        cached = self.cached_options(max_age)
+        if cached is not None:
+            return cached
+
+        optreq = await self.atserv.atserver_request(
+            'https://aternos.org/options', 'GET'
+        )
+        self.snapshot = OptionsSnapshot(optreq.content)
+        return self.snapshot
+
+    async def get_timezone(self) -> str:  # type: ignore[override]
+        """Parses timezone from options page
+
+        Returns:
+            Area/Location
+        """
+
+        return (await self.options()).timezone
+
+    async def set_timezone(  # type: ignore[override]
+            self, value: str) -> None:
+        """Sets new timezone
+
+        Args:
+            value (str): New timezone
+
+        Raises:
+            ValueError: If given string doesn't
+                match `Area/Location` format
+        """
 
-                result[key] = value
+        matches_tz = tzcheck.search(value)
+        if not matches_tz:
+            raise ValueError(
+                'Timezone must match zoneinfo format: Area/Location'
+            )
+
+        await self.atserv.atserver_request(
+            'https://aternos.org/ajax/timezone',
+            'POST', data={'timezone': value},
+            sendtoken=True
+        )
+        self.invalidate()
+
+    async def get_java(self) -> int:  # type: ignore[override]
+        """Parses Java version from options page
+
+        Returns:
+            Java image version
+        """
+
+        return (await self.options()).java
+
+    async def set_java(self, value: int) -> None:  # type: ignore[override]
+        """Sets new Java version
+
+        Args:
+            value (int): New Java image version
+        """
+
+        await self.atserv.atserver_request(
+            'https://aternos.org/ajax/image',
+            'POST', data={'image': f'openjdk:{value}'},
+            sendtoken=True
+        )
+        self.invalidate()
+
+    async def set_server_prop(  # type: ignore[override]
+            self, option: str, value: Any) -> None:
+        """Sets server.properties option
+
+        Args:
+            option (str): Option name
+            value (Any): New value
+        """
+
+        await self.__set_prop(
+            '/server.properties',
+            option, value
+        )
+
+    async def get_server_props(  # type: ignore[override]
+            self, proptyping: bool = True) -> Dict[str, Any]:
+        """Parses all server.properties from options page
+
+        Args:
+            proptyping (bool, optional):
+                If the returned dict should
+                contain value that matches
+                property type (e.g. max-players will be int)
+                instead of string
+
+        Returns:
+            `server.properties` dictionary
+        """
+
+        return (await self.options()).server_props(proptyping)
+
+    async def set_server_props(  # type: ignore[override]
+            self, props: Dict[str, Any]) -> None:
+        """Updates server.properties options with the given dict
+
+        Args:
+            props (Dict[str,Any]):
+                Dictionary with `{key:value}` properties
+        """
+
+        for key in props:
+            await self.set_server_prop(key, props[key])
+
+    async def set_world_prop(  # type: ignore[override]
+            self, option: Union[WorldOpts, WorldRules],
+            value: Any, gamerule: bool = False,
+            world: str = 'world') -> None:
+        """Sets level.dat option for specified world
+
+        Args:
+            option (Union[WorldOpts, WorldRules]): Option name
+            value (Any): New value
+            gamerule (bool, optional): If the option is a gamerule
+            world (str, optional): Name of the world which
+                `level.dat` must be edited
+        """
+
+        prefix = DAT_PREFIX
+        if gamerule:
+            prefix = DAT_GR_PREFIX
+
+        await self.__set_prop(
+            f'/{world}/level.dat',
+            f'{prefix}{option}',
+            value
+        )
+
+    async def get_world_props(  # type: ignore[override]
+            self, world: str = 'world',
+            proptyping: bool = True) -> Dict[str, Any]:
+        """Parses level.dat from specified world's options page
+
+        Args:
+            world (str, optional): Name of the worl
+            proptyping (bool, optional):
+                If the returned dict should
+                contain the value that matches
+                property type (e.g. randomTickSpeed will be bool)
+                instead of string
+
+        Returns:
+            `level.dat` options dictionary
+        """
+
+        optreq = await self.atserv.atserver_request(
+            f'https://aternos.org/files/{world}/level.dat', 'GET'
+        )
+        return self.parse_props(
+            optreq.content, proptyping,
+            [DAT_PREFIX, DAT_GR_PREFIX]
+        )
+
+    async def set_world_props(  # type: ignore[override]
+            self,
+            props: Dict[Union[WorldOpts, WorldRules], Any],
+            world: str = 'world') -> None:
+        """Sets level.dat options from
+        the dictionary for the specified world
+
+        Args:
+            props (Dict[Union[WorldOpts, WorldRules], Any]):
+                `level.dat` options
+            world (str): name of the world which
+                `level.dat` must be edited
+        """
+
+        for key in props:
+            await self.set_world_prop(
+                option=key,
+                value=props[key],
+                world=world
+            )
+
+    async def __set_prop(self, file: str, option: str, value: Any) -> None:
+
+        await self.atserv.atserver_request(
+            'https://aternos.org/ajax/config',
+            'POST', data={
+                'file': file,
+                'option': option,
+                'value': value
+            }, sendtoken=True
+        )
 
-        return result
+        if file == '/server.properties':
+            self.invalidate()
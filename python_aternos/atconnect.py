@@ -2,14 +2,18 @@
 
 import re
 import time
+import asyncio
 import secrets
 import logging
+import threading
 from functools import partial
 
 from typing import Optional
-from typing import List, Dict, Any
+from typing import List, Dict, Tuple, Any
+from typing import Callable
 
 import requests
+from requests.cookies import RequestsCookieJar
 
 from cloudscraper import CloudScraper
 
@@ -27,20 +31,66 @@ SCRIPT_TAG_REGEX = (
     rb'<script type=([\'"]?)text/javascript\1>.+?</script>'
 )
 
+# How long a saved ajax token is reused (seconds)
+TOKEN_MAX_AGE = 12 * 60 * 60
+# Status codes meaning that the ajax token was rejected
+TOKEN_REJECTED = (400, 403)
+
+
+class LockedCookieJar(RequestsCookieJar):
+
+    """Cookie jar shared by the threads sending requests.
+    http.cookiejar already changes cookies under the jar lock,
+    iteration (used by requests to merge cookies
+    and by name lookups) goes over a snapshot
+    taken under the same lock"""
+
+    def __iter__(self):
+        with self._cookies_lock:
+            return iter(list(super().__iter__()))
+
 
 class AternosConnect:
 
     """Class for sending API requests,
     bypassing Cloudflare and parsing responses"""
 
-    def __init__(self) -> None:
+    def __init__(self, keepalive: bool = True) -> None:
+        """Class for sending API requests,
+        bypassing Cloudflare and parsing responses
+
+        Args:
+            keepalive (bool, optional): Keep one CloudScraper
+                session with its connection pool and rebuild it
+                only on a Cloudflare challenge. If False,
+                the session is recreated before each request
+        """
 
+        self.keepalive = keepalive
         self.cf_init = partial(CloudScraper)
-        self.session = self.cf_init()
+        # the session is used by several threads
+        # (fetch_all, file manager walks, async requests),
+        # replacing it and the ATERNOS_SESSION cookie handling
+        # are done under this lock
+        self.session_lock = threading.RLock()
+        self.session = self.new_session()
         self.sec = ''
         self.token = ''
         self.atcookie = ''
 
+        # when the token was parsed and
+        # when the API accepted it last time
+        self.token_time = 0.0
+        self.validated = 0.0
+        # False if the token was restored from a file
+        # and the API has not accepted it yet
+        self.token_checked = True
+
+        # connections stats of the replaced sessions
+        self.rebuilds = 0
+        self.old_requests = 0
+        self.old_connections = 0
+
     def add_args(self, **kwargs) -> None:
         """Pass arguments to CloudScraper
         session object __init__
@@ -68,10 +118,77 @@ class AternosConnect:
         session object and copies all cookies.
         Required for bypassing Cloudflare"""
 
-        old_cookies = self.session.cookies
-        self.session = self.cf_init()
-        self.session.cookies.update(old_cookies)
-        del old_cookies
+        with self.session_lock:
+            stats = self.pool_stats(self.session)
+            self.old_requests += stats[0]
+            self.old_connections += stats[1]
+            self.rebuilds += 1
+
+            old_cookies = self.session.cookies
+            self.session = self.new_session()
+            self.session.cookies.update(old_cookies)
+            del old_cookies
+
+    def new_session(self) -> CloudScraper:
+        """Creates a CloudScraper session
+        with a thread-safe cookie jar
+
+        Returns:
+            CloudScraper session
+        """
+
+        session = self.cf_init()
+        cookies = LockedCookieJar()
+        cookies.update(session.cookies)
+        session.cookies = cookies
+        return session
+
+    @staticmethod
+    def pool_stats(session: requests.Session) -> Tuple[int, int]:
+        """Counts requests and opened connections
+        in the urllib3 pools of the session
+
+        Args:
+            session (requests.Session): CloudScraper session
+
+        Returns:
+            Requests count and new connections count
+        """
+
+        reqs = 0
+        conns = 0
+        for adapter in session.adapters.values():
+            manager = getattr(adapter, 'poolmanager', None)
+            if manager is None:
+                continue
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                reqs += pool.num_requests
+                conns += pool.num_connections
+        return reqs, conns
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Returns how many connections were reused
+        from the pool and how many were newly created,
+        including the sessions replaced by `refresh_session`
+
+        Returns:
+            Dictionary with `requests`, `new`,
+            `reused` and `rebuilds` counters
+        """
+
+        reqs, conns = self.pool_stats(self.session)
+        reqs += self.old_requests
+        conns += self.old_connections
+
+        return {
+            'requests': reqs,
+            'new': conns,
+            'reused': max(reqs - conns, 0),
+            'rebuilds': self.rebuilds,
+        }
 
     def parse_token(self) -> str:
         """Parses Aternos ajax token that
@@ -91,6 +208,26 @@ class AternosConnect:
             'https://aternos.org/go/', 'GET'
         ).content
 
+        self.token = self.extract_token(loginpage)
+        self.token_time = time.time()
+        self.token_checked = True
+        return self.token
+
+    def extract_token(self, loginpage: bytes) -> str:
+        """Extracts Aternos ajax token
+        from the login page HTML
+
+        Args:
+            loginpage (bytes): Content of `https://aternos.org/go/`
+
+        Raises:
+            TokenError: If the parser is unable
+                to extract ajax token from HTML
+
+        Returns:
+            Aternos ajax token
+        """
+
         # Using the standard string methods
         # instead of the expensive xml parsing
         head = b'<head>'
@@ -119,10 +256,9 @@ class AternosConnect:
                 token_func = js_code[1]
 
             js = atjsparse.get_interpreter()
-            js.exec_js(token_func)
-            self.token = js['AJAX_TOKEN']
+            return js.exec_get(token_func, 'AJAX_TOKEN')
 
-        except (IndexError, TypeError) as err:
+        except (IndexError, TypeError, KeyError) as err:
 
             logging.warning('---')
             logging.warning('Unable to parse AJAX_TOKEN!')
@@ -141,8 +277,6 @@ class AternosConnect:
                 'Unable to parse TOKEN from the page'
             ) from err
 
-        return self.token
-
     def generate_sec(self) -> str:
         """Generates Aternos SEC token which
         is also needed for most API requests
@@ -161,6 +295,107 @@ class AternosConnect:
 
         return self.sec
 
+    def dump_state(self) -> Dict[str, Any]:
+        """Returns the ajax token, SEC and cookies
+        for saving them into a session file
+
+        Returns:
+            JSON-serializable dictionary
+        """
+
+        return {
+            'token': self.token,
+            'sec': self.sec,
+            'token_time': self.token_time,
+            'validated': self.validated,
+            'cookies': [
+                [c.name, c.value, c.domain, c.path]
+                for c in self.session.cookies
+                if c.name != 'ATERNOS_SESSION'
+            ],
+        }
+
+    def load_state(
+            self,
+            state: Dict[str, Any],
+            max_age: float = TOKEN_MAX_AGE) -> bool:
+        """Restores cookies, the ajax token and SEC
+        saved with `dump_state`. The token is used
+        optimistically and parsed again only
+        if the API rejects it
+
+        Args:
+            state (Dict[str, Any]): Saved state
+            max_age (float, optional): Maximum token age in seconds
+
+        Returns:
+            True if the saved token can be used,
+            False if it must be parsed again
+        """
+
+        for name, value, domain, path in state.get('cookies', []):
+            self.session.cookies.set(
+                name, value,
+                domain=domain, path=path
+            )
+
+        token = state.get('token', '')
+        sec = state.get('sec', '')
+        token_time = float(state.get('token_time', 0))
+
+        if not token or ':' not in sec:
+            return False
+
+        if time.time() - token_time > max_age:
+            logging.debug('Saved token is too old')
+            return False
+
+        randkey, randval = sec.split(':', 1)
+        self.session.cookies.set(
+            f'ATERNOS_SEC_{randkey}', randval,
+            domain='aternos.org'
+        )
+
+        self.token = token
+        self.sec = sec
+        self.token_time = token_time
+        self.validated = float(state.get('validated', 0))
+        self.token_checked = False
+        return True
+
+    def token_rejected(
+            self,
+            req: requests.Response,
+            sendtoken: bool) -> bool:
+        """Checks the response to a request with the ajax token.
+        Marks the token as valid or detects that
+        a restored token was rejected by the API
+
+        Args:
+            req (requests.Response): API response
+            sendtoken (bool): If the token was sent
+
+        Returns:
+            True if the token must be parsed again
+        """
+
+        if not sendtoken:
+            return False
+
+        if req.status_code < 400:
+            self.token_checked = True
+            self.validated = time.time()
+            return False
+
+        if self.token_checked or req.status_code not in TOKEN_REJECTED:
+            return False
+
+        logging.info('Saved token was rejected, parsing a new one')
+        # parse_token() marks the token as checked,
+        # so it will be retried only once
+        # (the retry also counts against `retry`)
+        return True
+
     def request_cloudflare(
             self, url: str, method: str,
             params: Optional[Dict[Any, Any]] = None,
@@ -168,7 +403,8 @@ class AternosConnect:
             headers: Optional[Dict[Any, Any]] = None,
             reqcookies: Optional[Dict[Any, Any]] = None,
             sendtoken: bool = False,
-            retry: int = 5) -> requests.Response:
+            retry: int = 5,
+            stream: bool = False) -> requests.Response:
         """Sends a request to Aternos API bypass Cloudflare
 
         Args:
@@ -184,6 +420,8 @@ class AternosConnect:
                 should be sent
             retry (int, optional): How many times parser must retry
                 connection to API bypass Cloudflare
+            stream (bool, optional): Don't download the response body
+                immediately, it must be read with `iter_content`
 
         Raises:
             CloudflareError: When the parser has exceeded retries count
@@ -196,12 +434,59 @@ class AternosConnect:
         if retry <= 0:
             raise CloudflareError('Unable to bypass Cloudflare protection')
 
-        try:
-            self.atcookie = self.session.cookies['ATERNOS_SESSION']
-        except KeyError:
-            pass
+        sendreq = self.prepare_request(
+            url, method,
+            params, data,
+            headers, reqcookies,
+            sendtoken, stream
+        )
+        req = sendreq()
 
-        self.refresh_session()
+        if self.is_cloudflare(req):
+            logging.info('Retrying to bypass Cloudflare')
+            req.close()
+            self.refresh_session()
+            time.sleep(0.3)
+            return self.request_cloudflare(
+                url, method,
+                params, data,
+                headers, reqcookies,
+                sendtoken, retry - 1,
+                stream
+            )
+
+        if self.token_rejected(req, sendtoken):
+            req.close()
+            self.parse_token()
+            self.generate_sec()
+            return self.request_cloudflare(
+                url, method,
+                params, data,
+                headers, reqcookies,
+                sendtoken, retry - 1,
+                stream
+            )
+
+        return self.check_response(req, stream)
+
+    def prepare_request(
+            self, url: str, method: str,
+            params: Optional[Dict[Any, Any]] = None,
+            data: Optional[Dict[Any, Any]] = None,
+            headers: Optional[Dict[Any, Any]] = None,
+            reqcookies: Optional[Dict[Any, Any]] = None,
+            sendtoken: bool = False,
+            stream: bool = False) -> Callable[[], requests.Response]:
+        """Prepares the session cookies, the token
+        and the request arguments without sending anything.
+        Arguments are the same as in `request_cloudflare`
+
+        Raises:
+            NotImplementedError: When the specified method is not GET or POST
+
+        Returns:
+            Function without arguments which sends the request
+        """
 
         params = params or {}
         data = data or {}
@@ -218,9 +503,22 @@ class AternosConnect:
             params['SEC'] = self.sec
             headers['X-Requested-With'] = 'XMLHttpRequest'
 
-        # requests.cookies.CookieConflictError bugfix
-        reqcookies['ATERNOS_SESSION'] = self.atcookie
-        del self.session.cookies['ATERNOS_SESSION']
+        with self.session_lock:
+            try:
+                self.atcookie = self.session.cookies['ATERNOS_SESSION']
+            except KeyError:
+                pass
+
+            if not self.keepalive:
+                self.refresh_session()
+
+            # requests.cookies.CookieConflictError bugfix
+            reqcookies['ATERNOS_SESSION'] = self.atcookie
+            del self.session.cookies['ATERNOS_SESSION']
+
+            # a concurrent refresh_session() must not
+            # change the session this request is sent with
+            session = self.session
 
         reqcookies_dbg = {
             k: str(v or '')[:3]
@@ -229,7 +527,7 @@ class AternosConnect:
 
         session_cookies_dbg = {
             k: str(v or '')[:3]
-            for k, v in self.session.cookies.items()
+            for k, v in session.cookies.items()
         }
 
         logging.debug('Requesting(%s)%s', method, url)
@@ -240,41 +538,67 @@ class AternosConnect:
         logging.debug('session-cookies=%s', session_cookies_dbg)
 
         if method == 'POST':
-            sendreq = partial(
-                self.session.post,
+            return partial(
+                session.post,
+                url,
                 params=params,
-                data=data
-            )
-        else:
-            sendreq = partial(
-                self.session.get,
-                params={**params, **data}
+                data=data,
+                headers=headers,
+                cookies=reqcookies,
+                stream=stream
             )
 
-        req = sendreq(
+        return partial(
+            session.get,
             url,
+            params={**params, **data},
             headers=headers,
-            cookies=reqcookies
+            cookies=reqcookies,
+            stream=stream
         )
 
+    @staticmethod
+    def is_cloudflare(req: requests.Response) -> bool:
+        """Checks if the response is a Cloudflare challenge page
+
+        Args:
+            req (requests.Response): API response
+
+        Returns:
+            True if the request must be retried
+        """
+
         resp_type = req.headers.get('content-type', '')
         html_type = resp_type.find('text/html') != -1
         cloudflare = req.status_code == 403
 
-        if html_type and cloudflare:
-            logging.info('Retrying to bypass Cloudflare')
-            time.sleep(0.3)
-            return self.request_cloudflare(
-                url, method,
-                params, data,
-                headers, reqcookies,
-                sendtoken, retry - 1
-            )
+        return html_type and cloudflare
+
+    @staticmethod
+    def check_response(
+            req: requests.Response,
+            stream: bool = False) -> requests.Response:
+        """Logs the response and raises
+        an exception on error status codes
+
+        Args:
+            req (requests.Response): API response
+            stream (bool, optional): If the body is not downloaded yet,
+                it isn't logged then
+
+        Raises:
+            AternosPermissionError: On 402 status code
+            requests.HTTPError: On other error status codes
+
+        Returns:
+            The same response
+        """
 
-        logging.debug('AternosConnect received: %s', req.text[:65])
+        if not stream:
+            logging.debug('AternosConnect received: %s', req.text[:65])
         logging.info(
             '%s completed with %s status',
-            method, req.status_code
+            req.request.method, req.status_code
         )
 
         if req.status_code == 402:
@@ -292,6 +616,119 @@ class AternosConnect:
             Session cookie
         """
 
+        # request_cloudflare moves the cookie
+        # from the session to self.atcookie
         return self.session.cookies.get(
             'ATERNOS_SESSION', ''
+        ) or self.atcookie
+
+
+class AsyncAternosConnect(AternosConnect):
+
+    """Asyncio version of AternosConnect.
+    Cookies, token and SEC are handled in the event loop,
+    and the blocking CloudScraper calls are sent
+    in worker threads, so many requests can be in flight
+    without blocking the loop"""
+
+    def __init__(
+            self,
+            keepalive: bool = True,
+            max_requests: int = 8) -> None:
+        """Asyncio version of AternosConnect
+
+        Args:
+            keepalive (bool, optional): Keep one CloudScraper
+                session, see `AternosConnect.__init__`
+            max_requests (int, optional): How many
+                requests can be sent concurrently
+        """
+
+        super().__init__(keepalive)
+        self.max_requests = max_requests
+        self.semaphore = asyncio.Semaphore(max_requests)
+
+    async def parse_token(self) -> str:  # type: ignore[override]
+        """Parses Aternos ajax token that
+        is needed for most requests
+
+        Raises:
+            TokenError: If the parser is unable
+                to extract ajax token from HTML
+
+        Returns:
+            Aternos ajax token
+        """
+
+        loginpage = await self.request_cloudflare(
+            'https://aternos.org/go/', 'GET'
         )
+
+        # JS interpreters are slow, do not block the loop
+        self.token = await asyncio.to_thread(
+            self.extract_token, loginpage.content
+        )
+        self.token_time = time.time()
+        self.token_checked = True
+        return self.token
+
+    async def request_cloudflare(  # type: ignore[override]
+            self, url: str, method: str,
+            params: Optional[Dict[Any, Any]] = None,
+            data: Optional[Dict[Any, Any]] = None,
+            headers: Optional[Dict[Any, Any]] = None,
+            reqcookies: Optional[Dict[Any, Any]] = None,
+            sendtoken: bool = False,
+            retry: int = 5,
+            stream: bool = False) -> requests.Response:
+        """Sends a request to Aternos API bypass Cloudflare
+        without blocking the event loop.
+        Arguments are the same as in
+        `AternosConnect.request_cloudflare`
+
+        Raises:
+            CloudflareError: When the parser has exceeded retries count
+            NotImplementedError: When the specified method is not GET or POST
+
+        Returns:
+            API response
+        """
+
+        if retry <= 0:
+            raise CloudflareError('Unable to bypass Cloudflare protection')
+
+        async with self.semaphore:
+            sendreq = self.prepare_request(
+                url, method,
+                params, data,
+                headers, reqcookies,
+                sendtoken, stream
+            )
+            req = await asyncio.to_thread(sendreq)
+
+        if self.is_cloudflare(req):
+            logging.info('Retrying to bypass Cloudflare')
+            req.close()
+            self.refresh_session()
+            await asyncio.sleep(0.3)
+            return await self.request_cloudflare(
+                url, method,
+                params, data,
+                headers, reqcookies,
+                sendtoken, retry - 1,
+                stream
+            )
+
+        if self.token_rejected(req, sendtoken):
+            req.close()
+            await self.parse_token()
+            self.generate_sec()
+            return await self.request_cloudflare(
+                url, method,
+                params, data,
+                headers, reqcookies,
+                sendtoken, retry - 1,
+                stream
+            )
+
+        return self.check_response(req, stream)
@@ -0,0 +1,142 @@
+"""Keeps recent console lines
+received from the websocket"""
+
+import re
+import collections
+
+from itertools import islice
+from typing import Deque, List
+from typing import Optional, Union
+from typing import Pattern
+
+# Default buffer limits
+CONSOLE_LINES = 2000
+CONSOLE_BYTES = 256 * 1024
+
+
+class ConsoleLog:
+
+    """Ring buffer of the latest console lines,
+    bounded by lines count and size in bytes"""
+
+    def __init__(
+            self,
+            maxlines: int = CONSOLE_LINES,
+            maxbytes: Optional[int] = CONSOLE_BYTES) -> None:
+        """Ring buffer of the latest console lines,
+        bounded by lines count and size in bytes
+
+        Args:
+            maxlines (int, optional): Max lines count
+            maxbytes (Optional[int], optional): Max size of all lines
+                in bytes (UTF-8), None means no limit
+        """
+
+        self.maxlines = maxlines
+        self.maxbytes = maxbytes
+
+        self.lines: Deque[str] = collections.deque(maxlen=maxlines)
+        self.size = 0
+
+        # lines received since the buffer was created,
+        # including the evicted ones
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def append(self, line: str) -> None:
+        """Adds a line evicting the oldest ones
+        if the buffer is full
+
+        Args:
+            line (str): Console line
+        """
+
+        if len(self.lines) == self.maxlines:
+            self.size -= len(self.lines[0].encode('utf-8'))
+
+        self.lines.append(line)
+        self.size += len(line.encode('utf-8'))
+        self.total += 1
+
+        if self.maxbytes is None:
+            return
+
+        # always keep the latest line
+        while self.size > self.maxbytes and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft().encode('utf-8'))
+
+    def clear(self) -> None:
+
+        """Removes all lines"""
+
+        self.lines.clear()
+        self.size = 0
+
+    def tail(self, count: int = 20) -> List[str]:
+        """Latest lines
+
+        Args:
+            count (int, optional): Lines count
+
+        Returns:
+            Up to `count` lines, the oldest first
+        """
+
+        if count <= 0:
+            return []
+
+        # reading from the end doesn't walk the whole deque
+        lines = list(islice(reversed(self.lines), count))
+        lines.reverse()
+        return lines
+
+    def grep(
+            self,
+            pattern: Union[str, Pattern[str]],
+            regex: bool = False,
+            ignore_case: bool = False,
+            limit: Optional[int] = 50) -> List[str]:
+        """Searches the retained lines. Safe to call
+        from a thread while lines are appended
+
+        Args:
+            pattern (Union[str, Pattern[str]]): Substring or
+                regular expression (compiled or a string
+                if `regex` is True)
+            regex (bool, optional): Treat a string pattern
+                as a regular expression
+            ignore_case (bool, optional): Case-insensitive search
+            limit (Optional[int], optional): Return only
+                the latest `limit` matches, None means all
+
+        Returns:
+            Matching lines, the oldest first
+
+        Raises:
+            re.error: If the regular expression is invalid
+        """
+
+        if isinstance(pattern, str) and (regex or ignore_case):
+            if not regex:
+                pattern = re.escape(pattern)
+            pattern = re.compile(
+                pattern,
+                re.IGNORECASE if ignore_case else 0
+            )
+
+        # copying the deque is atomic, iterating it
+        # fails if a line is appended meanwhile
+        lines = list(self.lines)
+
+        if isinstance(pattern, str):
+            substr = pattern
+            matches = (ln for ln in reversed(lines) if substr in ln)
+        else:
+            search = pattern.search
+            matches = (ln for ln in reversed(lines) if search(ln))
+
+        found = list(islice(matches, limit))
+        found.reverse()
+        return found
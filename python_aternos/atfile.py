@@ -1,16 +1,388 @@
 """File info object used by `python_aternos.atfm`"""
 
+import os
+import re
 import enum
+import time
+import hashlib
+import logging
 
-from typing import Union
+from typing import Union, Optional
+from typing import Dict, Tuple
+from typing import Callable, BinaryIO
 from typing import TYPE_CHECKING
 
+import requests
 import lxml.html
 
 from .aterrors import FileError
 
 if TYPE_CHECKING:
     from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
+
+# Size of the chunks written to disk
+CHUNK_SIZE = 1024 * 1024
+# Minimal delay between progress callbacks (seconds)
+PROGRESS_INTERVAL = 0.5
+# How many times an interrupted download is resumed
+RETRIES = 5
+# Delay before resuming a download, doubled
+# after each failed attempt (seconds)
+RETRY_DELAY = 1.0
+RETRY_DELAY_MAX = 30.0
+
+# (downloaded bytes, total bytes or None, bytes per second)
+ProgressT = Callable[[int, Optional[int], float], None]
+DestT = Union[str, 'os.PathLike[str]', BinaryIO]
+# extra request headers -> streamed response
+SendT = Callable[[Dict[str, str]], 'requests.Response']
+
+FAILED = b'{"success":false}'
+
+
+def expected_size(resp: 'requests.Response') -> Optional[int]:
+    """Response body size from the headers
+
+    Args:
+        resp (requests.Response): Streamed response
+
+    Returns:
+        Size in bytes or None if it is unknown
+        or the body is compressed
+    """
+
+    encoding = resp.headers.get('content-encoding', 'identity')
+    length = resp.headers.get('content-length')
+    if length is None or encoding != 'identity':
+        return None
+
+    try:
+        return int(length)
+    except ValueError:
+        return None
+
+
+def save_response(
+        resp: 'requests.Response',
+        dest: DestT,
+        progress: Optional[ProgressT] = None,
+        chunk_size: int = CHUNK_SIZE) -> int:
+    """Writes a streamed response body
+    to a file chunk by chunk
+
+    Args:
+        resp (requests.Response): Response of a request
+            sent with `stream=True`
+        dest (DestT): Path or a binary file object.
+            A path is written to `<path>.part` first
+            and renamed when the download is complete
+        progress (Optional[ProgressT], optional): Called with
+            downloaded bytes, total bytes and speed
+            at most once per `PROGRESS_INTERVAL` and at the end
+        chunk_size (int, optional): Chunk size in bytes
+
+    Raises:
+        FileError: If Aternos refused the download
+            or the size doesn't match Content-Length
+
+    Returns:
+        Written bytes count
+    """
+
+    if isinstance(dest, (str, os.PathLike)):
+        part = f'{os.fspath(dest)}.part'
+        try:
+            with open(part, 'wb') as file:
+                written = save_response(resp, file, progress, chunk_size)
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        os.replace(part, dest)
+        return written
+
+    return write_chunks(
+        resp, dest,
+        expected_size(resp),
+        progress, chunk_size
+    )
+
+
+def write_chunks(
+        resp: 'requests.Response',
+        file: BinaryIO,
+        total: Optional[int],
+        progress: Optional[ProgressT] = None,
+        chunk_size: int = CHUNK_SIZE,
+        offset: int = 0,
+        hasher: Optional['hashlib._Hash'] = None) -> int:
+    """Writes a streamed response body
+    to an opened file and closes the response
+
+    Args:
+        resp (requests.Response): Streamed response
+        file (BinaryIO): Binary file object
+        total (Optional[int]): Expected size of the whole file
+        progress (Optional[ProgressT], optional): Progress callback
+        chunk_size (int, optional): Chunk size in bytes
+        offset (int, optional): Bytes downloaded before,
+            when the response continues a previous download
+        hasher (Optional[hashlib._Hash], optional): Hash object
+            updated with each chunk
+
+    Raises:
+        FileError: If Aternos refused the download
+            or the file size doesn't match `total`
+
+    Returns:
+        Bytes count written by this call
+    """
+
+    written = 0
+    started = time.monotonic()
+    reported = started
+
+    try:
+        for chunk in resp.iter_content(chunk_size):
+
+            if not offset and not written and chunk.startswith(FAILED):
+                raise FileError('Unable to download the file')
+
+            file.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            written += len(chunk)
+
+            now = time.monotonic()
+            if progress and now - reported >= PROGRESS_INTERVAL:
+                progress(offset + written, total, written / (now - started))
+                reported = now
+    finally:
+        resp.close()
+
+    if progress:
+        elapsed = time.monotonic() - started
+        progress(offset + written, total, written / elapsed if elapsed else 0.0)
+
+    if total is not None and offset + written != total:
+        raise FileError(
+            f'Downloaded {offset + written} bytes of {total}, '
+            'the connection was probably interrupted'
+        )
+
+    return written
+
+
+def range_start(resp: 'requests.Response') -> Tuple[Optional[int], Optional[int]]:
+    """Parses Content-Range of a partial response
+
+    Args:
+        resp (requests.Response): Response to a range request
+
+    Returns:
+        First byte position and the full size,
+        (None, None) if the server sent the whole file
+    """
+
+    if resp.status_code != 206:
+        return None, None
+
+    # bytes 1000-9999/10000
+    crange = resp.headers.get('content-range', '')
+    match = re.fullmatch(r'bytes (\d+)-\d+/(\d+|\*)', crange.strip())
+    if match is None:
+        return None, None
+
+    size = match.group(2)
+    return int(match.group(1)), (None if size == '*' else int(size))
+
+
+def hash_file(
+        path: str,
+        hasher: Optional['hashlib._Hash'] = None,
+        chunk_size: int = CHUNK_SIZE) -> 'hashlib._Hash':
+    """Feeds the file content to a hash object
+
+    Args:
+        path (str): Path to file
+        hasher (Optional[hashlib._Hash], optional): Hash object,
+            a new SHA-256 one if not specified
+        chunk_size (int, optional): Chunk size in bytes
+
+    Returns:
+        The hash object
+    """
+
+    if hasher is None:
+        hasher = hashlib.sha256()
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+
+    return hasher
+
+
+def download(
+        send: SendT,
+        dest: Union[str, 'os.PathLike[str]'],
+        progress: Optional[ProgressT] = None,
+        chunk_size: int = CHUNK_SIZE,
+        retries: int = RETRIES,
+        manifest: Optional[str] = None) -> int:
+    """Downloads a file to disk resuming
+    interrupted transfers. The data is written
+    to `<dest>.part`, which is kept on errors,
+    so the next call continues it too.
+    If the server ignores the Range header,
+    the download starts over. Attempts are
+    spaced by `RETRY_DELAY`, doubled each time
+
+    Args:
+        send (SendT): Function sending a streamed request
+            with the given extra headers
+        dest (Union[str, os.PathLike[str]]): Path to file
+        progress (Optional[ProgressT], optional): Progress callback
+        chunk_size (int, optional): Chunk size in bytes
+        retries (int, optional): How many times
+            an interrupted download is resumed
+        manifest (Optional[str], optional): Path to a `sha256sum`-style
+            manifest, the SHA-256 of the finished file is recorded there
+
+    Raises:
+        FileError: If Aternos refused the download
+            or it is still incomplete after all retries
+
+    Returns:
+        File size in bytes
+    """
+
+    dest = os.fspath(dest)
+    part = f'{dest}.part'
+
+    attempt = 0
+    while True:
+
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        try:
+            resp = send(headers)
+            start, total = range_start(resp)
+
+            if offset and start != offset:
+                # Range is not supported, so the whole file is sent
+                logging.info('Unable to resume %s, downloading again', dest)
+                offset = 0
+                total = expected_size(resp)
+            elif not offset:
+                total = expected_size(resp)
+
+            hasher = hashlib.sha256()
+            if offset:
+                hash_file(part, hasher, chunk_size)
+
+            with open(part, 'ab' if offset else 'wb') as file:
+                write_chunks(
+                    resp, file, total,
+                    progress, chunk_size,
+                    offset, hasher
+                )
+            break
+
+        except (requests.RequestException, FileError) as err:
+
+            # Aternos refused the download, nothing is written
+            refused = isinstance(err, FileError) and not offset \
+                and os.path.exists(part) and not os.path.getsize(part)
+            if refused or attempt >= retries:
+                raise
+
+            # 416 Range Not Satisfiable: the part is broken
+            # or already complete, it can't be trusted anyway
+            resp_err = getattr(err, 'response', None)
+            if resp_err is not None and resp_err.status_code == 416:
+                os.remove(part)
+
+            attempt += 1
+            delay = min(RETRY_DELAY * 2 ** (attempt - 1), RETRY_DELAY_MAX)
+            logging.warning(
+                'Download of %s interrupted: %s, resuming in %.1fs (%d/%d)',
+                dest, err, delay, attempt, retries
+            )
+            time.sleep(delay)
+
+    os.replace(part, dest)
+    if manifest is not None:
+        add_to_manifest(manifest, dest, hasher.hexdigest())
+
+    return os.path.getsize(dest)
+
+
+def add_to_manifest(manifest: str, path: str, digest: str) -> None:
+    """Records a checksum in a `sha256sum`-style manifest
+    (`<hex digest>  <file name>` lines), replacing
+    an old entry of the same file. Names are relative
+    to the manifest directory, so it can be checked
+    with `sha256sum -c`
+
+    Args:
+        manifest (str): Path to manifest
+        path (str): Path to file
+        digest (str): SHA-256 hex digest
+    """
+
+    name = os.path.relpath(path, os.path.dirname(os.path.abspath(manifest)))
+
+    lines = []
+    if os.path.exists(manifest):
+        with open(manifest, 'rt', encoding='utf-8') as file:
+            lines = [
+                line for line in file.read().splitlines()
+                if line and line.split('  ', 1)[-1] != name
+            ]
+
+    lines.append(f'{digest}  {name}')
+    with open(manifest, 'wt', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+def read_manifest(manifest: str) -> Dict[str, str]:
+    """Reads a `sha256sum`-style manifest
+
+    Args:
+        manifest (str): Path to manifest
+
+    Returns:
+        SHA-256 hex digests by file names
+    """
+
+    digests = {}
+    with open(manifest, 'rt', encoding='utf-8') as file:
+        for line in file:
+            digest, _, name = line.rstrip('\n').partition('  ')
+            if name:
+                digests[name] = digest
+    return digests
+
+
+def verify_file(manifest: str, path: str) -> bool:
+    """Checks a file against its manifest entry
+
+    Args:
+        manifest (str): Path to manifest
+        path (str): Path to file
+
+    Returns:
+        True if the file has the recorded checksum
+    """
+
+    name = os.path.relpath(path, os.path.dirname(os.path.abspath(manifest)))
+    digest = read_manifest(manifest).get(name)
+    if digest is None:
+        return False
+    return hash_file(path).hexdigest() == digest
 
 
 class FileType(enum.IntEnum):
@@ -96,6 +468,9 @@ class AternosFile:
             }
         )
 
+        # the listing of this directory is outdated now
+        self.atserv.files().invalidate(self._path, recursive=False)
+
         if req.content == b'{"success":false}':
             raise FileError('Unable to create a file')
 
@@ -119,6 +494,12 @@ class AternosFile:
             sendtoken=True
         )
 
+        fm = self.atserv.files()
+        fm.invalidate(self._dirname, recursive=False)
+        fm.forget_content(self._path)
+        if self.is_dir:
+            fm.invalidate(self._path)
+
         if req.content == b'{"success":false}':
             raise FileError('Unable to delete the file')
 
@@ -152,8 +533,58 @@ class AternosFile:
                 'Try to get text'
             )
 
+        self.atserv.files().remember_content(self._path, file.content)
         return file.content
 
+    def save(
+            self,
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the file to disk
+        without keeping it in memory,
+        see `atfm.FileManager.save_download`
+
+        Args:
+            dest (DestT): Path or a binary file object
+            progress (Optional[ProgressT], optional): Progress callback
+            chunk_size (int, optional): Chunk size in bytes
+            retries (int, optional): How many times
+                an interrupted download is resumed
+            manifest (Optional[str], optional): SHA-256 manifest path
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+            FileError: If downloading this file is disallowed by Aternos
+                or the download is incomplete
+
+        Returns:
+            File size in bytes
+        """
+
+        self.check_downloadable()
+        return self.atserv.files().save_download(
+            'https://aternos.org/ajax/files/download',
+            {'file': self._path},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    def check_downloadable(self) -> None:
+        """Warns if Aternos doesn't allow downloading the file
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+        """
+
+        if not self._downloadable:
+            raise RuntimeWarning(
+                'The file seems to be undownloadable. '
+                'Always check it before calling save()'
+            )
+
     def set_content(self, value: bytes) -> None:
         """Modifies file content
 
@@ -172,9 +603,16 @@ class AternosFile:
             }, sendtoken=True
         )
 
+        # the file size in the listing is outdated now
+        fm = self.atserv.files()
+        fm.invalidate(self._dirname, recursive=False)
+
         if req.content == b'{"success":false}':
+            fm.forget_content(self._path)
             raise FileError('Unable to save the file')
 
+        fm.remember_content(self._path, value)
+
     def get_text(self) -> str:
         """Requests editing the file as a text
 
@@ -186,6 +624,21 @@ class AternosFile:
             File text content
         """
 
+        self.check_text()
+
+        filepath = self._path.lstrip("/")
+        editor = self.atserv.atserver_request(
+            f'https://aternos.org/files/{filepath}', 'GET'
+        )
+        return self.parse_text(editor.content)
+
+    def check_text(self) -> None:
+        """Checks if the file can be opened in the editor
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+        """
+
         if not self._editable:
             raise RuntimeWarning(
                 'The file seems to be uneditable. '
@@ -198,11 +651,20 @@ class AternosFile:
                 'a directory as a ZIP file!'
             )
 
-        filepath = self._path.lstrip("/")
-        editor = self.atserv.atserver_request(
-            f'https://aternos.org/files/{filepath}', 'GET'
-        )
-        edittree = lxml.html.fromstring(editor.content)
+    def parse_text(self, content: bytes) -> str:
+        """Parses the file text from the editor page
+
+        Args:
+            content (bytes): HTML page content
+
+        Raises:
+            FileError: If unable to parse text from response
+
+        Returns:
+            File text content
+        """
+
+        edittree = lxml.html.fromstring(content)
         editblock = edittree.xpath('//div[@id="editor"]')
 
         if len(editblock) < 1:
@@ -332,3 +794,194 @@ class AternosFile:
         """
 
         return self._size
+
+
+class AsyncAternosFile(AternosFile):
+
+    """Asyncio version of AternosFile"""
+
+    atserv: 'AsyncAternosServer'
+
+    async def create(  # type: ignore[override]
+            self,
+            name: str,
+            ftype: FileType = FileType.file) -> None:
+        """Creates a file or a directory inside this one
+
+        Args:
+            name (str): Filename
+            ftype (FileType, optional): File type
+
+        Raises:
+            RuntimeWarning: Messages about probabilty of FileError
+                (if `self` file object is not a directory)
+            FileError: If Aternos denied file creation
+        """
+
+        if self.is_file:
+            raise RuntimeWarning(
+                'Creating files only available '
+                'inside directories'
+            )
+
+        name = name.strip().replace('/', '_')
+        req = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/files/create',
+            'POST', data={
+                'file': f'{self._path}/{name}',
+                'type': 'file'
+                if ftype == FileType.file
+                else 'directory'
+            }
+        )
+
+        # the listing of this directory is outdated now
+        self.atserv.files().invalidate(self._path, recursive=False)
+
+        if req.content == b'{"success":false}':
+            raise FileError('Unable to create a file')
+
+    async def delete(self) -> None:  # type: ignore[override]
+        """Deletes the file
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+            FileError: If deleting this file is disallowed by Aternos
+        """
+
+        if not self._deleteable:
+            raise RuntimeWarning(
+                'The file seems to be protected (undeleteable). '
+                'Always check it before calling delete()'
+            )
+
+        req = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/delete',
+            'POST', data={'file': self._path},
+            sendtoken=True
+        )
+
+        fm = self.atserv.files()
+        fm.invalidate(self._dirname, recursive=False)
+        fm.forget_content(self._path)
+        if self.is_dir:
+            fm.invalidate(self._path)
+
+        if req.content == b'{"success":false}':
+            raise FileError('Unable to delete the file')
+
+    async def get_content(self) -> bytes:  # type: ignore[override]
+        """Requests file content in bytes (downloads it)
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+            FileError: If downloading this file is disallowed by Aternos
+
+        Returns:
+            File content
+        """
+
+        if not self._downloadable:
+            raise RuntimeWarning(
+                'The file seems to be undownloadable. '
+                'Always check it before calling get_content()'
+            )
+
+        file = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/files/download',
+            'GET', params={
+                'file': self._path
+            }
+        )
+
+        if file.content == b'{"success":false}':
+            raise FileError(
+                'Unable to download the file. '
+                'Try to get text'
+            )
+
+        self.atserv.files().remember_content(self._path, file.content)
+        return file.content
+
+    async def save(  # type: ignore[override]
+            self,
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the file to disk
+        without keeping it in memory.
+        Arguments are the same as in
+        `AternosFile.save`
+
+        Returns:
+            File size in bytes
+        """
+
+        self.check_downloadable()
+        return await self.atserv.files().save_download(
+            'https://aternos.org/ajax/files/download',
+            {'file': self._path},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    async def set_content(  # type: ignore[override]
+            self, value: bytes) -> None:
+        """Modifies file content
+
+        Args:
+            value (bytes): New content
+
+        Raises:
+            FileError: If Aternos denied file saving
+        """
+
+        req = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/save',
+            'POST', data={
+                'file': self._path,
+                'content': value
+            }, sendtoken=True
+        )
+
+        # the file size in the listing is outdated now
+        fm = self.atserv.files()
+        fm.invalidate(self._dirname, recursive=False)
+
+        if req.content == b'{"success":false}':
+            fm.forget_content(self._path)
+            raise FileError('Unable to save the file')
+
+        fm.remember_content(self._path, value)
+
+    async def get_text(self) -> str:  # type: ignore[override]
+        """Requests editing the file as a text
+
+        Raises:
+            RuntimeWarning: Message about probability of FileError
+            FileError: If unable to parse text from response
+
+        Returns:
+            File text content
+        """
+
+        self.check_text()
+
+        filepath = self._path.lstrip("/")
+        editor = await self.atserv.atserver_request(
+            f'https://aternos.org/files/{filepath}', 'GET'
+        )
+        return self.parse_text(editor.content)
+
+    async def set_text(self, value: str) -> None:  # type: ignore[override]
+        """Modifies the file content,
+        but unlike `set_content` takes
+        a string as an argument
+
+        Args:
+            value (str): New content
+        """
+
+        await self.set_content(value.encode('utf-8'))
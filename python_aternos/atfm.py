@@ -1,13 +1,42 @@
 """Exploring files in your server directory"""
 
-from typing import Union, Optional, Any, List
+import os
+import time
+import asyncio
+import fnmatch
+import hashlib
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Optional, Any, List, Type, Dict
+from typing import Tuple, Iterator, AsyncIterator, Mapping
 from typing import TYPE_CHECKING
 
+import requests
 import lxml.html
 
 from .atfile import AternosFile, FileType
+from .atfile import AsyncAternosFile
+from .atfile import save_response, download
+from .atfile import DestT, ProgressT
+from .atfile import CHUNK_SIZE, RETRIES
 if TYPE_CHECKING:
     from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
+
+# How long directory listings are reused
+# by lookups and walk() (seconds)
+DIR_TTL = 30.0
+
+# (directory, subdirectories, files)
+WalkT = Tuple[str, List[AternosFile], List[AternosFile]]
+
+# New file content for write_files()
+ContentT = Union[bytes, str]
+
+# Threads writing async downloads to disk. Their requests are sent
+# by the event loop, which needs the default executor for that,
+# so downloads must not take its threads
+download_pool = ThreadPoolExecutor(thread_name_prefix='aternos-download')
 
 
 class FileManager:
@@ -15,6 +44,8 @@ class FileManager:
     """Aternos file manager class
     for viewing files structure"""
 
+    file_class: Type[AternosFile] = AternosFile
+
     def __init__(self, atserv: 'AternosServer') -> None:
         """Aternos file manager class
         for viewing files structure
@@ -26,24 +57,242 @@ class FileManager:
 
         self.atserv = atserv
 
-    def list_dir(self, path: str = '') -> List[AternosFile]:
+        # directory -> (time of request, its files)
+        self.listings: Dict[str, Tuple[float, List[AternosFile]]] = {}
+        # path -> file, built from the listings
+        self.paths: Dict[str, AternosFile] = {}
+        # path -> SHA-256 of the content last read or written
+        self.digests: Dict[str, str] = {}
+
+    def list_dir(
+            self, path: str = '',
+            max_age: float = 0.0) -> List[AternosFile]:
         """Requests a list of files
         in the specified directory
 
         Args:
             path (str, optional):
                 Directory (an empty string means root)
+            max_age (float, optional): Maximum age of
+                the cached listing in seconds, 0 forces a request
 
         Returns:
             List of atfile.AternosFile objects
         """
 
-        path = path.lstrip('/')
+        path = path.strip('/')
+
+        cached = self.cached_dir(path, max_age)
+        if cached is not None:
+            return cached
 
         filesreq = self.atserv.atserver_request(
             f'https://aternos.org/files/{path}', 'GET'
         )
-        filestree = lxml.html.fromstring(filesreq.content)
+        files = self.parse_dir(path, filesreq.content)
+        self.store_dir(path, files)
+        return files
+
+    def cached_dir(
+            self, path: str,
+            max_age: float) -> Optional[List[AternosFile]]:
+        """Returns the cached directory listing
+        if it is fresh enough
+
+        Args:
+            path (str): Directory without leading slash
+            max_age (float): Maximum age in seconds
+
+        Returns:
+            List of files or None
+        """
+
+        cached = self.listings.get(path)
+        if cached is None or not max_age:
+            return None
+
+        if time.monotonic() - cached[0] > max_age:
+            return None
+
+        return list(cached[1])
+
+    def store_dir(self, path: str, files: List[AternosFile]) -> None:
+        """Caches a directory listing
+        and updates the paths index
+
+        Args:
+            path (str): Directory without leading slash
+            files (List[AternosFile]): Its files
+        """
+
+        self.forget_dir(path)
+        self.listings[path] = (time.monotonic(), files)
+        for f in files:
+            self.paths[f.path] = f
+
+    def forget_dir(self, path: str) -> None:
+        """Removes a directory listing from the cache
+
+        Args:
+            path (str): Directory without leading slash
+        """
+
+        cached = self.listings.pop(path, None)
+        if cached is None:
+            return
+
+        for f in cached[1]:
+            self.paths.pop(f.path, None)
+
+    def invalidate(
+            self, path: Optional[str] = None,
+            recursive: bool = True) -> None:
+        """Marks cached listings as outdated.
+        Called when a file is created, deleted or changed
+
+        Args:
+            path (Optional[str], optional): Directory,
+                None clears the whole cache
+            recursive (bool, optional): Also invalidate
+                its subdirectories
+        """
+
+        if path is None:
+            self.listings.clear()
+            self.paths.clear()
+            return
+
+        path = path.strip('/')
+        prefix = f'{path}/' if path else ''
+
+        for cached in list(self.listings):
+            inside = recursive and cached.startswith(prefix)
+            if cached == path or inside:
+                self.forget_dir(cached)
+
+    def walk(
+            self, path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> Iterator[WalkT]:
+        """Walks the directory tree like `os.walk`.
+        Directories of the same depth are requested
+        concurrently using a thread pool,
+        cached listings are reused
+
+        Args:
+            path (str, optional): Top directory
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (float, optional): Maximum age
+                of cached listings in seconds
+
+        Yields:
+            Directory path, its subdirectories and files
+        """
+
+        level = [path.strip('/')]
+
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            while level:
+
+                listings = pool.map(
+                    lambda d: self.list_dir(d, max_age),
+                    level
+                )
+
+                nextlevel = []
+                for dirpath, files in zip(level, listings):
+                    dirs = [f for f in files if f.is_dir]
+                    yield dirpath, dirs, [f for f in files if f.is_file]
+                    nextlevel.extend(d.path.strip('/') for d in dirs)
+
+                level = nextlevel
+
+    def tree(
+            self, path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> Dict[str, AternosFile]:
+        """Lists all files and directories
+        in the tree, see `walk`
+
+        Args:
+            path (str, optional): Top directory
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (float, optional): Maximum age
+                of cached listings in seconds
+
+        Returns:
+            atfile.AternosFile objects by their paths
+        """
+
+        index = {}
+        for _, dirs, files in self.walk(path, workers, max_age):
+            for f in dirs + files:
+                index[f.path] = f
+        return index
+
+    def find(
+            self, pattern: str,
+            path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> List[AternosFile]:
+        """Searches the tree by a glob pattern
+        matched against full paths (e.g. `*.jar`,
+        `/plugins/*/config.yml`)
+
+        Args:
+            pattern (str): Glob pattern
+            path (str, optional): Top directory
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (float, optional): Maximum age
+                of cached listings in seconds
+
+        Returns:
+            List of matching files
+        """
+
+        index = self.tree(path, workers, max_age)
+        return [
+            index[p] for p in
+            fnmatch.filter(index, pattern)
+        ]
+
+    def find_name(
+            self, name: str,
+            path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> List[AternosFile]:
+        """Searches the tree by a file name
+
+        Args:
+            name (str): File name with extension
+            path (str, optional): Top directory
+            workers (int, optional): Maximum number
+                of concurrent requests
+            max_age (float, optional): Maximum age
+                of cached listings in seconds
+
+        Returns:
+            List of files with this name
+        """
+
+        index = self.tree(path, workers, max_age)
+        return [f for f in index.values() if f.name == name]
+
+    def parse_dir(self, path: str, content: bytes) -> List[AternosFile]:
+        """Parses a list of files from the file manager page
+
+        Args:
+            path (str): Directory without leading slash
+            content (bytes): HTML page content
+
+        Returns:
+            List of atfile.AternosFile objects
+        """
+
+        filestree = lxml.html.fromstring(content)
 
         fileslist = filestree.xpath(
             '//div[@class="file" or @class="file clickable"]'
@@ -63,7 +312,7 @@ class FileManager:
             is_config = ('server.properties' in path) or ('level.dat' in path)
 
             files.append(
-                AternosFile(
+                self.file_class(
                     atserv=self.atserv,
                     path=f.xpath('@data-path')[0],
 
@@ -128,12 +377,16 @@ class FileManager:
         }
         return measure_match.get(measure, -1) * num
 
-    def get_file(self, path: str) -> Optional[AternosFile]:
+    def get_file(
+            self, path: str,
+            max_age: float = DIR_TTL) -> Optional[AternosFile]:
         """Returns :class:`python_aternos.atfile.AternosFile`
         instance by its path
 
         Args:
             path (str): Path to the file including its filename
+            max_age (float, optional): Maximum age of
+                the cached parent directory listing
 
         Returns:
             atfile.AternosFile object
@@ -141,16 +394,121 @@ class FileManager:
             otherwise None
         """
 
-        filedir = path[:path.rfind('/')]
-        filename = path[path.rfind('/'):]
+        path = '/' + path.strip('/')
+        self.list_dir(path[:path.rfind('/')], max_age)
+        return self.paths.get(path)
+
+    def remember_content(self, path: str, content: bytes) -> None:
+        """Stores the digest of the file content
+        which is known to be on the server,
+        so writing the same content again is skipped
+
+        Args:
+            path (str): Path to the file including its filename
+            content (bytes): File content
+        """
+
+        path = '/' + path.strip('/')
+        self.digests[path] = hashlib.sha256(content).hexdigest()
 
-        files = self.list_dir(filedir)
+    def forget_content(self, path: str) -> None:
+        """Removes the digests of a file
+        or of all files in a directory
 
-        return {
-            'file': f
-            for f in files
-            if f.name == filename
-        }.get('file', None)
+        Args:
+            path (str): Path to the file or the directory
+        """
+
+        path = '/' + path.strip('/')
+        prefix = path.rstrip('/') + '/'
+        for known in list(self.digests):
+            if known == path or known.startswith(prefix):
+                self.digests.pop(known, None)
+
+    def prepare_write(
+            self, path: str,
+            content: ContentT,
+            force: bool) -> Tuple[str, bytes, bool]:
+        """Normalizes arguments of `write_file`
+
+        Args:
+            path (str): Path to the file including its filename
+            content (ContentT): New content, str is encoded to UTF-8
+            force (bool): Write even if the content is unchanged
+
+        Returns:
+            Path with a leading slash, content in bytes
+            and whether the file must be written
+        """
+
+        path = '/' + path.strip('/')
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        digest = hashlib.sha256(content).hexdigest()
+        return path, content, force or self.digests.get(path) != digest
+
+    def write_file(
+            self, path: str,
+            content: ContentT,
+            force: bool = False) -> Dict[str, Any]:
+        """Writes a file unless its content
+        is known to be the same already.
+        Errors are returned instead of raised
+
+        Args:
+            path (str): Path to the file including its filename
+            content (ContentT): New content, str is encoded to UTF-8
+            force (bool, optional): Write even if
+                the content is unchanged
+
+        Returns:
+            Result with `status` (`written`, `unchanged`
+            or `failed`), `seconds` spent and `error` if failed
+        """
+
+        start = time.perf_counter()
+        path, content, write = self.prepare_write(path, content, force)
+        if not write:
+            return {'status': 'unchanged', 'seconds': 0.0}
+
+        file = self.file_class(self.atserv, path, False, False, True)
+        try:
+            file.set_content(content)
+        except Exception as err:  # pylint: disable=broad-except
+            return {
+                'status': 'failed',
+                'seconds': time.perf_counter() - start,
+                'error': str(err),
+            }
+
+        return {'status': 'written', 'seconds': time.perf_counter() - start}
+
+    def write_files(
+            self, files: Mapping[str, ContentT],
+            workers: int = 8,
+            force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Writes many files concurrently using a thread pool.
+        Files whose content is the same as the last one
+        read or written through this file manager are skipped
+
+        Args:
+            files (Mapping[str, ContentT]): New content by path
+            workers (int, optional): Maximum number
+                of concurrent requests
+            force (bool, optional): Write even if
+                the content is unchanged
+
+        Returns:
+            Results by path, see `write_file`
+        """
+
+        with ThreadPoolExecutor(max(1, workers)) as pool:
+            results = pool.map(
+                lambda item: self.write_file(*item, force),
+                files.items()
+            )
+            return dict(zip(files, results))
 
     def dl_file(self, path: str) -> bytes:
         """Returns the file content in bytes (downloads it)
@@ -163,7 +521,7 @@ class FileManager:
         """
 
         file = self.atserv.atserver_request(  # type: ignore
-            'https://aternos.org/ajax/files/download'
+            'https://aternos.org/ajax/files/download',
             'GET', params={
                 'file': path.replace('/', '%2F')
             }
@@ -183,10 +541,452 @@ class FileManager:
         """
 
         resp = self.atserv.atserver_request(  # type: ignore
-            'https://aternos.org/ajax/worlds/download'
+            'https://aternos.org/ajax/worlds/download',
             'GET', params={
                 'world': world.replace('/', '%2F')
             }
         )
 
         return resp.content
+
+    def save_file(
+            self,
+            path: str,
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the file to disk
+        without keeping it in memory
+
+        Args:
+            path (str): Path to file including its filename
+            dest (DestT): Path or a binary file object
+            progress (Optional[ProgressT], optional): Progress callback
+            chunk_size (int, optional): Chunk size in bytes
+            retries (int, optional): How many times
+                an interrupted download is resumed
+            manifest (Optional[str], optional): SHA-256 manifest path
+
+        Raises:
+            FileError: If the download is refused or incomplete
+
+        Returns:
+            File size in bytes
+        """
+
+        return self.save_download(
+            'https://aternos.org/ajax/files/download',
+            {'file': path.replace('/', '%2F')},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    def save_world(
+            self,
+            dest: DestT,
+            world: str = 'world',
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the world zip file to disk
+        without keeping it in memory
+
+        Args:
+            dest (DestT): Path or a binary file object
+            world (str, optional): Name of world
+            progress (Optional[ProgressT], optional): Progress callback
+            chunk_size (int, optional): Chunk size in bytes
+            retries (int, optional): How many times
+                an interrupted download is resumed
+            manifest (Optional[str], optional): SHA-256 manifest path
+
+        Raises:
+            FileError: If the download is refused or incomplete
+
+        Returns:
+            File size in bytes
+        """
+
+        return self.save_download(
+            'https://aternos.org/ajax/worlds/download',
+            {'world': world.replace('/', '%2F')},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    def save_download(
+            self,
+            url: str,
+            params: Dict[str, str],
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Streams a download to disk. A path is downloaded
+        with `atfile.download`, so interrupted transfers are resumed
+        and the checksum is written to the manifest.
+        A file object is written once with `atfile.save_response`
+
+        Args:
+            url (str): Download URL
+            params (Dict[str, str]): URL parameters
+            dest (DestT): Path or a binary file object
+            progress (Optional[ProgressT], optional): Progress callback
+            chunk_size (int, optional): Chunk size in bytes
+            retries (int, optional): How many times
+                an interrupted download is resumed
+            manifest (Optional[str], optional): SHA-256 manifest path,
+                used only if `dest` is a path
+
+        Raises:
+            FileError: If the download is refused or incomplete
+
+        Returns:
+            File size in bytes
+        """
+
+        def send(headers: Dict[str, str]) -> requests.Response:
+            return self.atserv.atserver_request(  # type: ignore
+                url, 'GET',
+                params=dict(params),
+                headers=headers,
+                stream=True
+            )
+
+        if isinstance(dest, (str, os.PathLike)):
+            return download(
+                send, dest, progress,
+                chunk_size, retries, manifest
+            )
+
+        return save_response(send({}), dest, progress, chunk_size)
+
+
+class AsyncFileManager(FileManager):
+
+    """Asyncio version of FileManager"""
+
+    file_class = AsyncAternosFile
+    atserv: 'AsyncAternosServer'
+
+    async def list_dir(  # type: ignore[override]
+            self, path: str = '',
+            max_age: float = 0.0) -> List[AternosFile]:
+        """Requests a list of files
+        in the specified directory
+
+        Args:
+            path (str, optional):
+                Directory (an empty string means root)
+            max_age (float, optional): Maximum age of
+                the cached listing in seconds, 0 forces a request
+
+        Returns:
+            List of atfile.AsyncAternosFile objects
+        """
+
+        path = path.strip('/')
+
+        cached = self.cached_dir(path, max_age)
+        if cached is not None:
+            return cached
+
+        filesreq = await self.atserv.atserver_request(
+            f'https://aternos.org/files/{path}', 'GET'
+        )
+        files = self.parse_dir(path, filesreq.content)
+        self.store_dir(path, files)
+        return files
+
+    async def walk(  # type: ignore[override]
+            self, path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> AsyncIterator[WalkT]:
+        """Walks the directory tree like `os.walk`.
+        Directories of the same depth are requested concurrently,
+        see `FileManager.walk`
+
+        Yields:
+            Directory path, its subdirectories and files
+        """
+
+        limit = asyncio.Semaphore(max(1, workers))
+
+        async def limited(dirpath: str) -> List[AternosFile]:
+            async with limit:
+                return await self.list_dir(dirpath, max_age)
+
+        level = [path.strip('/')]
+        while level:
+
+            listings = await asyncio.gather(
+                *(limited(d) for d in level)
+            )
+
+            nextlevel = []
+            for dirpath, files in zip(level, listings):
+                dirs = [f for f in files if f.is_dir]
+                yield dirpath, dirs, [f for f in files if f.is_file]
+                nextlevel.extend(d.path.strip('/') for d in dirs)
+
+            level = nextlevel
+
+    async def tree(  # type: ignore[override]
+            self, path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> Dict[str, AternosFile]:
+        """Lists all files and directories
+        in the tree, see `FileManager.tree`
+
+        Returns:
+            atfile.AsyncAternosFile objects by their paths
+        """
+
+        index = {}
+        async for _, dirs, files in self.walk(path, workers, max_age):
+            for f in dirs + files:
+                index[f.path] = f
+        return index
+
+    async def find(  # type: ignore[override]
+            self, pattern: str,
+            path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> List[AternosFile]:
+        """Searches the tree by a glob pattern,
+        see `FileManager.find`
+
+        Returns:
+            List of matching files
+        """
+
+        index = await self.tree(path, workers, max_age)
+        return [
+            index[p] for p in
+            fnmatch.filter(index, pattern)
+        ]
+
+    async def find_name(  # type: ignore[override]
+            self, name: str,
+            path: str = '',
+            workers: int = 8,
+            max_age: float = DIR_TTL) -> List[AternosFile]:
+        """Searches the tree by a file name,
+        see `FileManager.find_name`
+
+        Returns:
+            List of files with this name
+        """
+
+        index = await self.tree(path, workers, max_age)
+        return [f for f in index.values() if f.name == name]
+
+    async def get_file(  # type: ignore[override]
+            self, path: str,
+            max_age: float = DIR_TTL) -> Optional[AternosFile]:
+        """Returns :class:`python_aternos.atfile.AsyncAternosFile`
+        instance by its path
+
+        Args:
+            path (str): Path to the file including its filename
+            max_age (float, optional): Maximum age of
+                the cached parent directory listing
+
+        Returns:
+            atfile.AsyncAternosFile object
+            if file has been found,
+            otherwise None
+        """
+
+        path = '/' + path.strip('/')
+        await self.list_dir(path[:path.rfind('/')], max_age)
+        return self.paths.get(path)
+
+    async def write_file(  # type: ignore[override]
+            self, path: str,
+            content: ContentT,
+            force: bool = False) -> Dict[str, Any]:
+        """Writes a file unless its content
+        is known to be the same already,
+        see `FileManager.write_file`
+
+        Returns:
+            Result with `status`, `seconds` and `error` if failed
+        """
+
+        start = time.perf_counter()
+        path, content, write = self.prepare_write(path, content, force)
+        if not write:
+            return {'status': 'unchanged', 'seconds': 0.0}
+
+        file = self.file_class(self.atserv, path, False, False, True)
+        try:
+            await file.set_content(content)  # type: ignore[misc]
+        except Exception as err:  # pylint: disable=broad-except
+            return {
+                'status': 'failed',
+                'seconds': time.perf_counter() - start,
+                'error': str(err),
+            }
+
+        return {'status': 'written', 'seconds': time.perf_counter() - start}
+
+    async def write_files(  # type: ignore[override]
+            self, files: Mapping[str, ContentT],
+            workers: int = 8,
+            force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Writes many files concurrently,
+        see `FileManager.write_files`
+
+        Returns:
+            Results by path
+        """
+
+        limit = asyncio.Semaphore(max(1, workers))
+
+        async def limited(path: str, content: ContentT) -> Dict[str, Any]:
+            async with limit:
+                return await self.write_file(path, content, force)
+
+        results = await asyncio.gather(
+            *(limited(p, c) for p, c in files.items())
+        )
+        return dict(zip(files, results))
+
+    async def dl_file(self, path: str) -> bytes:  # type: ignore[override]
+        """Returns the file content in bytes (downloads it)
+
+        Args:
+            path (str): Path to file including its filename
+
+        Returns:
+            File content
+        """
+
+        file = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/files/download',
+            'GET', params={
+                'file': path.replace('/', '%2F')
+            }
+        )
+
+        return file.content
+
+    async def dl_world(  # type: ignore[override]
+            self, world: str = 'world') -> bytes:
+        """Returns the world zip file content
+        by its name (downloads it)
+
+        Args:
+            world (str, optional): Name of world
+
+        Returns:
+            ZIP file content
+        """
+
+        resp = await self.atserv.atserver_request(
+            'https://aternos.org/ajax/worlds/download',
+            'GET', params={
+                'world': world.replace('/', '%2F')
+            }
+        )
+
+        return resp.content
+
+    async def save_file(  # type: ignore[override]
+            self,
+            path: str,
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the file to disk
+        without keeping it in memory.
+        Arguments are the same as in
+        `FileManager.save_file`
+
+        Returns:
+            File size in bytes
+        """
+
+        return await self.save_download(
+            'https://aternos.org/ajax/files/download',
+            {'file': path.replace('/', '%2F')},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    async def save_world(  # type: ignore[override]
+            self,
+            dest: DestT,
+            world: str = 'world',
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Downloads the world zip file to disk
+        without keeping it in memory.
+        Arguments are the same as in
+        `FileManager.save_world`
+
+        Returns:
+            File size in bytes
+        """
+
+        return await self.save_download(
+            'https://aternos.org/ajax/worlds/download',
+            {'world': world.replace('/', '%2F')},
+            dest, progress, chunk_size,
+            retries, manifest
+        )
+
+    async def save_download(  # type: ignore[override]
+            self,
+            url: str,
+            params: Dict[str, str],
+            dest: DestT,
+            progress: Optional[ProgressT] = None,
+            chunk_size: int = CHUNK_SIZE,
+            retries: int = RETRIES,
+            manifest: Optional[str] = None) -> int:
+        """Streams a download to disk, see `FileManager.save_download`.
+        Chunks are written in a `download_pool` thread,
+        so `progress` is called from it too
+
+        Returns:
+            File size in bytes
+        """
+
+        loop = asyncio.get_running_loop()
+
+        def send(headers: Dict[str, str]) -> requests.Response:
+            # called from the download thread,
+            # requests are still sent by the event loop
+            return asyncio.run_coroutine_threadsafe(
+                self.atserv.atserver_request(
+                    url, 'GET',
+                    params=dict(params),
+                    headers=headers,
+                    stream=True
+                ),
+                loop
+            ).result()
+
+        if isinstance(dest, (str, os.PathLike)):
+            return await loop.run_in_executor(
+                download_pool, download, send, dest,
+                progress, chunk_size, retries, manifest
+            )
+
+        resp = await self.atserv.atserver_request(
+            url, 'GET', params=dict(params), stream=True
+        )
+        return await loop.run_in_executor(
+            download_pool, save_response,
+            resp, dest, progress, chunk_size
+        )
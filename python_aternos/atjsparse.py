@@ -1,22 +1,23 @@
 """Parsing and executing JavaScript code"""
 
 import abc
+import re
 
 import json
 import base64
 
+import queue
 import logging
+import threading
 import subprocess
 
 from pathlib import Path
 from typing import Optional, Union
 from typing import Type, Any
-
-import regex
-import js2py
-import requests
+from typing import List, Dict, Tuple, Callable
 
 js: Optional['Interpreter'] = None
+js_lock = threading.Lock()
 
 
 class Interpreter(abc.ABC):
@@ -57,60 +58,207 @@ class Interpreter(abc.ABC):
             Variable value
         """
 
+    def exec_get(self, func: str, name: str) -> Any:
+        """Executes JavaScript code and returns
+        the variable value. Interpreters running
+        in another process do it in one request
+
+        Args:
+            func (str): JS function
+            name (str): Variable name
+
+        Returns:
+            Variable value
+        """
+
+        self.exec_js(func)
+        return self.get_var(name)
+
 
 class NodeInterpreter(Interpreter):
     """Node.JS interpreter wrapper,
-    starts a simple web server in background"""
+    talks to a Node process over stdin/stdout
+    using one JSON object per line"""
 
     def __init__(
             self,
             node: Union[str, Path] = 'node',
-            host: str = 'localhost',
-            port: int = 8001) -> None:
+            timeout: float = 5.0) -> None:
         """Node.JS interpreter wrapper,
-        starts a simple web server in background
+        talks to a Node process over stdin/stdout.
+        The process is started on the first request
+        and restarted automatically if it dies
 
         Args:
             node (Union[str, Path], optional): Path to `node` executable
-            host (str, optional): Hostname for the web server
-            port (int, optional): Port for the web server
+            timeout (float, optional): How long to wait
+                for a response in seconds
         """
 
         super().__init__()
 
         file_dir = Path(__file__).absolute().parent
-        server_js = file_dir / 'data' / 'server.js'
+        self.server_js = file_dir / 'data' / 'server.js'
+
+        self.node = node
+        self.timeout = timeout
+
+        self.proc: Optional[subprocess.Popen] = None
+        self.lines: 'queue.Queue[bytes]' = queue.Queue()
+        self.lock = threading.Lock()
+        self.reqid = 0
+        self.respawns = 0
 
-        self.url = f'http://{host}:{port}'
+    def start(self) -> None:
+        """Starts the Node process if it is not running"""
+
+        if self.proc is not None and self.proc.poll() is None:
+            return
+
+        if self.proc is not None:
+            logging.warning('NodeJS process has died, restarting')
+            self.respawns += 1
 
         # pylint: disable=consider-using-with
         self.proc = subprocess.Popen(
-            args=[
-                node, server_js,
-                f'{port}', host,
-            ],
+            args=[self.node, self.server_js],
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
         )
         # pylint: enable=consider-using-with
 
-        assert self.proc.stdout is not None
-        ok_msg = self.proc.stdout.readline()
+        # Reading in a thread allows timeouts on any platform
+        lines: 'queue.Queue[bytes]' = queue.Queue()
+        self.lines = lines
+        threading.Thread(
+            target=self.reader,
+            args=(self.proc, lines),
+            daemon=True,
+        ).start()
+
+        ok_msg = self.readline()
         logging.debug('Received from server.js: %s', ok_msg)
 
+    @staticmethod
+    def reader(
+            proc: subprocess.Popen,
+            lines: 'queue.Queue[bytes]') -> None:
+        """Puts lines from the process stdout into the queue"""
+
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(b'')
+
+    def readline(self) -> bytes:
+        """Waits for a line from the Node process
+
+        Raises:
+            RuntimeError: On timeout or if the process has exited
+
+        Returns:
+            Line without a newline character
+        """
+
+        try:
+            line = self.lines.get(timeout=self.timeout)
+        except queue.Empty as err:
+            raise RuntimeError('NodeJS response timeout') from err
+
+        if line == b'':
+            raise RuntimeError('NodeJS process has exited')
+        return line.rstrip(b'\n')
+
+    def request(
+            self,
+            code: str = '',
+            get: str = '') -> Any:
+        """Executes the code and/or reads the variable
+        in one round-trip, restarting the process once on failure
+
+        Args:
+            code (str, optional): JS code to execute
+            get (str, optional): Variable name to return
+
+        Raises:
+            RuntimeError: If the process is not responding
+                or the code has thrown an exception
+
+        Returns:
+            Variable value if `get` was passed
+        """
+
+        with self.lock:
+            try:
+                resp = self.send(code, get)
+            except (OSError, RuntimeError) as err:
+                logging.warning('NodeJS request failed: %s', err)
+                self.kill()
+                resp = self.send(code, get)
+
+        logging.debug('NodeJS response: %s', resp)
+        if not resp.get('ok'):
+            raise RuntimeError(f'NodeJS error: {resp.get("error")}')
+        return resp.get('value')
+
+    def send(self, code: str, get: str) -> Dict[str, Any]:
+        """Sends one request without retrying"""
+
+        self.start()
+        assert self.proc is not None and self.proc.stdin is not None
+
+        self.reqid += 1
+        msg = json.dumps({'id': self.reqid, 'code': code, 'get': get})
+        self.proc.stdin.write(msg.encode('utf-8') + b'\n')
+        self.proc.stdin.flush()
+
+        # skip responses to timed out requests
+        while True:
+            resp = json.loads(self.readline())
+            if resp.get('id') == self.reqid:
+                return resp
+
+    def ping(self) -> bool:
+        """Checks if the Node process is responding
+
+        Returns:
+            True if the process is alive
+        """
+
+        try:
+            self.request()
+            return True
+        except (OSError, RuntimeError):
+            return False
+
     def exec_js(self, func: str) -> None:
-        resp = requests.post(self.url, data=func)
-        resp.raise_for_status()
+        self.request(code=func)
 
     def get_var(self, name: str) -> Any:
-        resp = requests.post(self.url, data=name)
-        resp.raise_for_status()
-        logging.debug('NodeJS response: %s', resp.content)
-        return json.loads(resp.content)
+        return self.request(get=name)
+
+    def exec_get(self, func: str, name: str) -> Any:
+        return self.request(code=func, get=name)
+
+    def kill(self) -> None:
+        """Stops the Node process,
+        it will be started again on the next request"""
+
+        if self.proc is None:
+            return
+        try:
+            # stdout is read by the reader thread,
+            # so communicate() can not be used here
+            if self.proc.stdin is not None:
+                self.proc.stdin.close()
+            self.proc.kill()
+            self.proc.wait()
+        except OSError:
+            pass
 
     def __del__(self) -> None:
         try:
-            self.proc.terminate()
-            self.proc.communicate()
+            self.kill()
         except AttributeError:
             logging.warning(
                 'NodeJS process was not initialized'
@@ -121,15 +269,23 @@ class Js2PyInterpreter(Interpreter):
     """Js2Py interpreter,
     uses js2py library to execute code"""
 
-    # Thanks to http://regex.inginf.units.it
-    arrowexp = regex.compile(r'\w[^\}]*+')
-
     def __init__(self) -> None:
         """Js2Py interpreter,
         uses js2py library to execute code"""
 
         super().__init__()
 
+        # js2py and regex are slow to import,
+        # so they are loaded only when needed
+        # pylint: disable=import-outside-toplevel
+        import js2py
+        import regex
+        # pylint: enable=import-outside-toplevel
+
+        self.regex = regex
+        # Thanks to http://regex.inginf.units.it
+        self.arrowexp = regex.compile(r'\w[^\}]*+')
+
         ctx = js2py.EvalJs({'atob': atob})
         ctx.execute('window.document = { };')
         ctx.execute('window.Map = function(_i){ };')
@@ -158,7 +314,7 @@ class Js2PyInterpreter(Interpreter):
         """
 
         # Delete anything between /* and */
-        func = regex.sub(r'/\*.+?\*/', '', func)
+        func = self.regex.sub(r'/\*.+?\*/', '', func)
 
         # Search for arrow expressions
         match = self.arrowexp.search(func)
@@ -172,13 +328,546 @@ class Js2PyInterpreter(Interpreter):
         # It doesn't change,
         # so it was hardcoded
         # as a regexp
-        return regex.sub(
+        return self.regex.sub(
             r'(?:s|\(s\)) => s.split\([\'"]{2}\).reverse\(\).join\([\'"]{2}\)',
             'function(s){return s.split(\'\').reverse().join(\'\')}',
             conv
         )
 
 
+class FastInterpreter(Interpreter):
+    """Pure-Python interpreter for the small subset of JS
+    used to obfuscate the ajax token: string and array literals,
+    `+` concatenation, `atob`, `split`/`reverse`/`join`/`map`/`slice`,
+    arrow functions and assignments to `window`.
+    Falls back to another interpreter on unknown constructs"""
+
+    tokenexp = re.compile(
+        r'\s*(?:'
+        r'(?P<str>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`[^`$\\]*`)'
+        r'|(?P<num>\d+(?:\.\d+)?)'
+        r'|(?P<name>[A-Za-z_$][\w$]*)'
+        r'|(?P<op>=>|[()\[\]{}.,;+=-])'
+        r')',
+        re.S
+    )
+    escapes = {
+        'n': '\n', 't': '\t', 'r': '\r',
+        'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+    }
+
+    def __init__(
+            self,
+            fallback: Type[Interpreter] = Js2PyInterpreter,
+            *args, **kwargs) -> None:
+        """Pure-Python interpreter for the token obfuscation code
+
+        Args:
+            fallback (Type[Interpreter], optional): Interpreter
+                which will be created when the code can not
+                be executed by this class.
+                `*args` and `**kwargs` are passed to its `__init__`
+        """
+
+        super().__init__()
+
+        self.fallback = fallback
+        self.fallback_args = (args, kwargs)
+        self.fallback_js: Optional[Interpreter] = None
+
+        self.vars: Dict[str, Any] = {}
+        self.tokens: List[Tuple[str, Any]] = []
+        self.pos = 0
+
+        # the parser state and the fallback are shared,
+        # tokens may be parsed from several threads
+        self.lock = threading.RLock()
+
+    def exec_js(self, func: str) -> None:
+        with self.lock:
+            try:
+                self.run(func)
+                return
+            except (NotImplementedError, IndexError, KeyError,
+                    TypeError, ValueError) as err:
+                logging.info(
+                    'Unable to execute JS without an interpreter: %s', err
+                )
+
+            self.get_fallback().exec_js(func)
+
+    def exec_get(self, func: str, name: str) -> Any:
+        with self.lock:
+            try:
+                self.run(func)
+                return self.vars[name]
+            except (NotImplementedError, IndexError, KeyError,
+                    TypeError, ValueError) as err:
+                logging.info(
+                    'Unable to execute JS without an interpreter: %s', err
+                )
+
+            return self.get_fallback().exec_get(func, name)
+
+    def get_fallback(self) -> Interpreter:
+        """Creates the fallback interpreter on the first call
+
+        Returns:
+            Fallback interpreter instance
+        """
+
+        if self.fallback_js is None:
+            args, kwargs = self.fallback_args
+            self.fallback_js = self.fallback(*args, **kwargs)
+        return self.fallback_js
+
+    def get_var(self, name: str) -> Any:
+        with self.lock:
+            if name in self.vars:
+                return self.vars[name]
+            if self.fallback_js is not None:
+                return self.fallback_js.get_var(name)
+        raise KeyError(name)
+
+    def run(self, code: str) -> None:
+        """Executes the code without a fallback
+
+        Args:
+            code (str): JS code
+
+        Raises:
+            NotImplementedError: On unsupported constructs
+        """
+
+        # Delete anything between /* and */
+        code = re.sub(r'/\*.*?\*/', '', code, flags=re.S)
+
+        self.tokens = self.tokenize(code)
+        self.pos = 0
+
+        # Assignments are applied to a copy,
+        # so a failed run doesn't leave half of the variables
+        scope = {'window': dict(self.vars)}
+        while self.pos < len(self.tokens):
+            stmt = self.parse_stmt()
+            if stmt is not None:
+                self.evaluate(stmt, [scope])
+
+        self.vars = scope['window']
+
+    def tokenize(self, code: str) -> List[Tuple[str, Any]]:
+        """Splits JS code into tokens
+
+        Args:
+            code (str): JS code
+
+        Raises:
+            NotImplementedError: On unknown characters
+
+        Returns:
+            List of `(type, value)` tuples
+        """
+
+        tokens = []
+        pos = 0
+        code = code.rstrip()
+        while pos < len(code):
+            match = self.tokenexp.match(code, pos)
+            if match is None or match.end() == pos:
+                raise NotImplementedError(
+                    f'Unknown token at {pos}: {code[pos:pos + 10]!r}'
+                )
+            pos = match.end()
+            kind = match.lastgroup or ''
+            value: Any = match.group(kind)
+            if kind == 'str':
+                value = self.unquote(value)
+            elif kind == 'num':
+                value = float(value) if '.' in value else int(value)
+            tokens.append((kind, value))
+        return tokens
+
+    def unquote(self, literal: str) -> str:
+        """Converts a JS string literal to a Python string
+
+        Args:
+            literal (str): Quoted string with escapes
+
+        Returns:
+            String value
+        """
+
+        body = literal[1:-1]
+
+        def repl(match: 're.Match[str]') -> str:
+            char = match.group(1)
+            if char[0] in 'xu':
+                return chr(int(char[1:], 16))
+            return self.escapes.get(char, char)
+
+        return re.sub(
+            r'\\(x[0-9A-Fa-f]{2}|u[0-9A-Fa-f]{4}|.)',
+            repl, body, flags=re.S
+        )
+
+    #
+    # parser, returns nested tuples
+    #
+    def peek(self, offset: int = 0) -> Tuple[str, Any]:
+        """Returns the token without consuming it"""
+
+        if self.pos + offset < len(self.tokens):
+            return self.tokens[self.pos + offset]
+        return ('end', None)
+
+    def take(self, value: Optional[str] = None) -> Tuple[str, Any]:
+        """Consumes the token checking its value"""
+
+        token = self.peek()
+        if token[0] == 'end' or (value is not None and token[1] != value):
+            raise NotImplementedError(f'Expected {value}, got {token}')
+        self.pos += 1
+        return token
+
+    def skip(self, value: str) -> bool:
+        """Consumes the operator if it is the next token"""
+
+        if self.peek() == ('op', value):
+            self.pos += 1
+            return True
+        return False
+
+    def parse_stmt(self) -> Optional[Tuple[Any, ...]]:
+        """Parses a statement"""
+
+        if self.skip(';'):
+            return None
+        if self.peek() == ('name', 'return'):
+            self.take()
+            node = ('return', self.parse_expr())
+        else:
+            node = self.parse_expr()
+        self.skip(';')
+        return node
+
+    def parse_expr(self) -> Tuple[Any, ...]:
+        """Parses an assignment or an expression"""
+
+        node = self.parse_add()
+        if self.skip('='):
+            if node[0] not in ('name', 'member'):
+                raise NotImplementedError('Invalid assignment')
+            return ('assign', node, self.parse_expr())
+        return node
+
+    def parse_add(self) -> Tuple[Any, ...]:
+        """Parses `a + b + ...`"""
+
+        node = self.parse_postfix()
+        while self.skip('+'):
+            node = ('add', node, self.parse_postfix())
+        if self.peek() == ('op', '-'):
+            # only negative numbers are supported
+            raise NotImplementedError('Subtraction is not supported')
+        return node
+
+    def parse_postfix(self) -> Tuple[Any, ...]:
+        """Parses member access and calls"""
+
+        node = self.parse_primary()
+        while True:
+            if self.skip('.'):
+                name = self.take()
+                if name[0] != 'name':
+                    raise NotImplementedError(f'Invalid member {name}')
+                node = ('member', node, ('str', name[1]))
+            elif self.skip('['):
+                node = ('member', node, self.parse_expr())
+                self.take(']')
+            elif self.skip('('):
+                node = ('call', node, self.parse_list(')'))
+            else:
+                return node
+
+    def parse_list(self, end: str) -> List[Tuple[Any, ...]]:
+        """Parses comma-separated expressions until `end`"""
+
+        items = []
+        while not self.skip(end):
+            items.append(self.parse_expr())
+            if not self.skip(','):
+                self.take(end)
+                break
+        return items
+
+    def parse_primary(self) -> Tuple[Any, ...]:
+        """Parses literals, names, arrow functions and parentheses"""
+
+        kind, value = self.peek()
+
+        if kind in ('str', 'num'):
+            self.pos += 1
+            return (kind, value)
+
+        if value == '-' and self.peek(1)[0] == 'num':
+            self.pos += 2
+            return ('num', -self.peek(-1)[1])
+
+        if kind == 'name':
+            if self.peek(1) == ('op', '=>'):
+                self.pos += 2
+                return self.parse_arrow([value])
+            self.pos += 1
+            return ('name', value)
+
+        if value == '[':
+            self.pos += 1
+            return ('array', self.parse_list(']'))
+
+        if value == '(':
+            params = self.arrow_params()
+            if params is not None:
+                return self.parse_arrow(params)
+            self.pos += 1
+            node = self.parse_expr()
+            self.take(')')
+            return node
+
+        raise NotImplementedError(f'Unexpected token {(kind, value)}')
+
+    def arrow_params(self) -> Optional[List[str]]:
+        """Consumes `(a, b) =>` if it is an arrow function"""
+
+        i = 1
+        params = []
+        while self.peek(i)[0] == 'name':
+            params.append(self.peek(i)[1])
+            i += 1
+            if self.peek(i) != ('op', ','):
+                break
+            i += 1
+        if self.peek(i) != ('op', ')') or self.peek(i + 1) != ('op', '=>'):
+            return None
+        self.pos += i + 2
+        return params
+
+    def parse_arrow(self, params: List[str]) -> Tuple[Any, ...]:
+        """Parses an arrow function body"""
+
+        if not self.skip('{'):
+            return ('func', params, [('return', self.parse_expr())])
+
+        body = []
+        while not self.skip('}'):
+            stmt = self.parse_stmt()
+            if stmt is not None:
+                body.append(stmt)
+        return ('func', params, body)
+
+    #
+    # evaluator
+    #
+    def evaluate(
+            self,
+            node: Tuple[Any, ...],
+            scopes: List[Dict[str, Any]]) -> Any:
+        """Evaluates an expression node
+
+        Args:
+            node (Tuple[Any, ...]): Parsed expression
+            scopes (List[Dict[str, Any]]): Variables,
+                the last one is the innermost scope
+
+        Returns:
+            Expression value
+        """
+
+        kind = node[0]
+
+        if kind in ('str', 'num'):
+            return node[1]
+
+        if kind == 'array':
+            return [self.evaluate(n, scopes) for n in node[1]]
+
+        if kind == 'name':
+            return self.lookup(node[1], scopes)
+
+        if kind == 'add':
+            left = self.evaluate(node[1], scopes)
+            right = self.evaluate(node[2], scopes)
+            if isinstance(left, str) or isinstance(right, str):
+                return self.to_str(left) + self.to_str(right)
+            if isinstance(left, (int, float)) \
+                    and isinstance(right, (int, float)):
+                return left + right
+            raise NotImplementedError('Unsupported operands of +')
+
+        if kind == 'member':
+            obj = self.evaluate(node[1], scopes)
+            key = self.evaluate(node[2], scopes)
+            return self.member(obj, key)
+
+        if kind == 'call':
+            func = self.evaluate(node[1], scopes)
+            args = [self.evaluate(n, scopes) for n in node[2]]
+            if not callable(func):
+                raise NotImplementedError(f'{func!r} is not a function')
+            return func(*args)
+
+        if kind == 'assign':
+            value = self.evaluate(node[2], scopes)
+            target = node[1]
+            if target[0] == 'name':
+                scopes[0]['window'][target[1]] = value
+                return value
+            obj = self.evaluate(target[1], scopes)
+            if not isinstance(obj, dict):
+                raise NotImplementedError('Assignment to a non-object')
+            obj[self.to_str(self.evaluate(target[2], scopes))] = value
+            return value
+
+        if kind == 'func':
+            return self.make_func(node[1], node[2], scopes)
+
+        raise NotImplementedError(f'Unsupported node {kind}')
+
+    def make_func(
+            self,
+            params: List[str],
+            body: List[Tuple[Any, ...]],
+            scopes: List[Dict[str, Any]]) -> Callable[..., Any]:
+        """Creates a Python function from a JS arrow function"""
+
+        def func(*args: Any) -> Any:
+            local = dict(zip(params, args))
+            inner = scopes + [local]
+            for stmt in body:
+                if stmt[0] == 'return':
+                    return self.evaluate(stmt[1], inner)
+                self.evaluate(stmt, inner)
+            return None
+
+        return func
+
+    def lookup(self, name: str, scopes: List[Dict[str, Any]]) -> Any:
+        """Finds a variable or a builtin by the name"""
+
+        for scope in reversed(scopes):
+            if name in scope:
+                return scope[name]
+
+        window = scopes[0]['window']
+        if name in window:
+            return window[name]
+        if name == 'atob':
+            return atob
+
+        raise NotImplementedError(f'Unknown name {name}')
+
+    def member(self, obj: Any, key: Any) -> Any:
+        """Returns a property or a bound method
+        of a string, an array or the window object"""
+
+        if isinstance(obj, dict):
+            key = self.to_str(key)
+            if key not in obj:
+                raise NotImplementedError(f'Unknown property {key}')
+            return obj[key]
+
+        if key == 'length' and isinstance(obj, (str, list)):
+            return len(obj)
+
+        if isinstance(key, int) and isinstance(obj, (str, list)):
+            if not 0 <= key < len(obj):
+                # undefined in JS, a negative index
+                # doesn't count from the end
+                raise NotImplementedError(f'Index {key} out of range')
+            return obj[key]
+
+        methods: Dict[str, Callable[..., Any]]
+        if isinstance(obj, str):
+            methods = {
+                'split': lambda sep: list(obj) if sep == '' else obj.split(sep),
+                'slice': lambda *a: self.slice(obj, *a),
+                'substring': lambda *a: self.substring(obj, *a),
+                'charAt': lambda i: obj[i:i + 1],
+                'concat': lambda *a: obj + ''.join(map(self.to_str, a)),
+                'toString': lambda: obj,
+            }
+        elif isinstance(obj, list):
+            methods = {
+                'reverse': lambda: obj.reverse() or obj,
+                'join': lambda sep=',': sep.join(map(self.to_str, obj)),
+                'map': lambda fn: [fn(x, i) for i, x in enumerate(obj)],
+                'slice': lambda *a: self.slice(obj, *a),
+                'concat': lambda *a: obj + [
+                    y for x in a
+                    for y in (x if isinstance(x, list) else [x])
+                ],
+            }
+        else:
+            methods = {}
+
+        if key not in methods:
+            raise NotImplementedError(f'Unknown member {key}')
+        return methods[key]
+
+    @staticmethod
+    def slice(obj: Any, start: Any = None, end: Any = None) -> Any:
+        """String and array `slice()`: negative
+        indices count from the end, the end is optional"""
+
+        # python slices clamp the indices the same way
+        start = FastInterpreter.to_int(start, 0)
+        end = FastInterpreter.to_int(end, len(obj))
+        return obj[start:end]
+
+    @staticmethod
+    def substring(obj: str, start: Any = None, end: Any = None) -> str:
+        """String `substring()`: indices are clamped
+        to the string, swapped if start is after the end"""
+
+        size = len(obj)
+        start = min(max(FastInterpreter.to_int(start, 0), 0), size)
+        end = min(max(FastInterpreter.to_int(end, size), 0), size)
+        if start > end:
+            start, end = end, start
+        return obj[start:end]
+
+    @staticmethod
+    def to_int(value: Any, default: int) -> int:
+        """Converts a method argument to an integer index,
+        `default` is used if the argument is omitted"""
+
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value == value \
+                and value not in (float('inf'), float('-inf')):
+            return int(value)
+        raise NotImplementedError(f'Unable to use {value!r} as an index')
+
+    @staticmethod
+    def to_str(value: Any) -> str:
+        """Converts a value to string like JS does"""
+
+        if isinstance(value, str):
+            return value
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, list):
+            return ','.join(map(FastInterpreter.to_str, value))
+        raise NotImplementedError(f'Unable to convert {value!r} to string')
+
+
 def atob(s: str) -> str:
     """Wrapper for the built-in library function.
     Decodes a base64 string
@@ -195,7 +884,7 @@ def atob(s: str) -> str:
 
 def get_interpreter(
         *args,
-        create: Type[Interpreter] = Js2PyInterpreter,
+        create: Type[Interpreter] = FastInterpreter,
         **kwargs) -> 'Interpreter':
     """Get or create a JS interpreter.
     `*args` and `**kwargs` will be passed
@@ -212,8 +901,9 @@ def get_interpreter(
     global js  # pylint: disable=global-statement
 
     # create if none
-    if js is None:
-        js = create(*args, **kwargs)
+    with js_lock:
+        if js is None:
+            js = create(*args, **kwargs)
 
     # and return
     return js
@@ -9,6 +9,7 @@ import lxml.html
 
 if TYPE_CHECKING:
     from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
 
 
 class Lists(enum.Enum):
@@ -76,7 +77,20 @@ class PlayersList:
             f'https://aternos.org/players/{self.lst.value}',
             'GET'
         )
-        listtree = lxml.html.fromstring(listreq.content)
+        return self.parse_players(listreq.content)
+
+    def parse_players(self, content: bytes) -> List[str]:
+        """Parses players' nicknames from the list page
+        and saves them to the cache
+
+        Args:
+            content (bytes): HTML page content
+
+        Returns:
+            List of players' nicknames
+        """
+
+        listtree = lxml.html.fromstring(content)
         items = listtree.xpath(
             '//div[@class="list-item"]'
         )
@@ -125,3 +139,69 @@ class PlayersList:
         for i, j in enumerate(self.players):
             if j == name:
                 del self.players[i]
+
+
+class AsyncPlayersList(PlayersList):
+
+    """Asyncio version of PlayersList.
+    The server info must be fetched
+    before creating an object"""
+
+    atserv: 'AsyncAternosServer'
+
+    async def list_players(  # type: ignore[override]
+            self, cache: bool = True) -> List[str]:
+        """Parse a players list
+
+        Args:
+            cache (bool, optional): If the function should
+                return cached list (highly recommended)
+
+        Returns:
+            List of players' nicknames
+        """
+
+        if cache and self.parsed:
+            return self.players
+
+        listreq = await self.atserv.atserver_request(
+            f'https://aternos.org/players/{self.lst.value}',
+            'GET'
+        )
+        return self.parse_players(listreq.content)
+
+    async def add(self, name: str) -> None:  # type: ignore[override]
+        """Appends a player to the list by the nickname
+
+        Args:
+            name (str): Player's nickname
+        """
+
+        await self.atserv.atserver_request(
+            'https://aternos.org/ajax/players/add',
+            'POST', data={
+                'list': self.lst.value,
+                'name': name
+            }, sendtoken=True
+        )
+
+        self.players.append(name)
+
+    async def remove(self, name: str) -> None:  # type: ignore[override]
+        """Removes a player from the list by the nickname
+
+        Args:
+            name (str): Player's nickname
+        """
+
+        await self.atserv.atserver_request(
+            'https://aternos.org/ajax/players/remove',
+            'POST', data={
+                'list': self.lst.value,
+                'name': name
+            }, sendtoken=True
+        )
+
+        for i, j in enumerate(self.players):
+            if j == name:
+                del self.players[i]
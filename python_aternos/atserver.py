@@ -2,19 +2,33 @@
 
 import enum
 import json
+import time
+import asyncio
+import threading
 
 from typing import Optional
 from typing import List, Dict, Any
+from typing import Iterable
+from typing import TYPE_CHECKING
 
 import requests
 
 from .atconnect import AternosConnect
+from .atconnect import AsyncAternosConnect
+from .aterrors import ServerError
 from .aterrors import ServerStartError
-from .atfm import FileManager
-from .atconf import AternosConfig
-from .atplayers import PlayersList
-from .atplayers import Lists
-from .atwss import AternosWss
+
+# These modules import lxml and websockets,
+# they are loaded only when a server needs them
+if TYPE_CHECKING:
+    from .atfm import FileManager
+    from .atfm import AsyncFileManager
+    from .atconf import AternosConfig
+    from .atconf import AsyncAternosConfig
+    from .atplayers import PlayersList
+    from .atplayers import AsyncPlayersList
+    from .atplayers import Lists
+    from .atwss import AternosWss
 
 
 class Edition(enum.IntEnum):
@@ -45,6 +59,24 @@ class Status(enum.IntEnum):
     confirm = 10
 
 
+# How long the cached server info
+# is considered fresh (seconds) by status
+STATUS_TTL: Dict[int, float] = {
+    Status.off: 30.0,
+    Status.on: 10.0,
+    Status.starting: 2.0,
+    Status.shutdown: 3.0,
+    Status.loading: 2.0,
+    Status.error: 10.0,
+    Status.preparing: 2.0,
+}
+DEFAULT_TTL = 5.0
+
+# Polling interval limits for wait_for_status (seconds)
+POLL_MIN = 1.0
+POLL_MAX = 10.0
+
+
 class AternosServer:
 
     """Class for controlling your Aternos Minecraft server"""
@@ -60,24 +92,258 @@ class AternosServer:
             atconn (AternosConnect):
                 AternosConnect instance with initialized Aternos session
             reqinfo (bool, optional): Automatically call
-                `fetch()` to get all info
+                `fetch()` to get all info. If False,
+                the info is requested on the first property access
         """
 
         self.servid = servid
         self.atconn = atconn
+        self._status: Optional[Dict[str, Any]] = None
+
+        # status cache
+        self.fetched_at = 0.0
+        self.fetch_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+
+        # created on the first files() call,
+        # keeps the directory listings cache
+        self.file_manager: Optional['FileManager'] = None
+        # created on the first config() call,
+        # keeps the options page snapshot
+        self.server_config: Optional['AternosConfig'] = None
+
         if reqinfo:
             self.fetch()
 
-    def fetch(self) -> None:
-        """Send a request to Aternos API to get all server info"""
+    def fetch(self, max_age: Optional[float] = None) -> None:
+        """Send a request to Aternos API to get all server info.
+        If the cached info is fresh enough, no request is sent.
+        Concurrent calls from several threads send only one request
 
-        servreq = self.atserver_request(
-            'https://aternos.org/ajax/status',
-            'GET', sendtoken=True
-        )
-        self._info = json.loads(servreq.content)
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                of the cached info in seconds, 0 forces a request.
+                By default, depends on the server status (`STATUS_TTL`)
+        """
+
+        if self.is_fresh(max_age):
+            self.cache_hits += 1
+            return
+
+        with self.fetch_lock:
+            # another thread has fetched it while we were waiting
+            if self.is_fresh(max_age):
+                self.cache_hits += 1
+                self.coalesced += 1
+                return
+
+            self.cache_misses += 1
+            servreq = self.atserver_request(
+                'https://aternos.org/ajax/status',
+                'GET', sendtoken=True
+            )
+            self.update_status(json.loads(servreq.content))
+
+    def update_status(self, info: Dict[str, Any]) -> None:
+        """Replaces the cached server info
+
+        Args:
+            info (Dict[str, Any]): Server info dictionary
+        """
+
+        self._status = info
+        self.fetched_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Marks the cached info as outdated,
+        so the next `fetch()` sends a request"""
+
+        self.fetched_at = 0.0
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        """Check if the cached info can be used
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                in seconds, see `fetch()`
+
+        Returns:
+            True if the info is loaded and not older than `max_age`
+        """
+
+        if self._status is None or self.fetched_at == 0.0:
+            return False
+
+        if max_age is None:
+            max_age = STATUS_TTL.get(
+                self._status.get('status', -1),
+                DEFAULT_TTL
+            )
+
+        return time.monotonic() - self.fetched_at < max_age
+
+    @property
+    def info_age(self) -> float:
+        """Seconds since the info was fetched
+
+        Returns:
+            Age of the cached info, infinity if not loaded
+        """
+
+        if self._status is None or self.fetched_at == 0.0:
+            return float('inf')
+        return time.monotonic() - self.fetched_at
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Status cache statistics
+
+        Returns:
+            Dictionary with `hits`, `misses`,
+            `coalesced` counters and the info `age`
+        """
+
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'coalesced': self.coalesced,
+            'age': self.info_age,
+        }
+
+    @property
+    def _info(self) -> Dict[str, Any]:
+        """Server info from the last `fetch()`,
+        requests it if the server was created lazily
+
+        Returns:
+            Server info dictionary
+        """
+
+        if self._status is None:
+            self.fetch()
+        assert self._status is not None
+        return self._status
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        """Copy of the server info dictionary
+        from the last `fetch()` or websocket status message
+
+        Returns:
+            Server info dictionary
+        """
+
+        return dict(self._info)
+
+    @property
+    def has_info(self) -> bool:
+        """Check if the server info was already requested
+
+        Returns:
+            True if properties can be read without a request
+        """
+
+        return self._status is not None
+
+    async def fetch_async(self, max_age: Optional[float] = None) -> None:
+        """Calls `fetch()` in a worker thread,
+        so the event loop is not blocked
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                of the cached info, see `fetch()`
+        """
+
+        await asyncio.to_thread(self.fetch, max_age)
+
+    async def wait_for_status(
+            self,
+            targets: Iterable[Status],
+            timeout: Optional[float] = None,
+            wss: Optional['AternosWss'] = None,
+            errors: Iterable[Status] = (Status.error,)) -> Dict[str, Any]:
+        """Waits until the server reaches one of the statuses.
+        Status updates are received from the websocket if it is
+        connected, otherwise the status is polled with an interval
+        growing from `POLL_MIN` to `POLL_MAX` while it doesn't change
+
+        Args:
+            targets (Iterable[Status]): Expected statuses
+            timeout (Optional[float], optional): Maximum
+                waiting time in seconds, None means no limit
+            wss (Optional[AternosWss], optional): Websocket
+                connection to receive status updates from
+            errors (Iterable[Status], optional): Statuses
+                that mean the expected one will never be reached
+
+        Raises:
+            ServerError: If the server reaches an error status
+            asyncio.TimeoutError: If the timeout has expired
+
+        Returns:
+            Server info dictionary with the expected status
+        """
+
+        targets = set(targets)
+        errors = set(errors)
+        updates: 'asyncio.Queue[Dict[str, Any]]' = asyncio.Queue()
+
+        async def on_status(msg: Dict[str, Any]) -> None:
+            self.update_status(msg)
+            updates.put_nowait(msg)
+
+        def check(info: Dict[str, Any]) -> bool:
+            if info['status'] in errors:
+                raise ServerError(
+                    info.get('lang', str(info['status'])),
+                    f'Server has reached {info.get("lang")} status'
+                )
+            return info['status'] in targets
+
+        async def waiter() -> Dict[str, Any]:
+
+            await self.fetch_async()
+            info = self._info
+            interval = POLL_MIN
 
-    def wss(self, autoconfirm: bool = False) -> AternosWss:
+            while not check(info):
+
+                if wss is not None and wss.connected:
+                    try:
+                        info = await asyncio.wait_for(updates.get(), POLL_MAX)
+                        continue
+                    except asyncio.TimeoutError:
+                        # no pushes for a while, check it manually
+                        pass
+
+                else:
+                    await asyncio.sleep(interval)
+
+                prev = info['status']
+                await self.fetch_async(interval)
+                info = self._info
+
+                if info['status'] == prev:
+                    interval = min(interval * 1.5, POLL_MAX)
+                else:
+                    interval = POLL_MIN
+
+            return info
+
+        if wss is None:
+            return await asyncio.wait_for(waiter(), timeout)
+
+        # atwss is already imported if there is a connection
+        from .atwss import Streams  # pylint: disable=import-outside-toplevel
+
+        wss.add_receiver(Streams.status, on_status)
+        try:
+            return await asyncio.wait_for(waiter(), timeout)
+        finally:
+            wss.remove_receiver(Streams.status, on_status)
+
+    def wss(self, autoconfirm: bool = False) -> 'AternosWss':
         """Returns AternosWss instance for
         listening server streams in real-time
 
@@ -91,6 +357,7 @@ class AternosServer:
             AternosWss object
         """
 
+        from .atwss import AternosWss  # pylint: disable=import-outside-toplevel
         return AternosWss(self, autoconfirm)
 
     def start(
@@ -119,6 +386,7 @@ class AternosServer:
         startresult = startreq.json()
 
         if startresult['success']:
+            self.invalidate()
             return
 
         error = startresult['error']
@@ -137,6 +405,7 @@ class AternosServer:
             'https://aternos.org/ajax/confirm',
             'GET', sendtoken=True
         )
+        self.invalidate()
 
     def stop(self) -> None:
         """Stops the server"""
@@ -145,6 +414,7 @@ class AternosServer:
             'https://aternos.org/ajax/stop',
             'GET', sendtoken=True
         )
+        self.invalidate()
 
     def cancel(self) -> None:
         """Cancels server launching"""
@@ -153,6 +423,7 @@ class AternosServer:
             'https://aternos.org/ajax/cancel',
             'GET', sendtoken=True
         )
+        self.invalidate()
 
     def restart(self) -> None:
         """Restarts the server"""
@@ -161,6 +432,7 @@ class AternosServer:
             'https://aternos.org/ajax/restart',
             'GET', sendtoken=True
         )
+        self.invalidate()
 
     def eula(self) -> None:
         """Accepts the Mojang EULA"""
@@ -170,27 +442,33 @@ class AternosServer:
             'GET', sendtoken=True
         )
 
-    def files(self) -> FileManager:
+    def files(self) -> 'FileManager':
         """Returns FileManager instance
-        for file operations
+        for file operations, the same one on each call
 
         Returns:
             FileManager object
         """
 
-        return FileManager(self)
+        if self.file_manager is None:
+            from .atfm import FileManager  # pylint: disable=import-outside-toplevel
+            self.file_manager = FileManager(self)
+        return self.file_manager
 
-    def config(self) -> AternosConfig:
+    def config(self) -> 'AternosConfig':
         """Returns AternosConfig instance
-        for editing server settings
+        for editing server settings, the same one on each call
 
         Returns:
             AternosConfig object
         """
 
-        return AternosConfig(self)
+        if self.server_config is None:
+            from .atconf import AternosConfig  # pylint: disable=import-outside-toplevel
+            self.server_config = AternosConfig(self)
+        return self.server_config
 
-    def players(self, lst: Lists) -> PlayersList:
+    def players(self, lst: 'Lists') -> 'PlayersList':
         """Returns PlayersList instance
         for managing operators, whitelist
         and banned players lists
@@ -203,6 +481,7 @@ class AternosServer:
             PlayersList object
         """
 
+        from .atplayers import PlayersList  # pylint: disable=import-outside-toplevel
         return PlayersList(lst, self)
 
     def atserver_request(
@@ -210,7 +489,8 @@ class AternosServer:
             params: Optional[Dict[Any, Any]] = None,
             data: Optional[Dict[Any, Any]] = None,
             headers: Optional[Dict[Any, Any]] = None,
-            sendtoken: bool = False) -> requests.Response:
+            sendtoken: bool = False,
+            stream: bool = False) -> requests.Response:
         """Sends a request to Aternos API
         with server IDenitfier parameter
 
@@ -223,6 +503,7 @@ class AternosServer:
                 will be combined with params
             headers (Optional[Dict[Any, Any]], optional): Custom headers
             sendtoken (bool, optional): If the ajax and SEC token should be sent
+            stream (bool, optional): Don't download the response body immediately
 
         Returns:
             API response
@@ -235,7 +516,8 @@ class AternosServer:
             reqcookies={
                 'ATERNOS_SERVER': self.servid
             },
-            sendtoken=sendtoken
+            sendtoken=sendtoken,
+            stream=stream
         )
 
     @property
@@ -462,3 +744,271 @@ class AternosServer:
 
         value = self._info['countdown']
         return int(value or -1)
+
+
+class AsyncAternosServer(AternosServer):
+
+    """Asyncio version of AternosServer.
+    Unlike the sync class, it never requests
+    the server info in `__init__`,
+    call `await fetch()` before reading properties"""
+
+    atconn: AsyncAternosConnect
+
+    def __init__(
+            self, servid: str,
+            atconn: AsyncAternosConnect) -> None:
+        """Asyncio version of AternosServer
+
+        Args:
+            servid (str): Unique server IDentifier
+            atconn (AsyncAternosConnect):
+                AsyncAternosConnect instance
+                with initialized Aternos session
+        """
+
+        super().__init__(servid, atconn, False)  # type: ignore[arg-type]
+        self.inflight: Optional[asyncio.Future] = None
+
+    async def fetch(  # type: ignore[override]
+            self, max_age: Optional[float] = None) -> None:
+        """Send a request to Aternos API to get all server info.
+        If the cached info is fresh enough, no request is sent.
+        Concurrent callers wait for the same request
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                of the cached info in seconds, see `AternosServer.fetch`
+        """
+
+        if self.is_fresh(max_age):
+            self.cache_hits += 1
+            return
+
+        if self.inflight is None or self.inflight.done():
+            self.cache_misses += 1
+            self.inflight = asyncio.ensure_future(self.request_status())
+        else:
+            self.coalesced += 1
+
+        # a cancelled caller must not cancel the request for others
+        await asyncio.shield(self.inflight)
+
+    async def request_status(self) -> None:
+        """Requests the server info without using the cache"""
+
+        servreq = await self.atserver_request(
+            'https://aternos.org/ajax/status',
+            'GET', sendtoken=True
+        )
+        self.update_status(json.loads(servreq.content))
+
+    async def fetch_async(self, max_age: Optional[float] = None) -> None:
+        """The same as `await fetch()`
+
+        Args:
+            max_age (Optional[float], optional): Maximum age
+                of the cached info, see `AternosServer.fetch`
+        """
+
+        await self.fetch(max_age)
+
+    @property
+    def _info(self) -> Dict[str, Any]:
+        """Server info from the last `fetch()`
+
+        Raises:
+            RuntimeWarning: If the info was not requested yet
+
+        Returns:
+            Server info dictionary
+        """
+
+        if self._status is None:
+            raise RuntimeWarning(
+                'Server info is not loaded, '
+                'call `await fetch()` first'
+            )
+        return self._status
+
+    async def start(  # type: ignore[override]
+            self,
+            headstart: bool = False,
+            accepteula: bool = True) -> None:
+        """Starts a server
+
+        Args:
+            headstart (bool, optional): Start a server in
+                the headstart mode which allows
+                you to skip all queue
+            accepteula (bool, optional):
+                Automatically accept the Mojang EULA
+
+        Raises:
+            ServerStartError: When Aternos
+                is unable to start the server
+        """
+
+        startreq = await self.atserver_request(
+            'https://aternos.org/ajax/start',
+            'GET', params={'headstart': int(headstart)},
+            sendtoken=True
+        )
+        startresult = startreq.json()
+
+        if startresult['success']:
+            self.invalidate()
+            return
+
+        error = startresult['error']
+
+        if error == 'eula' and accepteula:
+            await self.eula()
+            await self.start(accepteula=False)
+            return
+
+        raise ServerStartError(error)
+
+    async def confirm(self) -> None:  # type: ignore[override]
+        """Confirms server launching"""
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/confirm',
+            'GET', sendtoken=True
+        )
+        self.invalidate()
+
+    async def stop(self) -> None:  # type: ignore[override]
+        """Stops the server"""
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/stop',
+            'GET', sendtoken=True
+        )
+        self.invalidate()
+
+    async def cancel(self) -> None:  # type: ignore[override]
+        """Cancels server launching"""
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/cancel',
+            'GET', sendtoken=True
+        )
+        self.invalidate()
+
+    async def restart(self) -> None:  # type: ignore[override]
+        """Restarts the server"""
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/restart',
+            'GET', sendtoken=True
+        )
+        self.invalidate()
+
+    async def eula(self) -> None:  # type: ignore[override]
+        """Accepts the Mojang EULA"""
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/eula',
+            'GET', sendtoken=True
+        )
+
+    def files(self) -> 'AsyncFileManager':
+        """Returns AsyncFileManager instance
+        for file operations, the same one on each call
+
+        Returns:
+            AsyncFileManager object
+        """
+
+        if self.file_manager is None:
+            from .atfm import AsyncFileManager  # pylint: disable=import-outside-toplevel
+            self.file_manager = AsyncFileManager(self)
+        return self.file_manager  # type: ignore[return-value]
+
+    def config(self) -> 'AsyncAternosConfig':
+        """Returns AsyncAternosConfig instance
+        for editing server settings, the same one on each call
+
+        Returns:
+            AsyncAternosConfig object
+        """
+
+        if self.server_config is None:
+            from .atconf import AsyncAternosConfig  # pylint: disable=import-outside-toplevel
+            self.server_config = AsyncAternosConfig(self)
+        return self.server_config  # type: ignore[return-value]
+
+    def players(self, lst: 'Lists') -> 'AsyncPlayersList':
+        """Returns AsyncPlayersList instance
+        for managing operators, whitelist
+        and banned players lists
+
+        Args:
+            lst (Lists): Players list type,
+                must be the atplayers.Lists enum value
+
+        Returns:
+            AsyncPlayersList object
+        """
+
+        from .atplayers import AsyncPlayersList  # pylint: disable=import-outside-toplevel
+        return AsyncPlayersList(lst, self)
+
+    async def atserver_request(  # type: ignore[override]
+            self, url: str, method: str,
+            params: Optional[Dict[Any, Any]] = None,
+            data: Optional[Dict[Any, Any]] = None,
+            headers: Optional[Dict[Any, Any]] = None,
+            sendtoken: bool = False,
+            stream: bool = False) -> requests.Response:
+        """Sends a request to Aternos API
+        with server IDenitfier parameter.
+        Arguments are the same as in
+        `AternosServer.atserver_request`
+
+        Returns:
+            API response
+        """
+
+        return await self.atconn.request_cloudflare(
+            url=url, method=method,
+            params=params, data=data,
+            headers=headers,
+            reqcookies={
+                'ATERNOS_SERVER': self.servid
+            },
+            sendtoken=sendtoken,
+            stream=stream
+        )
+
+    # Setters can not be awaited,
+    # so these properties are read-only here
+    subdomain = property(AternosServer.subdomain.fget)  # type: ignore
+    motd = property(AternosServer.motd.fget)  # type: ignore
+
+    async def set_subdomain(self, value: str) -> None:
+        """Set a new subdomain for your server
+
+        Args:
+            value (str): Subdomain
+        """
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/options/subdomain',
+            'GET', params={'subdomain': value},
+            sendtoken=True
+        )
+
+    async def set_motd(self, value: str) -> None:
+        """Set a new message of the day
+
+        Args:
+            value (str): New MOTD
+        """
+
+        await self.atserver_request(
+            'https://aternos.org/ajax/options/motd',
+            'POST', data={'motd': value},
+            sendtoken=True
+        )
@@ -0,0 +1,283 @@
+"""Stores RAM usage and TPS
+received from the websocket"""
+
+import time
+
+from array import array
+from typing import Dict, List
+from typing import Optional, Tuple
+
+# Raw samples kept per series
+RAW_SIZE = 600
+# (bucket width in seconds, buckets count)
+MINUTES = (60.0, 24 * 60)
+HOURS = (60.0 * 60, 30 * 24)
+
+
+class Samples:
+
+    """Ring buffer of the latest
+    (timestamp, value) pairs"""
+
+    def __init__(self, size: int = RAW_SIZE) -> None:
+        """Ring buffer of the latest
+        (timestamp, value) pairs
+
+        Args:
+            size (int, optional): Max samples count
+        """
+
+        self.size = size
+        self.times = array('d', bytes(8 * size))
+        self.values = array('d', bytes(8 * size))
+        self.head = -1
+        self.used = 0
+
+    def __len__(self) -> int:
+        return self.used
+
+    def add(self, stamp: float, value: float) -> None:
+        """Adds a sample overwriting the oldest one
+        if the buffer is full
+
+        Args:
+            stamp (float): Unix timestamp
+            value (float): Value
+        """
+
+        self.head = (self.head + 1) % self.size
+        self.times[self.head] = stamp
+        self.values[self.head] = value
+        if self.used < self.size:
+            self.used += 1
+
+    def latest(self, count: int) -> List[Tuple[float, float]]:
+        """Latest samples
+
+        Args:
+            count (int): Samples count
+
+        Returns:
+            Up to `count` (timestamp, value) pairs, the oldest first
+        """
+
+        count = min(count, self.used)
+        result = []
+        for i in range(count - 1, -1, -1):
+            idx = (self.head - i) % self.size
+            result.append((self.times[idx], self.values[idx]))
+        return result
+
+
+class Rollup:
+
+    """Ring buffer of fixed-width time buckets
+    with min, max, sum and count of the values"""
+
+    def __init__(self, width: float, size: int) -> None:
+        """Ring buffer of fixed-width time buckets
+        with min, max, sum and count of the values
+
+        Args:
+            width (float): Bucket width in seconds
+            size (int): Buckets count
+        """
+
+        self.width = width
+        self.size = size
+
+        zeros = bytes(8 * size)
+        self.starts = array('d', zeros)
+        self.mins = array('d', zeros)
+        self.maxs = array('d', zeros)
+        self.sums = array('d', zeros)
+        self.counts = array('q', zeros)
+
+        self.head = -1
+        self.used = 0
+
+    def add(self, stamp: float, value: float) -> None:
+        """Adds a value to the bucket
+        containing the timestamp
+
+        Args:
+            stamp (float): Unix timestamp
+            value (float): Value
+        """
+
+        start = stamp - stamp % self.width
+        head = self.head
+
+        # samples that arrive late
+        # are counted in the current bucket
+        if self.used and start <= self.starts[head]:
+            if value < self.mins[head]:
+                self.mins[head] = value
+            if value > self.maxs[head]:
+                self.maxs[head] = value
+            self.sums[head] += value
+            self.counts[head] += 1
+            return
+
+        head = (head + 1) % self.size
+        self.head = head
+        self.starts[head] = start
+        self.mins[head] = value
+        self.maxs[head] = value
+        self.sums[head] = value
+        self.counts[head] = 1
+        if self.used < self.size:
+            self.used += 1
+
+    @property
+    def span(self) -> float:
+        """Time covered by all buckets
+
+        Returns:
+            Seconds
+        """
+
+        return self.width * self.size
+
+    def summary(self, since: float) -> Optional[Dict[str, float]]:
+        """Aggregates the buckets overlapping
+        the time from `since` till now
+
+        Args:
+            since (float): Unix timestamp
+
+        Returns:
+            Dictionary with `min`, `avg`, `max` and `count`
+            or None if there are no values
+        """
+
+        low = float('inf')
+        high = float('-inf')
+        total = 0.0
+        count = 0
+
+        # from the newest to the oldest
+        for i in range(self.used):
+            idx = (self.head - i) % self.size
+            if self.starts[idx] + self.width <= since:
+                break
+            low = min(low, self.mins[idx])
+            high = max(high, self.maxs[idx])
+            total += self.sums[idx]
+            count += self.counts[idx]
+
+        if not count:
+            return None
+
+        return {
+            'min': low,
+            'avg': total / count,
+            'max': high,
+            'count': count,
+        }
+
+
+class TimeSeries:
+
+    """Raw samples with per-minute
+    and per-hour rollups. Uses a constant
+    amount of memory"""
+
+    def __init__(
+            self,
+            raw: int = RAW_SIZE,
+            minutes: Tuple[float, int] = MINUTES,
+            hours: Tuple[float, int] = HOURS) -> None:
+        """Raw samples with per-minute
+        and per-hour rollups
+
+        Args:
+            raw (int, optional): Raw samples count
+            minutes (Tuple[float, int], optional): Fine rollup
+                bucket width and buckets count
+            hours (Tuple[float, int], optional): Coarse rollup
+                bucket width and buckets count
+        """
+
+        self.raw = Samples(raw)
+        self.rollups = (Rollup(*minutes), Rollup(*hours))
+
+    def add(self, value: float, stamp: Optional[float] = None) -> None:
+        """Adds a sample
+
+        Args:
+            value (float): Value
+            stamp (Optional[float], optional): Unix timestamp,
+                current time if not specified
+        """
+
+        if stamp is None:
+            stamp = time.time()
+
+        self.raw.add(stamp, value)
+        for rollup in self.rollups:
+            rollup.add(stamp, value)
+
+    @property
+    def last(self) -> Optional[float]:
+        """The latest value
+
+        Returns:
+            Value or None if there are no samples
+        """
+
+        if not self.raw.used:
+            return None
+        return self.raw.values[self.raw.head]
+
+    def summary(
+            self,
+            seconds: float,
+            now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Min, average and max for the last `seconds`,
+        taken from the finest rollup covering that time
+
+        Args:
+            seconds (float): Time window
+            now (Optional[float], optional): Unix timestamp
+                of the window end, current time if not specified
+
+        Returns:
+            Dictionary with `min`, `avg`, `max` and `count`
+            or None if there are no values
+        """
+
+        if now is None:
+            now = time.time()
+
+        for rollup in self.rollups:
+            if rollup.span >= seconds:
+                break
+
+        return rollup.summary(now - seconds)
+
+
+class ServerStats:
+
+    """RAM usage (bytes) and TPS series of a server"""
+
+    def __init__(self) -> None:
+
+        self.ram = TimeSeries()
+        self.tps = TimeSeries()
+
+    def summary(self, seconds: float) -> Dict[str, Optional[Dict[str, float]]]:
+        """Summaries of both series
+
+        Args:
+            seconds (float): Time window
+
+        Returns:
+            `TimeSeries.summary` by series name (`ram`, `tps`)
+        """
+
+        now = time.time()
+        return {
+            'ram': self.ram.summary(seconds, now),
+            'tps': self.tps.summary(seconds, now),
+        }
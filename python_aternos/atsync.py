@@ -0,0 +1,352 @@
+"""Keeps a local copy of a server directory
+downloading only new and changed files"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING
+
+from .atfile import AternosFile
+
+if TYPE_CHECKING:
+    from .atserver import AternosServer
+    from .atserver import AsyncAternosServer
+
+MANIFEST = '.aternos-mirror.json'
+
+
+class Mirror:
+
+    """Incremental mirror of a server directory.
+    The remote listing (path and size) is compared
+    with the manifest saved by the previous sync,
+    so unchanged files are not downloaded again"""
+
+    def __init__(
+            self,
+            atserv: 'AternosServer',
+            remote: str,
+            local: str,
+            workers: int = 4,
+            prune: bool = False) -> None:
+        """Incremental mirror of a server directory
+
+        Args:
+            atserv (python_aternos.atserver.AternosServer):
+                atserver.AternosServer instance
+            remote (str): Server directory, e.g. `plugins`,
+                an empty string means root
+            local (str): Local directory
+            workers (int, optional): Maximum number
+                of concurrent downloads
+            prune (bool, optional): Delete local copies
+                of the files removed from the server,
+                otherwise they are only marked as deleted
+                in the manifest
+        """
+
+        self.atserv = atserv
+        self.remote = remote.strip('/')
+        self.local = local
+        self.workers = max(1, workers)
+        self.prune = prune
+
+    @property
+    def manifest_path(self) -> str:
+        """Path to the mirror manifest
+
+        Returns:
+            `.aternos-mirror.json` in the local directory
+        """
+
+        return os.path.join(self.local, MANIFEST)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Reads the manifest of the previous sync
+
+        Returns:
+            Dictionary with `files` (remote size
+            and sync time by relative path)
+            and `deleted` (deletion time by relative path)
+        """
+
+        try:
+            with open(self.manifest_path, 'rt', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            manifest = {}
+
+        manifest.setdefault('files', {})
+        manifest.setdefault('deleted', {})
+        return manifest
+
+    def save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Writes the manifest atomically
+
+        Args:
+            manifest (Dict[str, Any]): Manifest dictionary
+        """
+
+        tmp = f'{self.manifest_path}.tmp'
+        with open(tmp, 'wt', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def relpath(self, file: AternosFile) -> str:
+        """File path relative to the mirrored directory
+
+        Args:
+            file (AternosFile): Remote file
+
+        Returns:
+            Relative path with `/` separators
+        """
+
+        path = file.path.strip('/')
+        if self.remote:
+            path = path[len(self.remote) + 1:]
+        return path
+
+    def local_path(self, rel: str) -> str:
+        """Local path of a mirrored file
+
+        Args:
+            rel (str): Relative path
+
+        Raises:
+            ValueError: If the path points
+                outside of the local directory
+
+        Returns:
+            Path in the local directory
+        """
+
+        root = os.path.abspath(self.local)
+        path = os.path.abspath(os.path.join(root, *rel.split('/')))
+        if os.path.commonpath((root, path)) != root:
+            raise ValueError(f'Unsafe path: {rel}')
+        return path
+
+    def plan(
+            self,
+            files: List[AternosFile],
+            manifest: Dict[str, Any]) -> Tuple[List[AternosFile], int, List[str]]:
+        """Compares the remote listing with the manifest
+
+        Args:
+            files (List[AternosFile]): Remote files
+            manifest (Dict[str, Any]): Manifest of the previous sync
+
+        Returns:
+            Files to download, unchanged files count
+            and relative paths of deleted files
+        """
+
+        known = manifest['files']
+        fetch = []
+        unchanged = 0
+
+        for f in files:
+            rel = self.relpath(f)
+            entry = known.get(rel)
+            if entry is not None \
+                    and entry['size'] == f.size \
+                    and os.path.exists(os.path.join(self.local, rel)):
+                unchanged += 1
+            else:
+                # unsafe paths fail in download()
+                fetch.append(f)
+
+        remote = {self.relpath(f) for f in files}
+        deleted = [rel for rel in known if rel not in remote]
+
+        return fetch, unchanged, deleted
+
+    def remote_files(self) -> List[AternosFile]:
+        """Lists all files in the mirrored directory
+        requesting fresh listings
+
+        Returns:
+            List of atfile.AternosFile objects
+        """
+
+        fm = self.atserv.files()
+        return [
+            f
+            for _, _, files in fm.walk(self.remote, self.workers, 0.0)
+            for f in files
+        ]
+
+    def download(self, file: AternosFile) -> int:
+        """Downloads a remote file to the local directory
+
+        Args:
+            file (AternosFile): Remote file
+
+        Returns:
+            File size in bytes
+        """
+
+        path = self.local_path(self.relpath(file))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return file.save(path)
+
+    def apply(
+            self,
+            manifest: Dict[str, Any],
+            results: List[Tuple[AternosFile, Any]],
+            unchanged: int,
+            deleted: List[str],
+            skipped: List[AternosFile]) -> Dict[str, Any]:
+        """Updates the manifest with the sync results
+
+        Args:
+            manifest (Dict[str, Any]): Manifest dictionary
+            results (List[Tuple[AternosFile, Any]]): Downloaded
+                files with written bytes count or an exception
+            unchanged (int): Unchanged files count
+            deleted (List[str]): Relative paths of deleted files
+            skipped (List[AternosFile]): Files
+                which can't be downloaded
+
+        Returns:
+            Sync summary, see `sync`
+        """
+
+        now = time.time()
+        summary: Dict[str, Any] = {
+            'downloaded': [],
+            'failed': {},
+            'unchanged': unchanged,
+            'deleted': deleted,
+            'skipped': [self.relpath(f) for f in skipped],
+            'bytes': 0,
+        }
+
+        for f, result in results:
+            rel = self.relpath(f)
+            if isinstance(result, Exception):
+                logging.warning('Unable to mirror %s: %s', rel, result)
+                summary['failed'][rel] = str(result)
+                continue
+            manifest['files'][rel] = {'size': f.size, 'synced': now}
+            manifest['deleted'].pop(rel, None)
+            summary['downloaded'].append(rel)
+            summary['bytes'] += result
+
+        for rel in deleted:
+            manifest['files'].pop(rel, None)
+            manifest['deleted'][rel] = now
+            if self.prune:
+                path = self.local_path(rel)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        manifest['synced'] = now
+        self.save_manifest(manifest)
+        return summary
+
+    def sync(self) -> Dict[str, Any]:
+        """Downloads new and changed files concurrently
+        and records deleted ones in the manifest.
+        Changes are detected by the size shown
+        in the Aternos file manager, which is rounded
+        for big files, so a full sync may be needed
+        from time to time (delete the manifest)
+
+        Returns:
+            Summary with `downloaded` and `deleted` relative paths,
+            `failed` errors by relative path, `skipped`
+            undownloadable files, `unchanged` files count
+            and downloaded `bytes`
+        """
+
+        os.makedirs(self.local, exist_ok=True)
+        manifest = self.load_manifest()
+
+        files = self.remote_files()
+        fetch, unchanged, deleted = self.plan(files, manifest)
+        skipped = [f for f in fetch if not f.downloadable]
+        fetch = [f for f in fetch if f.downloadable]
+
+        def download(file: AternosFile) -> Tuple[AternosFile, Any]:
+            try:
+                return file, self.download(file)
+            except Exception as err:  # pylint: disable=broad-except
+                return file, err
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            results = list(pool.map(download, fetch))
+
+        return self.apply(manifest, results, unchanged, deleted, skipped)
+
+
+class AsyncMirror(Mirror):
+
+    """Asyncio version of Mirror"""
+
+    atserv: 'AsyncAternosServer'
+
+    async def remote_files(self) -> List[AternosFile]:  # type: ignore[override]
+        """Lists all files in the mirrored directory
+        requesting fresh listings
+
+        Returns:
+            List of atfile.AsyncAternosFile objects
+        """
+
+        fm = self.atserv.files()
+        files = []
+        async for _, _, dirfiles in fm.walk(self.remote, self.workers, 0.0):
+            files.extend(dirfiles)
+        return files
+
+    async def download(  # type: ignore[override]
+            self, file: AternosFile) -> int:
+        """Downloads a remote file to the local directory
+
+        Args:
+            file (AternosFile): Remote file
+
+        Returns:
+            File size in bytes
+        """
+
+        path = self.local_path(self.relpath(file))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return await file.save(path)  # type: ignore[misc]
+
+    async def sync(self) -> Dict[str, Any]:  # type: ignore[override]
+        """Downloads new and changed files concurrently
+        and records deleted ones in the manifest,
+        see `Mirror.sync`
+
+        Returns:
+            Sync summary
+        """
+
+        os.makedirs(self.local, exist_ok=True)
+        manifest = self.load_manifest()
+
+        files = await self.remote_files()
+        fetch, unchanged, deleted = self.plan(files, manifest)
+        skipped = [f for f in fetch if not f.downloadable]
+        fetch = [f for f in fetch if f.downloadable]
+
+        limit = asyncio.Semaphore(self.workers)
+
+        async def download(file: AternosFile) -> Tuple[AternosFile, Any]:
+            async with limit:
+                try:
+                    return file, await self.download(file)
+                except Exception as err:  # pylint: disable=broad-except
+                    return file, err
+
+        results = await asyncio.gather(*(download(f) for f in fetch))
+
+        return self.apply(manifest, list(results), unchanged, deleted, skipped)
@@ -3,25 +3,43 @@ for real-time information"""
 
 import enum
 import json
+import time
 import asyncio
 import logging
 
 from typing import Iterable
-from typing import Union, Any
+from typing import Union, Optional, Any
 from typing import Tuple, List, Dict
 from typing import Callable, Coroutine
 from typing import TYPE_CHECKING
 
 import websockets
 
+try:
+    # faster JSON parser, optional
+    import orjson
+    loads: Callable[[Union[str, bytes]], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
 from .atconnect import REQUA
+from .atconsole import ConsoleLog
+from .atconsole import CONSOLE_LINES, CONSOLE_BYTES
+from .atstats import ServerStats
 if TYPE_CHECKING:
     from .atserver import AternosServer
 
+# Delay between reconnection attempts (seconds)
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 60.0
+
+# Messages waiting for a slow listener
+QUEUE_SIZE = 100
+
 OneArgT = Callable[[Any], Coroutine[Any, Any, None]]
 TwoArgT = Callable[[Any, Tuple[Any, ...]], Coroutine[Any, Any, None]]
 FunctionT = Union[OneArgT, TwoArgT]
-ArgsTuple = Tuple[FunctionT, Tuple[Any, ...]]
+SinkT = Callable[[Any], None]
 
 
 class Streams(enum.Enum):
@@ -41,6 +59,203 @@ class Streams(enum.Enum):
         self.stream = stream
 
 
+def decode_line(obj: Dict[str, Any]) -> str:
+    """Console line without the line break"""
+    return obj['data'].strip('\r\n ')
+
+
+def decode_heap(obj: Dict[str, Any]) -> int:
+    """Used RAM in bytes"""
+    return int(obj['data']['usage'])
+
+
+def decode_tick(obj: Dict[str, Any]) -> float:
+    """Ticks per second, 20 at most"""
+    ticks = 1000 / obj['data']['averageTickTime']
+    return 20 if ticks > 20 else ticks
+
+
+def decode_status(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Server info dictionary,
+    it is sent as a JSON string"""
+    return loads(obj['message'])
+
+
+# message type -> (stream, decoder)
+DISPATCH: Dict[str, Tuple[Streams, Callable[[Dict[str, Any]], Any]]] = {
+    'line': (Streams.console, decode_line),
+    'heap': (Streams.ram, decode_heap),
+    'tick': (Streams.tps, decode_tick),
+    'status': (Streams.status, decode_status),
+}
+
+TYPE_PREFIX = '{"type":"'
+
+
+def peek_type(data: Union[str, bytes]) -> Optional[str]:
+    """Reads the message type without parsing JSON
+
+    Args:
+        data (Union[str, bytes]): Raw websocket frame
+
+    Returns:
+        Message type or None if the frame
+        doesn't start with the `type` key
+    """
+
+    if not isinstance(data, str) or not data.startswith(TYPE_PREFIX):
+        return None
+
+    end = data.find('"', len(TYPE_PREFIX))
+    if end < 0:
+        return None
+    return data[len(TYPE_PREFIX):end]
+
+
+class Overflow(enum.Enum):
+
+    """What to do with a message
+    when the listener's queue is full"""
+
+    drop_oldest = 0
+    coalesce = 1
+    block = 2
+
+
+class Receiver:
+
+    """Stream listener with a bounded queue
+    and a dedicated consumer task"""
+
+    def __init__(
+            self,
+            func: FunctionT,
+            arg: Tuple[Any, ...] = (),
+            maxsize: int = QUEUE_SIZE,
+            overflow: Overflow = Overflow.drop_oldest) -> None:
+        """Stream listener with a bounded queue
+        and a dedicated consumer task
+
+        Args:
+            func (FunctionT): Coroutine function
+            arg (Tuple[Any, ...], optional): Arguments
+                which will be passed to your function
+            maxsize (int, optional): Queue size
+            overflow (Overflow, optional): Policy applied
+                when the queue is full: `drop_oldest` discards
+                the oldest message, `coalesce` keeps only
+                the latest one, `block` waits for the listener
+        """
+
+        self.func = func
+        self.arg = arg
+        self.maxsize = maxsize
+        self.overflow = overflow
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.drops = 0
+        self.handled = 0
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting in the queue
+
+        Returns:
+            Queue length
+        """
+
+        if self.queue is None:
+            return 0
+        return self.queue.qsize()
+
+    async def put(self, msg: Any) -> None:
+        """Queues a message applying
+        the overflow policy and starts
+        the consumer task if it is not running
+
+        Args:
+            msg (Any): Parsed message
+        """
+
+        if self.queue is None:
+            self.queue = asyncio.Queue(self.maxsize)
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.consumer())
+
+        queue = self.queue
+
+        if self.overflow == Overflow.block:
+            await queue.put(msg)
+            return
+
+        if self.overflow == Overflow.coalesce:
+            # only the latest message matters
+            while not queue.empty():
+                queue.get_nowait()
+                self.drops += 1
+
+        elif queue.full():
+            queue.get_nowait()
+            self.drops += 1
+
+        queue.put_nowait(msg)
+
+    async def consumer(self) -> None:
+
+        """Calls the listener for each queued message"""
+
+        assert self.queue is not None
+
+        while True:
+            msg = await self.queue.get()
+            try:
+                # if arguments is not empty
+                if self.arg:
+                    # call the function with args
+                    await self.func(msg, self.arg)  # type: ignore
+                else:
+                    # mypy error: too few arguments
+                    # looks like a bug, so it is ignored
+                    await self.func(msg)  # type: ignore
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception(
+                    'Stream listener %s failed',
+                    getattr(self.func, '__name__', self.func)
+                )
+            self.handled += 1
+
+    def stop(self) -> None:
+
+        """Cancels the consumer task
+        and discards queued messages"""
+
+        if self.task is not None:
+            self.task.cancel()
+        self.task = None
+        self.queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue statistics
+
+        Returns:
+            Dictionary with the listener `name`,
+            queue `depth`, `maxsize`, `drops`
+            and `handled` messages count
+        """
+
+        return {
+            'name': getattr(self.func, '__name__', repr(self.func)),
+            'depth': self.depth,
+            'maxsize': self.maxsize,
+            'drops': self.drops,
+            'handled': self.handled,
+        }
+
+
 class AternosWss:
 
     """Class for managing websocket connection"""
@@ -63,10 +278,9 @@ class AternosWss:
         self.atserv = atserv
         self.servid = atserv.servid
 
-        cookies = atserv.atconn.session.cookies
-        self.session = cookies['ATERNOS_SESSION']
+        self.session = atserv.atconn.atsession
 
-        self.recv: Dict[Streams, List[ArgsTuple]]
+        self.recv: Dict[Streams, List[Receiver]]
         self.recv = {
             Streams.status: [],
             Streams.queue: [],
@@ -75,6 +289,10 @@ class AternosWss:
             Streams.tps: [],
         }
 
+        # synchronous consumers called right in the receiver,
+        # e.g. ConsoleLog.append
+        self.sinks: Dict[Streams, List[SinkT]] = {}
+
         self.autoconfirm = autoconfirm
         self.confirmed = False
 
@@ -82,18 +300,30 @@ class AternosWss:
         self.keep: asyncio.Task
         self.msgs: asyncio.Task
 
+        # reconnect when the connection is lost
+        self.autoreconnect = True
+        self.reconnects = 0
+        self.connected_at = 0.0
+        self.total_uptime = 0.0
+        self.handlers_added = False
+
     async def confirm(self) -> None:
 
         """Simple way to call
         `AternosServer.confirm`
         from this class"""
 
-        self.atserv.confirm()
+        result = self.atserv.confirm()
+        # AsyncAternosServer.confirm is a coroutine
+        if asyncio.iscoroutine(result):
+            await result
 
     def wssreceiver(
             self,
             stream: Streams,
-            arg: Tuple[Any, ...] = ()) -> Callable[[FunctionT], Any]:
+            arg: Tuple[Any, ...] = (),
+            maxsize: int = QUEUE_SIZE,
+            overflow: Overflow = Overflow.drop_oldest) -> Callable[[FunctionT], Any]:
         """Decorator that marks your function as a stream receiver.
         When websocket receives message from the specified stream,
         it calls all listeners created with this decorator.
@@ -101,6 +331,8 @@ class AternosWss:
         Args:
             stream (Streams): Stream that your function should listen
             arg (Tuple[Any, ...], optional): Arguments which will be passed to your function
+            maxsize (int, optional): Size of the listener's message queue
+            overflow (Overflow, optional): What to do when the queue is full
 
         Returns:
             ...
@@ -108,12 +340,7 @@ class AternosWss:
 
         def decorator(func: FunctionT) -> Callable[[Any, Any], Coroutine[Any, Any, Any]]:
 
-            handlers = self.recv.get(stream, None)
-
-            if handlers is None:
-                self.recv[stream] = [(func, arg)]
-            else:
-                handlers.append((func, arg))
+            self.add_receiver(stream, func, arg, maxsize, overflow)
 
             async def wrapper(*args, **kwargs) -> Any:
                 return await func(*args, **kwargs)
@@ -122,11 +349,109 @@ class AternosWss:
 
         return decorator
 
+    def add_receiver(
+            self,
+            stream: Streams,
+            func: FunctionT,
+            arg: Tuple[Any, ...] = (),
+            maxsize: int = QUEUE_SIZE,
+            overflow: Overflow = Overflow.drop_oldest) -> None:
+        """Registers a stream listener,
+        the same as `wssreceiver` decorator
+
+        Args:
+            stream (Streams): Stream that your function should listen
+            func (FunctionT): Coroutine function
+            arg (Tuple[Any, ...], optional): Arguments which will be passed to your function
+            maxsize (int, optional): Size of the listener's message queue
+            overflow (Overflow, optional): What to do when the queue is full
+        """
+
+        handler = Receiver(func, arg, maxsize, overflow)
+        handlers = self.recv.get(stream, None)
+
+        if handlers is None:
+            self.recv[stream] = [handler]
+        else:
+            handlers.append(handler)
+
+    def remove_receiver(self, stream: Streams, func: FunctionT) -> None:
+        """Unregisters a stream listener
+
+        Args:
+            stream (Streams): Stream
+            func (FunctionT): Function registered
+                with `add_receiver` or `wssreceiver`
+        """
+
+        handlers = self.recv.get(stream, [])
+        for handler in handlers:
+            if handler.func is func:
+                handler.stop()
+        self.recv[stream] = [h for h in handlers if h.func is not func]
+
+    def add_sink(self, stream: Streams, sink: SinkT) -> None:
+        """Registers a synchronous stream consumer.
+        Unlike listeners, it is called directly
+        by the receiver, so it must be fast
+        and must not block
+
+        Args:
+            stream (Streams): Stream
+            sink (SinkT): Function taking the decoded message
+        """
+
+        self.sinks.setdefault(stream, []).append(sink)
+
+    def remove_sink(self, stream: Streams, sink: SinkT) -> None:
+        """Unregisters a synchronous stream consumer
+
+        Args:
+            stream (Streams): Stream
+            sink (SinkT): Function passed to `add_sink`
+        """
+
+        sinks = self.sinks.get(stream, [])
+        self.sinks[stream] = [f for f in sinks if f is not sink]
+
+    def listened(self, stream: Streams) -> bool:
+        """Checks if the stream has listeners or sinks
+
+        Args:
+            stream (Streams): Stream
+
+        Returns:
+            True if messages of this stream are used
+        """
+
+        return bool(self.recv.get(stream) or self.sinks.get(stream))
+
+    @property
+    def connected(self) -> bool:
+        """Check if the websocket connection is open
+
+        Returns:
+            True if messages can be received
+        """
+
+        return bool(getattr(self.socket, 'open', False))
+
     async def connect(self) -> None:
 
         """Connects to the websocket server
         and starts all stream listeners"""
 
+        await self.open_socket()
+        self.add_handlers()
+        await self.wssworker()
+
+    async def open_socket(self) -> None:
+
+        """Opens the websocket connection"""
+
+        # the cookie could be updated since the object was created
+        self.session = self.atserv.atconn.atsession or self.session
+
         headers = [
             ('Host', 'aternos.org'),
             ('User-Agent', REQUA),
@@ -141,6 +466,16 @@ class AternosWss:
             origin='https://aternos.org',
             extra_headers=headers
         )
+        self.connected_at = time.monotonic()
+
+    def add_handlers(self) -> None:
+
+        """Registers the internal status listeners
+        (only once, even if the socket is reopened)"""
+
+        if self.handlers_added:
+            return
+        self.handlers_added = True
 
         @self.wssreceiver(Streams.status)
         async def confirmfunc(msg: Dict[str, Any]) -> None:
@@ -186,32 +521,115 @@ class AternosWss:
 
             if msg['status'] == 2:
                 # Automatically start streams
-                for strm in self.recv:
+                await self.start_streams()
 
-                    if not isinstance(strm, Streams):
-                        continue
+    async def start_streams(self) -> None:
 
-                    # If the handlers list is empty
-                    if not self.recv.get(strm):
-                        continue
+        """Requests all streams which have listeners"""
 
-                    if strm.stream:
-                        logging.debug('Requesting %s stream', strm.stream)
-                        await self.send({
-                            'stream': strm.stream,
-                            'type': 'start'
-                        })
+        for strm in self.recv:
 
-        await self.wssworker()
+            if not isinstance(strm, Streams):
+                continue
+
+            # If nobody listens to it
+            if not self.listened(strm):
+                continue
+
+            if strm.stream:
+                logging.debug('Requesting %s stream', strm.stream)
+                await self.send({
+                    'stream': strm.stream,
+                    'type': 'start'
+                })
+
+    async def reconnect(self) -> None:
+
+        """Reopens the connection with a growing delay
+        between attempts and requests the active streams again"""
+
+        self.disconnected()
+        delay = RECONNECT_MIN
+
+        while True:
+            try:
+                await self.open_socket()
+                break
+            except (OSError, websockets.WebSocketException) as err:
+                logging.warning(
+                    'Unable to reconnect to websocket: %s, '
+                    'retrying in %s seconds', err, delay
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX)
+
+        self.reconnects += 1
+        logging.info('Websocket reconnected (%d)', self.reconnects)
+
+        # streams are requested only on the status change,
+        # the server may be already online
+        await self.start_streams()
+
+    def disconnected(self) -> None:
+
+        """Adds the current connection time to `total_uptime`"""
+
+        if self.connected_at:
+            self.total_uptime += time.monotonic() - self.connected_at
+        self.connected_at = 0.0
+
+    @property
+    def uptime(self) -> float:
+        """Seconds since the connection was (re)opened
+
+        Returns:
+            Current connection uptime, 0 if disconnected
+        """
+
+        if not self.connected_at:
+            return 0.0
+        return time.monotonic() - self.connected_at
+
+    def stats(self) -> Dict[str, float]:
+        """Connection statistics
+
+        Returns:
+            Dictionary with `uptime` of the current connection,
+            `total_uptime` and `reconnects` count
+        """
+
+        return {
+            'uptime': self.uptime,
+            'total_uptime': self.total_uptime + self.uptime,
+            'reconnects': self.reconnects,
+        }
+
+    def queue_stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Listeners queues statistics
+
+        Returns:
+            `Receiver.stats()` of each listener by stream name
+        """
+
+        return {
+            strm.name: [handler.stats() for handler in handlers]
+            for strm, handlers in self.recv.items()
+            if handlers
+        }
 
     async def close(self) -> None:
 
         """Closes websocket connection and stops all listeners"""
 
+        self.autoreconnect = False
         self.keep.cancel()
         self.msgs.cancel()
+        for handlers in self.recv.values():
+            for handler in handlers:
+                handler.stop()
+        self.disconnected()
         await self.socket.close()
-        del self.socket
+        self.socket = None
 
     async def send(self, obj: Union[Dict[str, Any], str]) -> None:
 
@@ -268,11 +686,54 @@ class AternosWss:
         try:
             while True:
                 await asyncio.sleep(49)
-                await self.socket.send('{"type":"\u2764"}')
+                try:
+                    await self.socket.send('{"type":"\u2764"}')
+                except websockets.ConnectionClosed:
+                    # the receiver task reconnects
+                    continue
 
         except asyncio.CancelledError:
             pass
 
+    async def dispatch(self, data: Union[str, bytes]) -> None:
+        """Decodes a websocket frame
+        and queues it for the stream listeners.
+        Frames of streams without listeners
+        are dropped before parsing JSON
+
+        Args:
+            data (Union[str, bytes]): Raw websocket frame
+        """
+
+        msgtype = peek_type(data)
+        if msgtype is not None:
+            entry = DISPATCH.get(msgtype)
+            if entry is None or not self.listened(entry[0]):
+                return
+
+        obj = loads(data)
+        entry = DISPATCH.get(obj.get('type'))
+        if entry is None:
+            return
+
+        stream, decode = entry
+        if not self.listened(stream):
+            return
+
+        msg = decode(obj)
+
+        for sink in self.sinks.get(stream, ()):
+            sink(msg)
+
+        handlers: Iterable[Receiver]
+        handlers = self.recv.get(stream, ())
+
+        # each listener has its own queue,
+        # a slow one doesn't hold up the others
+        # unless its overflow policy is `block`
+        for handler in handlers:
+            await handler.put(msg)
+
     async def receiver(self) -> None:
 
         """Receives messages from websocket servers
@@ -280,47 +741,337 @@ class AternosWss:
 
         while True:
             try:
-                data = await self.socket.recv()
-                obj = json.loads(data)
-                msgtype = Streams.none
+                try:
+                    data = await self.socket.recv()
+                except websockets.ConnectionClosed:
+                    if not self.autoreconnect:
+                        self.disconnected()
+                        raise
+                    logging.warning('Websocket connection lost, reconnecting')
+                    await self.reconnect()
+                    continue
+
+                try:
+                    await self.dispatch(data)
+                except Exception:  # pylint: disable=broad-except
+                    # one bad frame must not stop the stream
+                    # for all the listeners
+                    logging.exception(
+                        'Unable to handle websocket frame: %.200r', data
+                    )
 
-                if obj['type'] == 'line':
-                    msgtype = Streams.console
-                    msg = obj['data'].strip('\r\n ')
+            except asyncio.CancelledError:
+                break
 
-                elif obj['type'] == 'heap':
-                    msgtype = Streams.ram
-                    msg = int(obj['data']['usage'])
 
-                elif obj['type'] == 'tick':
-                    msgtype = Streams.tps
-                    ticks = 1000 / obj['data']['averageTickTime']
-                    msg = 20 if ticks > 20 else ticks
+class WssManager:
 
-                elif obj['type'] == 'status':
-                    msgtype = Streams.status
-                    msg = json.loads(obj['message'])
+    """Keeps one websocket connection per server
+    shared by all subscribers. Connections reconnect
+    automatically and are closed when
+    the last subscriber leaves"""
 
-                if msgtype in self.recv:
+    def __init__(self, autoconfirm: bool = False) -> None:
+        """Keeps one websocket connection per server
 
-                    # function info tuples
-                    handlers: Iterable[ArgsTuple]
-                    handlers = self.recv.get(msgtype, ())
+        Args:
+            autoconfirm (bool, optional):
+                Automatically confirm server launching,
+                see `AternosWss.__init__`
+        """
 
-                    for func in handlers:
+        self.autoconfirm = autoconfirm
+        self.sockets: Dict[str, AternosWss] = {}
+        self.subs: Dict[str, int] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.consoles: Dict[str, ConsoleLog] = {}
+        self.series: Dict[str, ServerStats] = {}
 
-                        # if arguments is not empty
-                        if func[1]:
-                            # call the function with args
-                            coro = func[0](msg, func[1])  # type: ignore
+    async def subscribe(
+            self,
+            atserv: 'AternosServer',
+            stream: Streams,
+            func: FunctionT,
+            arg: Tuple[Any, ...] = (),
+            maxsize: int = QUEUE_SIZE,
+            overflow: Overflow = Overflow.drop_oldest) -> AternosWss:
+        """Registers a stream listener on the shared
+        connection of the server, connecting if needed
 
-                        else:
-                            # mypy error: too few arguments
-                            # looks like a bug, so it is ignored
-                            coro = func[0](msg)  # type: ignore
+        Args:
+            atserv (AternosServer): Server to listen
+            stream (Streams): Stream that your function should listen
+            func (FunctionT): Coroutine function
+            arg (Tuple[Any, ...], optional): Arguments
+                which will be passed to your function
+            maxsize (int, optional): Size of the listener's message queue
+            overflow (Overflow, optional): What to do when the queue is full
 
-                        # run
-                        asyncio.create_task(coro)
+        Returns:
+            Shared AternosWss object
+        """
 
-            except asyncio.CancelledError:
-                break
+        return await self.acquire(
+            atserv, stream,
+            lambda wss: wss.add_receiver(stream, func, arg, maxsize, overflow),
+            lambda wss: wss.remove_receiver(stream, func),
+        )
+
+    async def add_sink(
+            self,
+            atserv: 'AternosServer',
+            stream: Streams,
+            sink: SinkT) -> AternosWss:
+        """Registers a synchronous stream consumer
+        on the shared connection of the server,
+        see `AternosWss.add_sink`
+
+        Args:
+            atserv (AternosServer): Server to listen
+            stream (Streams): Stream
+            sink (SinkT): Function taking the decoded message
+
+        Returns:
+            Shared AternosWss object
+        """
+
+        return await self.acquire(
+            atserv, stream,
+            lambda wss: wss.add_sink(stream, sink),
+            lambda wss: wss.remove_sink(stream, sink),
+        )
+
+    async def acquire(
+            self,
+            atserv: 'AternosServer',
+            stream: Streams,
+            register: Callable[[AternosWss], None],
+            unregister: Callable[[AternosWss], None]) -> AternosWss:
+        """Adds a subscriber to the shared connection
+
+        Args:
+            atserv (AternosServer): Server to listen
+            stream (Streams): Stream
+            register (Callable[[AternosWss], None]):
+                Adds the listener to the connection
+            unregister (Callable[[AternosWss], None]):
+                Removes it if the connection fails
+
+        Returns:
+            Shared AternosWss object
+        """
+
+        servid = atserv.servid
+        async with self.locks.setdefault(servid, asyncio.Lock()):
+
+            wss = self.sockets.get(servid)
+            if wss is None:
+                wss = atserv.wss(self.autoconfirm)
+                self.sockets[servid] = wss
+
+            register(wss)
+            self.subs[servid] = self.subs.get(servid, 0) + 1
+
+            if wss.socket is None:
+                try:
+                    await wss.connect()
+                except Exception:
+                    unregister(wss)
+                    self.subs[servid] -= 1
+                    if self.subs[servid] == 0:
+                        del self.sockets[servid]
+                    raise
+
+                # the server may be already online and
+                # won't send the status that starts streams
+                await wss.start_streams()
+
+            elif stream.stream and wss.connected:
+                # the server may be already online,
+                # so the stream must be requested now
+                await wss.send({
+                    'stream': stream.stream,
+                    'type': 'start'
+                })
+
+        return wss
+
+    async def unsubscribe(
+            self,
+            atserv: 'AternosServer',
+            stream: Streams,
+            func: FunctionT) -> None:
+        """Removes a stream listener and closes
+        the connection if there are no listeners left
+
+        Args:
+            atserv (AternosServer): Server
+            stream (Streams): Stream
+            func (FunctionT): Function passed to `subscribe`
+        """
+
+        await self.release(atserv, lambda wss: wss.remove_receiver(stream, func))
+
+    async def remove_sink(
+            self,
+            atserv: 'AternosServer',
+            stream: Streams,
+            sink: SinkT) -> None:
+        """Removes a synchronous stream consumer and closes
+        the connection if there are no listeners left
+
+        Args:
+            atserv (AternosServer): Server
+            stream (Streams): Stream
+            sink (SinkT): Function passed to `add_sink`
+        """
+
+        await self.release(atserv, lambda wss: wss.remove_sink(stream, sink))
+
+    async def release(
+            self,
+            atserv: 'AternosServer',
+            unregister: Callable[[AternosWss], None]) -> None:
+        """Removes a subscriber from the shared connection
+        and closes it if there are no subscribers left
+
+        Args:
+            atserv (AternosServer): Server
+            unregister (Callable[[AternosWss], None]):
+                Removes the listener from the connection
+        """
+
+        servid = atserv.servid
+        async with self.locks.setdefault(servid, asyncio.Lock()):
+
+            wss = self.sockets.get(servid)
+            if wss is None:
+                return
+
+            unregister(wss)
+            self.subs[servid] -= 1
+            if self.subs[servid] > 0:
+                return
+
+            del self.sockets[servid]
+            del self.subs[servid]
+            if wss.socket is not None:
+                await wss.close()
+
+    async def console(
+            self,
+            atserv: 'AternosServer',
+            maxlines: int = CONSOLE_LINES,
+            maxbytes: Optional[int] = CONSOLE_BYTES) -> ConsoleLog:
+        """Returns the console buffer of the server.
+        On the first call the buffer is created and
+        the connection is kept open to fill it
+        until `drop_console` is called
+
+        Args:
+            atserv (AternosServer): Server
+            maxlines (int, optional): Max lines count
+            maxbytes (Optional[int], optional): Max size in bytes
+
+        Returns:
+            ConsoleLog object
+        """
+
+        log = self.consoles.get(atserv.servid)
+        if log is not None:
+            return log
+
+        log = ConsoleLog(maxlines, maxbytes)
+        self.consoles[atserv.servid] = log
+        try:
+            await self.add_sink(atserv, Streams.console, log.append)
+        except Exception:
+            del self.consoles[atserv.servid]
+            raise
+        return log
+
+    async def drop_console(self, atserv: 'AternosServer') -> None:
+        """Stops filling the console buffer of the server
+
+        Args:
+            atserv (AternosServer): Server
+        """
+
+        log = self.consoles.pop(atserv.servid, None)
+        if log is not None:
+            await self.remove_sink(atserv, Streams.console, log.append)
+
+    async def server_stats(self, atserv: 'AternosServer') -> ServerStats:
+        """Returns RAM and TPS series of the server.
+        On the first call they are created and
+        the connection is kept open to fill them
+        until `drop_server_stats` is called
+
+        Args:
+            atserv (AternosServer): Server
+
+        Returns:
+            ServerStats object
+        """
+
+        stats = self.series.get(atserv.servid)
+        if stats is not None:
+            return stats
+
+        stats = ServerStats()
+        self.series[atserv.servid] = stats
+        try:
+            await self.add_sink(atserv, Streams.ram, stats.ram.add)
+        except Exception:
+            del self.series[atserv.servid]
+            raise
+        try:
+            await self.add_sink(atserv, Streams.tps, stats.tps.add)
+        except Exception:
+            await self.drop_server_stats(atserv)
+            raise
+        return stats
+
+    async def drop_server_stats(self, atserv: 'AternosServer') -> None:
+        """Stops filling RAM and TPS series of the server
+
+        Args:
+            atserv (AternosServer): Server
+        """
+
+        stats = self.series.pop(atserv.servid, None)
+        if stats is None:
+            return
+        await self.remove_sink(atserv, Streams.ram, stats.ram.add)
+        await self.remove_sink(atserv, Streams.tps, stats.tps.add)
+
+    def get(self, servid: str) -> Optional[AternosWss]:
+        """Returns the shared connection of the server
+
+        Args:
+            servid (str): Server ID
+
+        Returns:
+            AternosWss object or None if nobody is subscribed
+        """
+
+        return self.sockets.get(servid)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connections statistics
+
+        Returns:
+            `AternosWss.stats()` with the subscribers
+            count under the `subscribers` key and
+            `AternosWss.queue_stats()` under the `queues` key
+            by server ID
+        """
+
+        return {
+            servid: {
+                **wss.stats(),
+                'subscribers': self.subs.get(servid, 0),
+                'queues': wss.queue_stats(),
+            }
+            for servid, wss in self.sockets.items()
+        }
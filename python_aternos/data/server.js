@@ -1,12 +1,8 @@
-const http = require('http')
 const process = require('process')
+const readline = require('readline')
 
 const { VM } = require('vm2')
 
-const args = process.argv.slice(2)
-const port = args[0] || 8000
-const host = args[1] || 'localhost'
-
 const vm = new VM({
     timeout: 2000,
     allowAsync: false,
@@ -18,22 +14,32 @@ const vm = new VM({
 })
 vm.run('var window = global; var document = {}')
 
-const listener = (req, res) => {
-
-    if (req.method != 'POST')
-        res.writeHead(405) & res.end()
-
-    let body = ''
-    req.on('data', chunk => (body += chunk))
-
-    req.on('end', () => {
-        let resp
-        try { resp = JSON.stringify(vm.run(body)) }
-        catch (ex) { resp = ex.message }
-        res.writeHead(200)
-        res.end(resp)
-    })
+// One JSON request per line on stdin:
+// {"id": 1, "code": "...", "get": "AJAX_TOKEN"}
+// both "code" and "get" are optional, an empty request is a ping.
+// One JSON response per line on stdout:
+// {"id": 1, "ok": true, "value": ...} or {"id": 1, "ok": false, "error": "..."}
+const send = obj => process.stdout.write(JSON.stringify(obj) + '\n')
+
+const listener = line => {
+
+    let req
+    try { req = JSON.parse(line) }
+    catch (ex) { return send({ ok: false, error: ex.message }) }
+
+    const resp = { id: req.id, ok: true }
+    try {
+        if (req.code) vm.run(req.code)
+        if (req.get) resp.value = vm.run(req.get)
+    }
+    catch (ex) {
+        resp.ok = false
+        resp.error = ex.message
+    }
+    send(resp)
 }
 
-const server = http.createServer(listener)
-server.listen(port, host, () => console.log('OK'))
+const rl = readline.createInterface({ input: process.stdin })
+rl.on('line', listener)
+rl.on('close', () => process.exit(0))
+console.log('OK')
@@ -43,3 +43,11 @@ class GuildSaves:
     @selected_server.setter
     def selected_server(self, value: int) -> None:
         save_data(self.guild_id, 'selected_server', str(value))
+
+    @property
+    def selected_server_id(self) -> str | None:
+        return get_data(self.guild_id, 'selected_server_id')
+
+    @selected_server_id.setter
+    def selected_server_id(self, value: str) -> None:
+        save_data(self.guild_id, 'selected_server_id', value)
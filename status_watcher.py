@@ -0,0 +1,136 @@
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Set
+
+from python_aternos import AsyncAternosServer, Status, ServerError
+from python_aternos import AternosWss, Streams, WssManager
+from python_aternos.atserver import POLL_MIN, POLL_MAX
+
+# Failed status requests in a row before subscribers get the error
+FETCH_FAILURES = 3
+
+
+class StatusWatcher:
+    """
+    This class keeps exactly one status poller per server.
+    Every interaction waiting for a status attaches to it as a subscriber,
+    so the number of status requests depends on the number of servers,
+    not on the number of users.
+    The poller is stopped when the last subscriber leaves.
+    If a WssManager is given, status pushes from the shared websocket
+    are used and polling only happens while the socket is down.
+    """
+
+    def __init__(self, wss_manager: Optional[WssManager] = None):
+        self.wss_manager = wss_manager
+        self.pollers: Dict[str, asyncio.Task] = {}
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, server: AsyncAternosServer) -> asyncio.Queue:
+        """
+        Returns a queue that receives the server info every time its status changes.
+        If the info is already loaded, it is put into the queue immediately.
+        An exception is put into the queue instead of the info
+        if FETCH_FAILURES status requests in a row fail.
+        """
+        queue = asyncio.Queue()
+        self.subscribers.setdefault(server.servid, set()).add(queue)
+        if server.has_info:
+            queue.put_nowait(server.info)
+        if server.servid not in self.pollers:
+            self.pollers[server.servid] = asyncio.create_task(self.poll(server))
+        return queue
+
+    def unsubscribe(self, server: AsyncAternosServer, queue: asyncio.Queue) -> None:
+        subscribers = self.subscribers.get(server.servid, set())
+        subscribers.discard(queue)
+        if subscribers:
+            return
+        self.subscribers.pop(server.servid, None)
+        poller = self.pollers.pop(server.servid, None)
+        if poller is not None:
+            poller.cancel()
+
+    def publish(self, servid: str, message: Any) -> None:
+        for queue in self.subscribers.get(servid, ()):
+            queue.put_nowait(message)
+
+    async def poll(self, server: AsyncAternosServer) -> None:
+        if self.wss_manager is None:
+            return await self.poll_loop(server, {'status': None})
+
+        last = {'status': None}
+
+        async def pushed(msg: Dict[str, Any]) -> None:
+            server.update_status(msg)
+            self.changed(server, last)
+
+        try:
+            wss = await self.wss_manager.subscribe(server, Streams.status, pushed)
+        except Exception:
+            return await self.poll_loop(server, last)
+        try:
+            await self.poll_loop(server, last, wss)
+        finally:
+            await self.wss_manager.unsubscribe(server, Streams.status, pushed)
+
+    def changed(self, server: AsyncAternosServer, last: Dict[str, Any]) -> bool:
+        """Publishes the cached info if the status differs from the last published one"""
+        info = server.info
+        if info['status'] == last['status']:
+            return False
+        last['status'] = info['status']
+        self.publish(server.servid, info)
+        return True
+
+    async def poll_loop(self, server: AsyncAternosServer, last: Dict[str, Any],
+                        wss: Optional[AternosWss] = None) -> None:
+        interval = POLL_MIN
+        failures = 0
+        while True:
+            if wss is not None and wss.connected:
+                # status changes are pushed through the websocket
+                await asyncio.sleep(POLL_MAX)
+                continue
+            try:
+                await server.fetch(interval)
+            except Exception as e:
+                failures += 1
+                # A single timeout should not abort every waiting /start
+                if failures % FETCH_FAILURES == 0:
+                    print(f"Unable to get the status of {server.servid}: {e}")
+                    self.publish(server.servid, e)
+                await asyncio.sleep(min(POLL_MIN * 2 ** failures, POLL_MAX))
+                continue
+            failures = 0
+            if self.changed(server, last):
+                interval = POLL_MIN
+            else:
+                interval = min(interval * 1.5, POLL_MAX)
+            await asyncio.sleep(interval)
+
+    async def wait_for(self, server: AsyncAternosServer, targets: Iterable[Status],
+                       timeout: float | None = None,
+                       errors: Iterable[Status] = (Status.error,)) -> Dict[str, Any]:
+        """
+        Waits until the server reaches one of the target statuses and returns its info.
+        Raises ServerError on an error status and asyncio.TimeoutError on timeout.
+        """
+        targets = set(targets)
+        errors = set(errors)
+
+        async def waiter() -> Dict[str, Any]:
+            while True:
+                info = await queue.get()
+                if isinstance(info, Exception):
+                    raise info
+                if info['status'] in errors:
+                    raise ServerError(info.get('lang', str(info['status'])),
+                                      f"Server has reached {info.get('lang')} status")
+                if info['status'] in targets:
+                    return info
+
+        queue = self.subscribe(server)
+        try:
+            return await asyncio.wait_for(waiter(), timeout)
+        finally:
+            self.unsubscribe(server, queue)
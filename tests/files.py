@@ -0,0 +1,35 @@
+"""Reading the test samples"""
+
+from pathlib import Path
+from typing import List
+
+abs_dir = Path(__file__).absolute().parent
+samples = abs_dir / 'samples'
+
+
+def read_sample(name: str) -> List[str]:
+    """Reads a sample file, one item per line
+
+    Args:
+        name (str): File name in `tests/samples`
+
+    Returns:
+        Non-empty lines
+    """
+
+    path = samples / name
+    with path.open('rt', encoding='utf-8') as file:
+        return [line.rstrip('\n') for line in file if line.strip()]
+
+
+def read_html(name: str) -> bytes:
+    """Reads a saved page
+
+    Args:
+        name (str): File name in `tests/samples`
+
+    Returns:
+        Page content like `requests.Response.content`
+    """
+
+    return (samples / name).read_bytes()
@@ -0,0 +1,131 @@
+"""Tests of the deduplicating backup store"""
+
+import io
+import os
+import zlib
+import random
+import hashlib
+import zipfile
+import tempfile
+import unittest
+
+from typing import Dict
+
+from backup_store import BackupStore
+
+# bigger than MIN_CHUNK, so every entry is a chunk of its own
+ENTRY_SIZE = 100 * 1024
+
+
+def make_zip(entries: Dict[str, bytes]) -> bytes:
+    """Builds a zip with fixed timestamps,
+    so the same entries give the same bytes"""
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_STORED) as zf:
+        for name, data in entries.items():
+            zf.writestr(zipfile.ZipInfo(name, (2020, 1, 1, 0, 0, 0)), data)
+    return buf.getvalue()
+
+
+def region(seed: int) -> bytes:
+    """Incompressible data like a region file"""
+    return random.Random(seed).randbytes(ENTRY_SIZE)
+
+
+class TestBackupStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BackupStore(os.path.join(self.tmp.name, 'store'))
+        self.world = {
+            'world/level.dat': b'level',
+            'world/region/r.0.0.mca': region(1),
+            'world/region/r.0.1.mca': region(2),
+            'world/region/r.1.0.mca': region(3),
+        }
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def add(self, name: str, data: bytes) -> Dict:
+        path = os.path.join(self.tmp.name, f'{name}.zip')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return self.store.add(name, path, server='test.aternos.me', world='world')
+
+    def digests(self, name: str) -> set:
+        return {digest for digest, _ in self.store.load(name)['chunks']}
+
+    def test_round_trip(self) -> None:
+        data = make_zip(self.world)
+        snapshot = self.add('first', data)
+        self.assertEqual(snapshot['size'], len(data))
+        self.assertEqual(snapshot['sha256'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(snapshot['world'], 'world')
+
+        dest = os.path.join(self.tmp.name, 'restored.zip')
+        self.assertEqual(self.store.restore('first', dest), len(data))
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+        with self.store.open('first') as f:
+            f.seek(len(data) // 2)
+            self.assertEqual(f.read(), data[len(data) // 2:])
+
+    def test_unchanged_snapshot(self) -> None:
+        data = make_zip(self.world)
+        first = self.add('first', data)
+        self.assertGreater(first['stored'], 0)
+        second = self.add('second', data)
+        self.assertEqual(second['stored'], 0)
+        self.assertEqual(self.digests('first'), self.digests('second'))
+
+    def test_changed_entry(self) -> None:
+        self.add('first', make_zip(self.world))
+        self.world['world/region/r.0.1.mca'] = region(4)
+        changed = self.add('second', make_zip(self.world))
+
+        # the changed entry and the last chunk with the central directory
+        new = self.digests('second') - self.digests('first')
+        self.assertEqual(len(new), 2)
+        self.assertEqual(changed['stored'], sum(
+            os.path.getsize(self.store.chunk_path(d)) for d in new
+        ))
+
+    def test_delete(self) -> None:
+        self.add('first', make_zip(self.world))
+        self.world['world/region/r.0.1.mca'] = region(4)
+        data = make_zip(self.world)
+        self.add('second', data)
+
+        only_first = self.digests('first') - self.digests('second')
+        sizes = sum(os.path.getsize(self.store.chunk_path(d)) for d in only_first)
+        self.assertEqual(self.store.delete('first'), sizes)
+
+        stored = {digest for digest, _ in self.store.stored_chunks()}
+        self.assertEqual(stored, self.digests('second'))
+        self.assertEqual([s['name'] for s in self.store.snapshots()], ['second'])
+
+        restored = io.BytesIO()
+        self.store.restore('second', restored)
+        self.assertEqual(restored.getvalue(), data)
+
+    def test_corrupted_chunk(self) -> None:
+        self.add('first', make_zip(self.world))
+        digest = self.store.load('first')['chunks'][1][0]
+        with open(self.store.chunk_path(digest), 'wb') as f:
+            f.write(zlib.compress(b'garbage'))
+
+        with self.assertRaises(ValueError):
+            self.store.get_chunk(digest)
+        with self.assertRaises(ValueError):
+            self.store.restore('first', io.BytesIO())
+
+    def test_invalid_name(self) -> None:
+        with self.assertRaises(ValueError):
+            self.store.snapshot_path('../outside')
+
+
+if __name__ == '__main__':
+    unittest.main()
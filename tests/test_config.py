@@ -0,0 +1,67 @@
+"""Tests of the options page parsing"""
+
+import unittest
+import importlib.util
+
+from tests import files
+
+if importlib.util.find_spec('lxml'):
+    import lxml.html
+    from python_aternos import atconf
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec('lxml'),
+    'lxml is not installed'
+)
+class TestOptionsPage(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.content = files.read_html('options.html')
+        self.options = atconf.OptionsSnapshot(self.content)
+
+    def test_timezone(self) -> None:
+        self.assertEqual(self.options.timezone, 'Europe/Berlin')
+
+    def test_java(self) -> None:
+        self.assertEqual(self.options.java, 17)
+
+    def test_typed_props(self) -> None:
+        self.assertEqual(self.options.props, {
+            'max-players': 20,
+            'gamemode': 0,
+            'difficulty': 2,
+            'white-list': False,
+            'pvp': True,
+            # not converted, the text is kept
+            'spawn-protection': 'not a number',
+            'resource-pack': '',
+            # the blocks are merged, not reset
+            'hardcore': False,
+            'motd': 'A Minecraft Server',
+        })
+
+    def test_raw_props(self) -> None:
+        raw = self.options.server_props(proptyping=False)
+        self.assertEqual(raw['max-players'], '20')
+        self.assertEqual(raw['white-list'], 'false')
+        self.assertEqual(raw['motd'], 'A Minecraft Server')
+        self.assertEqual(set(raw), set(self.options.props))
+
+    def test_find_props(self) -> None:
+        tree = lxml.html.fromstring(self.content)
+        self.assertEqual(atconf.find_props(tree, True), self.options.props)
+        self.assertEqual(atconf.find_props(tree, False), self.options.raw_props)
+
+    def test_prefixes(self) -> None:
+        props = atconf.find_props(
+            lxml.html.fromstring(self.content),
+            prefixes=['', atconf.DAT_PREFIX]
+        )
+        self.assertEqual(props['max-players'], 20)
+        self.assertIs(props[f'{atconf.DAT_PREFIX}hardcore'], False)
+        self.assertNotIn('hardcore', props)
+
+
+if __name__ == '__main__':
+    unittest.main()
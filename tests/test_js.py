@@ -0,0 +1,157 @@
+"""Tests of the AJAX_TOKEN interpreters
+on the captured token snippets"""
+
+import unittest
+import importlib.util
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+from python_aternos import atjsparse
+from tests import files
+
+# snippets the fast path handles and the ones it must hand over
+SAMPLES = (
+    ('token_input.txt', 'token_output.txt'),
+    ('token_fallback.txt', 'token_fallback_output.txt'),
+)
+
+
+class Unreachable(atjsparse.Interpreter):
+    """Fails the test if the fast path falls back"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        raise AssertionError('Fallback interpreter must not be used')
+
+    def exec_js(self, func: str) -> None:
+        pass
+
+    def get_var(self, name: str) -> Any:
+        pass
+
+
+class Recording(atjsparse.Interpreter):
+    """Remembers the code passed to the fallback"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.code: List[str] = []
+
+    def exec_js(self, func: str) -> None:
+        self.code.append(func)
+
+    def get_var(self, name: str) -> Any:
+        return f'fallback:{name}'
+
+
+def node_available() -> bool:
+    """Checks if Node.JS with the server.js dependencies is installed"""
+
+    node = atjsparse.NodeInterpreter()
+    try:
+        return node.ping()
+    finally:
+        node.kill()
+
+
+class TestFastInterpreter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tests = files.read_sample('token_input.txt')
+        self.results = files.read_sample('token_output.txt')
+        self.unsupported = files.read_sample('token_fallback.txt')
+
+    def test_tokens(self) -> None:
+        js = atjsparse.FastInterpreter(Unreachable)
+        for func, exp in zip(self.tests, self.results):
+            self.assertEqual(js.exec_get(func, 'AJAX_TOKEN'), exp, func)
+
+    def test_unsupported(self) -> None:
+        js = atjsparse.FastInterpreter(Unreachable)
+        for func in self.unsupported:
+            with self.assertRaises(NotImplementedError, msg=func):
+                js.run(func)
+
+    def test_fallback(self) -> None:
+        js = atjsparse.FastInterpreter(Recording)
+        for func in self.unsupported:
+            self.assertEqual(
+                js.exec_get(func, 'AJAX_TOKEN'),
+                'fallback:AJAX_TOKEN'
+            )
+        assert isinstance(js.fallback_js, Recording)
+        self.assertEqual(js.fallback_js.code, self.unsupported)
+
+    def test_failed_run_keeps_vars(self) -> None:
+        js = atjsparse.FastInterpreter(Unreachable)
+        js.exec_js(self.tests[0])
+        with self.assertRaises(NotImplementedError):
+            js.run('window["AJAX_TOKEN"]="x"; String.fromCharCode(50)')
+        self.assertEqual(js['AJAX_TOKEN'], self.results[0])
+
+    def test_threads(self) -> None:
+        js = atjsparse.FastInterpreter(Unreachable)
+
+        def parse(i: int) -> str:
+            return js.exec_get(self.tests[i % len(self.tests)], 'AJAX_TOKEN')
+
+        with ThreadPoolExecutor(16) as pool:
+            tokens = list(pool.map(parse, range(len(self.tests) * 50)))
+
+        for i, token in enumerate(tokens):
+            self.assertEqual(token, self.results[i % len(self.results)])
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec('js2py'),
+    'js2py is not installed'
+)
+class TestJs2Py(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.js = atjsparse.Js2PyInterpreter()
+        self.tests = files.read_sample('token_input.txt')
+        self.results = files.read_sample('token_output.txt')
+
+    def test_tokens(self) -> None:
+        for func, exp in zip(self.tests, self.results):
+            self.assertEqual(self.js.exec_get(func, 'AJAX_TOKEN'), exp, func)
+
+    def test_fast_falls_back(self) -> None:
+        js = atjsparse.FastInterpreter(atjsparse.Js2PyInterpreter)
+        func = files.read_sample('token_fallback.txt')[0]
+        exp = files.read_sample('token_fallback_output.txt')[0]
+        self.assertEqual(js.exec_get(func, 'AJAX_TOKEN'), exp)
+
+
+@unittest.skipUnless(node_available(), 'Node.JS or vm2 is not installed')
+class TestNode(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.js = atjsparse.NodeInterpreter()
+
+    def tearDown(self) -> None:
+        self.js.kill()
+
+    def test_tokens(self) -> None:
+        for inputs, outputs in SAMPLES:
+            tests = files.read_sample(inputs)
+            results = files.read_sample(outputs)
+            for func, exp in zip(tests, results):
+                self.assertEqual(self.js.exec_get(func, 'AJAX_TOKEN'), exp, func)
+
+    def test_fast_falls_back(self) -> None:
+        js = atjsparse.FastInterpreter(atjsparse.NodeInterpreter)
+        tests = files.read_sample('token_fallback.txt')
+        results = files.read_sample('token_fallback_output.txt')
+        try:
+            for func, exp in zip(tests, results):
+                self.assertEqual(js.exec_get(func, 'AJAX_TOKEN'), exp, func)
+        finally:
+            if isinstance(js.fallback_js, atjsparse.NodeInterpreter):
+                js.fallback_js.kill()
+
+
+if __name__ == '__main__':
+    unittest.main()
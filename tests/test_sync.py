@@ -0,0 +1,107 @@
+"""Tests of the mirror sync planning"""
+
+import os
+import tempfile
+import unittest
+import importlib.util
+
+from typing import Any, Dict
+
+if importlib.util.find_spec('lxml'):
+    from python_aternos.atfile import AternosFile
+    from python_aternos.atsync import Mirror
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec('lxml'),
+    'lxml is not installed'
+)
+class TestMirrorPlan(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mirror = Mirror(None, '/plugins/', self.tmp.name)  # type: ignore[arg-type]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def remote(self, path: str, size: int) -> 'AternosFile':
+        return AternosFile(
+            None, path,  # type: ignore[arg-type]
+            True, True, True, size=size
+        )
+
+    def local(self, rel: str) -> None:
+        path = self.mirror.local_path(rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'data')
+
+    def manifest(self, sizes: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            'files': {
+                rel: {'size': size, 'synced': 0.0}
+                for rel, size in sizes.items()
+            },
+            'deleted': {},
+        }
+
+    def test_relpath(self) -> None:
+        self.assertEqual(
+            self.mirror.relpath(self.remote('/plugins/Essentials/config.yml', 1)),
+            'Essentials/config.yml'
+        )
+        root = Mirror(None, '', self.tmp.name)  # type: ignore[arg-type]
+        self.assertEqual(
+            root.relpath(self.remote('/server.properties', 1)),
+            'server.properties'
+        )
+
+    def test_local_path(self) -> None:
+        self.assertEqual(
+            self.mirror.local_path('Essentials/config.yml'),
+            os.path.join(os.path.abspath(self.tmp.name), 'Essentials', 'config.yml')
+        )
+        for rel in ('../outside.yml', 'Essentials/../../outside.yml', '..'):
+            with self.assertRaises(ValueError, msg=rel):
+                self.mirror.local_path(rel)
+
+    def test_new_files(self) -> None:
+        files = [self.remote('/plugins/a.jar', 10)]
+        fetch, unchanged, deleted = self.mirror.plan(files, self.manifest({}))
+        self.assertEqual(fetch, files)
+        self.assertEqual((unchanged, deleted), (0, []))
+
+    def test_unchanged_and_changed(self) -> None:
+        self.local('a.jar')
+        self.local('cfg/b.yml')
+        same = self.remote('/plugins/a.jar', 10)
+        changed = self.remote('/plugins/cfg/b.yml', 25)
+
+        fetch, unchanged, deleted = self.mirror.plan(
+            [same, changed],
+            self.manifest({'a.jar': 10, 'cfg/b.yml': 20})
+        )
+        self.assertEqual(fetch, [changed])
+        self.assertEqual((unchanged, deleted), (1, []))
+
+    def test_missing_local_file(self) -> None:
+        # the size matches, but the local copy was removed
+        files = [self.remote('/plugins/a.jar', 10)]
+        fetch, unchanged, _ = self.mirror.plan(files, self.manifest({'a.jar': 10}))
+        self.assertEqual(fetch, files)
+        self.assertEqual(unchanged, 0)
+
+    def test_deleted(self) -> None:
+        self.local('a.jar')
+        files = [self.remote('/plugins/a.jar', 10)]
+        fetch, unchanged, deleted = self.mirror.plan(
+            files,
+            self.manifest({'a.jar': 10, 'old.jar': 5, 'cfg/old.yml': 1})
+        )
+        self.assertEqual((fetch, unchanged), ([], 1))
+        self.assertEqual(sorted(deleted), ['cfg/old.yml', 'old.jar'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""Tests of the world zip report"""
+
+import io
+import gzip
+import struct
+import zipfile
+import unittest
+
+from typing import Any
+
+import world_report
+from world_report import NBTReader
+
+
+def nbt_string(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('>H', len(data)) + data
+
+
+def nbt_tag(tag: int, name: str, payload: bytes) -> bytes:
+    return struct.pack('>b', tag) + nbt_string(name) + payload
+
+
+def nbt_compound(*tags: bytes) -> bytes:
+    return b''.join(tags) + b'\x00'
+
+
+def level_dat(**data: Any) -> bytes:
+    """Gzipped level.dat with the given Data fields"""
+
+    tags = []
+    for name, value in data.items():
+        if isinstance(value, str):
+            tags.append(nbt_tag(8, name, nbt_string(value)))
+        elif isinstance(value, dict):
+            tags.append(nbt_tag(10, name, nbt_compound(*(
+                nbt_tag(8, k, nbt_string(v)) if isinstance(v, str)
+                else nbt_tag(4, k, struct.pack('>q', v))
+                for k, v in value.items()
+            ))))
+        else:
+            tags.append(nbt_tag(3, name, struct.pack('>i', value)))
+    root = nbt_tag(10, '', nbt_compound(nbt_tag(10, 'Data', nbt_compound(*tags))))
+    return gzip.compress(root)
+
+
+class TestDimensionOf(unittest.TestCase):
+
+    def test_overworld(self) -> None:
+        self.assertEqual(
+            world_report.dimension_of('world/region/r.0.-1.mca'),
+            ('overworld', 'region', 0, -1)
+        )
+        self.assertEqual(
+            world_report.dimension_of('region/r.2.3.mca'),
+            ('overworld', 'region', 2, 3)
+        )
+
+    def test_legacy_dimensions(self) -> None:
+        self.assertEqual(
+            world_report.dimension_of('world/DIM-1/region/r.-1.0.mca'),
+            ('the_nether', 'region', -1, 0)
+        )
+        self.assertEqual(
+            world_report.dimension_of('world/DIM1/entities/r.0.0.mca'),
+            ('the_end', 'entities', 0, 0)
+        )
+
+    def test_custom_dimension(self) -> None:
+        self.assertEqual(
+            world_report.dimension_of('world/dimensions/mymod/caves/poi/r.5.-7.mca'),
+            ('mymod:caves', 'poi', 5, -7)
+        )
+
+    def test_other_files(self) -> None:
+        self.assertIsNone(world_report.dimension_of('world/level.dat'))
+        self.assertIsNone(world_report.dimension_of('world/region/r.0.0.mcc'))
+        self.assertIsNone(world_report.dimension_of('world/data/r.0.0.mca'))
+
+
+class TestNBTReader(unittest.TestCase):
+
+    def test_negative_array_length(self) -> None:
+        for tag in (7, 11, 12):
+            reader = NBTReader(io.BytesIO(struct.pack('>i', -1)))
+            with self.assertRaises(ValueError):
+                reader.payload(tag)
+
+    def test_negative_list_length(self) -> None:
+        reader = NBTReader(io.BytesIO(struct.pack('>bi', 3, -5)))
+        with self.assertRaises(ValueError):
+            reader.payload(9)
+
+    def test_large_array_skipped(self) -> None:
+        length = world_report.MAX_ARRAY + 1
+        data = struct.pack('>i', length) + bytes(length * 4) + b'end'
+        stream = io.BytesIO(data)
+        self.assertEqual(NBTReader(stream).payload(11), length)
+        self.assertEqual(stream.read(), b'end')
+
+
+class TestAnalyze(unittest.TestCase):
+
+    def setUp(self) -> None:
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('world/', b'')
+            zf.writestr('world/level.dat', level_dat(
+                LevelName='Test World',
+                DataVersion=3465,
+                SpawnX=10, SpawnY=64, SpawnZ=-20,
+                WorldGenSettings={'seed': 42},
+                Version={'Name': '1.20.1'},
+            ))
+            # a datapack level.dat deeper in the tree is not the world's
+            zf.writestr('world/datapacks/pack/level.dat', b'not nbt')
+            zf.writestr('world/region/r.0.0.mca', bytes(3000))
+            zf.writestr('world/region/r.-2.1.mca', bytes(1000))
+            zf.writestr('world/entities/r.5.5.mca', bytes(200))
+            zf.writestr('world/DIM-1/region/r.0.0.mca', bytes(2000))
+            zf.writestr('world/DIM1/poi/r.0.0.mca', bytes(50))
+        buf.seek(0)
+        self.report = world_report.analyze(buf, top=2)
+
+    def test_archive(self) -> None:
+        self.assertEqual(self.report['entries'], 8)
+        self.assertGreater(self.report['size'], self.report['compressed'])
+
+    def test_dimensions(self) -> None:
+        dims = self.report['dimensions']
+        self.assertEqual(set(dims), {'overworld', 'the_nether', 'the_end'})
+
+        overworld = dims['overworld']
+        self.assertEqual(overworld['regions'], 2)
+        self.assertEqual(overworld['region'], 4000)
+        self.assertEqual(overworld['entities'], 200)
+        # entities files don't widen the area
+        self.assertEqual(
+            (overworld['min_x'], overworld['max_x'], overworld['min_z'], overworld['max_z']),
+            (-2, 0, 0, 1)
+        )
+
+        self.assertEqual(dims['the_end']['regions'], 0)
+        self.assertEqual(dims['the_end']['poi'], 50)
+        self.assertIsNone(dims['the_end']['min_x'])
+
+    def test_largest(self) -> None:
+        self.assertEqual(self.report['largest'], [
+            ('world/region/r.0.0.mca', 3000),
+            ('world/DIM-1/region/r.0.0.mca', 2000),
+        ])
+
+    def test_level(self) -> None:
+        self.assertEqual(self.report['level'], {
+            'name': 'Test World',
+            'version': '1.20.1',
+            'data_version': 3465,
+            'seed': 42,
+            'spawn': (10, 64, -20),
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
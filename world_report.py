@@ -0,0 +1,194 @@
+import gzip
+import heapq
+import re
+import struct
+import zipfile
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+# r.<x>.<z>.mca inside region, entities or poi directory
+REGION_RE = re.compile(r'^(?P<parent>.*?)/?(?P<kind>region|entities|poi)/r\.(?P<x>-?\d+)\.(?P<z>-?\d+)\.mca$')
+DIMENSION_DIRS = {'DIM-1': 'the_nether', 'DIM1': 'the_end'}
+# level.dat fields shown in the report: name -> path in the Data compound
+LEVEL_FIELDS = {
+    'name': ('LevelName',),
+    'version': ('Version', 'Name'),
+    'data_version': ('DataVersion',),
+    'game_type': ('GameType',),
+    'difficulty': ('Difficulty',),
+    'hardcore': ('hardcore',),
+    'seed': ('WorldGenSettings', 'seed'),
+    'legacy_seed': ('RandomSeed',),
+    'spawn': ('SpawnX',),
+    'time': ('Time',),
+    'last_played': ('LastPlayed',),
+}
+# Arrays in level.dat longer than this are skipped instead of read
+MAX_ARRAY = 64 * 1024
+
+
+class NBTReader:
+    """
+    Minimal reader of the (uncompressed) NBT format used by level.dat.
+    Large arrays are skipped, so memory use does not depend on the file.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def read(self, size: int) -> bytes:
+        data = self.stream.read(size)
+        if len(data) != size:
+            raise ValueError("Unexpected end of NBT data")
+        return data
+
+    def unpack(self, fmt: str) -> Any:
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))[0]
+
+    def string(self) -> str:
+        return self.read(self.unpack('>H')).decode('utf-8', errors='replace')
+
+    def root(self) -> Dict[str, Any]:
+        tag = self.unpack('>b')
+        if tag != 10:
+            raise ValueError("NBT root is not a compound")
+        self.string()
+        return self.payload(10)
+
+    def length(self) -> int:
+        length = self.unpack('>i')
+        if length < 0:
+            raise ValueError(f"Negative NBT length {length}")
+        return length
+
+    def array(self, fmt: str) -> List[Any] | int:
+        length = self.length()
+        size = struct.calcsize(fmt) * length
+        if length > MAX_ARRAY:
+            # only the length is kept
+            while size:
+                size -= len(self.read(min(size, 1 << 16)))
+            return length
+        return list(struct.unpack(f'>{length}{fmt}', self.read(size)))
+
+    def payload(self, tag: int) -> Any:
+        if tag == 1:
+            return self.unpack('>b')
+        if tag == 2:
+            return self.unpack('>h')
+        if tag == 3:
+            return self.unpack('>i')
+        if tag == 4:
+            return self.unpack('>q')
+        if tag == 5:
+            return self.unpack('>f')
+        if tag == 6:
+            return self.unpack('>d')
+        if tag == 7:
+            return self.array('b')
+        if tag == 8:
+            return self.string()
+        if tag == 9:
+            item = self.unpack('>b')
+            length = self.length()
+            return [self.payload(item) for _ in range(length)]
+        if tag == 10:
+            compound = {}
+            while (item := self.unpack('>b')) != 0:
+                name = self.string()
+                compound[name] = self.payload(item)
+            return compound
+        if tag == 11:
+            return self.array('i')
+        if tag == 12:
+            return self.array('q')
+        raise ValueError(f"Unknown NBT tag {tag}")
+
+
+def dimension_of(path: str) -> Tuple[str, str, int, int] | None:
+    """
+    Returns (dimension, kind, region x, region z) for a region file path
+    or None for other files. Kind is region, entities or poi.
+    """
+    match = REGION_RE.match(path)
+    if match is None:
+        return None
+    parts = [p for p in match['parent'].split('/') if p]
+    if len(parts) >= 3 and parts[-3] == 'dimensions':
+        dimension = f'{parts[-2]}:{parts[-1]}'
+    elif parts and parts[-1] in DIMENSION_DIRS:
+        dimension = DIMENSION_DIRS[parts[-1]]
+    else:
+        dimension = 'overworld'
+    return dimension, match['kind'], int(match['x']), int(match['z'])
+
+
+def level_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {}
+    for field, path in LEVEL_FIELDS.items():
+        value: Any = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is not None:
+            fields[field] = value
+    if 'spawn' in fields:
+        fields['spawn'] = (data.get('SpawnX'), data.get('SpawnY'), data.get('SpawnZ'))
+    if 'seed' in fields:
+        fields.pop('legacy_seed', None)
+    elif 'legacy_seed' in fields:
+        fields['seed'] = fields.pop('legacy_seed')
+    return fields
+
+
+def analyze(source: str | BinaryIO, top: int = 10) -> Dict[str, Any]:
+    """
+    Inspects a world zip (a path or a seekable binary file object).
+    Only the central directory and level.dat are read,
+    the archive is never extracted.
+    """
+    with zipfile.ZipFile(source) as archive:
+        infos = archive.infolist()
+
+        dimensions: Dict[str, Dict[str, Any]] = {}
+        regions = []
+        level_dat = None
+        for info in infos:
+            if info.is_dir():
+                continue
+            name = info.filename
+            if name.rsplit('/', 1)[-1] == 'level.dat':
+                # the world's own level.dat is the closest to the root
+                if level_dat is None or name.count('/') < level_dat.filename.count('/'):
+                    level_dat = info
+            found = dimension_of(name)
+            if found is None:
+                continue
+            dimension, kind, x, z = found
+            dim = dimensions.setdefault(dimension, {
+                'regions': 0, 'region': 0, 'entities': 0, 'poi': 0,
+                'min_x': None, 'max_x': None, 'min_z': None, 'max_z': None,
+            })
+            dim[kind] += info.file_size
+            if kind == 'region':
+                dim['regions'] += 1
+                if dim['min_x'] is None:
+                    dim.update(min_x=x, max_x=x, min_z=z, max_z=z)
+                else:
+                    dim['min_x'], dim['max_x'] = min(dim['min_x'], x), max(dim['max_x'], x)
+                    dim['min_z'], dim['max_z'] = min(dim['min_z'], z), max(dim['max_z'], z)
+                regions.append((info.file_size, name))
+
+        level = {}
+        if level_dat is not None:
+            # level.dat is gzipped NBT, it is decompressed while reading
+            with archive.open(level_dat) as entry, gzip.GzipFile(fileobj=entry) as nbt:
+                root = NBTReader(nbt).root()
+            level = level_fields(root.get('Data', root))
+
+    return {
+        'entries': len(infos),
+        'size': sum(i.file_size for i in infos),
+        'compressed': sum(i.compress_size for i in infos),
+        'dimensions': dimensions,
+        'largest': [(name, size) for size, name in heapq.nlargest(top, regions)],
+        'level': level,
+    }